@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark da validacao incremental do MCPManager.
+
+Compara, pela API publica, o toggle_allowed que valida todo o mcpServers (o
+primeiro save de um MCPManager recem-carregado) com o que valida apenas a
+entrada alterada (saves seguintes do mesmo MCPManager).
+
+Uso:
+    python -m benchmarks.bench_incremental_validation [--servers 10000] [--repeat 20]
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+
+from benchmarks.synthetic import write_settings
+from src.core.mcp_manager import MCPManager
+
+
+def _best_of(func, repeat: int, setup=None) -> float:
+    """Executa func repeat vezes (setup fora da medicao) e retorna o menor tempo em milissegundos."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    """Executa o benchmark e imprime os resultados."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--servers", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    options = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        settings_path = str(write_settings(temp_dir, options.servers))
+        fresh = {}
+
+        def new_manager():
+            # Leitura fora da medicao: o save seguinte faz a validacao completa
+            fresh["manager"] = MCPManager(settings_path, snapshots=False)
+            fresh["manager"].load_settings()
+
+        full_toggle_ms = _best_of(lambda: fresh["manager"].toggle_allowed("server-1"),
+                                  options.repeat, setup=new_manager)
+
+        # Depois do primeiro save, os seguintes validam so a entrada alterada
+        manager = MCPManager(settings_path, snapshots=False)
+        manager.toggle_allowed("server-1")
+        incremental_toggle_ms = _best_of(lambda: manager.toggle_allowed("server-1"), options.repeat)
+
+    print(f"=== Validacao incremental ({options.servers} servidores) ===")
+    print(f"toggle_allowed (completa):    {full_toggle_ms:9.3f} ms")
+    print(f"toggle_allowed (incremental): {incremental_toggle_ms:9.3f} ms  "
+          f"({full_toggle_ms / max(incremental_toggle_ms, 1e-9):.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark dos backends JSON (stdlib x orjson) na leitura e escrita de settings.
+
+Mede loads/dumps isolados e o ciclo completo load_settings/save_settings do
+MCPManager para varios tamanhos de settings.json.
+
+Uso:
+    python -m benchmarks.bench_json_backend [--sizes 10,1000,10000] [--repeat 10]
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+
+from benchmarks.synthetic import make_settings, write_settings
+from src.core import json_backend
+from src.core.mcp_manager import MCPManager
+
+
+def _best_of(func, repeat: int) -> float:
+    """Executa func repeat vezes e retorna o menor tempo em milissegundos."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _measure(num_servers: int, repeat: int) -> dict:
+    """Mede as operacoes com o backend atualmente selecionado."""
+    settings = make_settings(num_servers)
+    text = json_backend.dumps(settings)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        settings_path = str(write_settings(temp_dir, num_servers))
+        manager = MCPManager(settings_path)
+
+        def load():
+            # MCPManager novo: leitura sem cache
+            MCPManager(settings_path).load_settings()
+
+        # Alterna entre duas versoes para que o save nunca seja evitado por digest
+        variants = [settings, dict(settings, benchmarkRun=1)]
+        turn = {"index": 0}
+
+        def save():
+            turn["index"] ^= 1
+            manager.save_settings(variants[turn["index"]])
+
+        return {
+            "loads": _best_of(lambda: json_backend.loads(text), repeat),
+            "dumps": _best_of(lambda: json_backend.dumps(settings), repeat),
+            "load_settings": _best_of(load, repeat),
+            "save_settings": _best_of(save, repeat),
+        }
+
+
+def main():
+    """Executa o benchmark e imprime os resultados."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10,1000,10000")
+    parser.add_argument("--repeat", type=int, default=10)
+    options = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    sizes = [int(size) for size in options.sizes.split(",")]
+    backends = ["stdlib"]
+    if json_backend.orjson is not None:
+        backends.append("orjson")
+    else:
+        print("orjson nao instalado; medindo apenas stdlib")
+
+    original = json_backend.get_backend()
+    try:
+        for num_servers in sizes:
+            results = {}
+            for backend in backends:
+                json_backend.set_backend(backend)
+                results[backend] = _measure(num_servers, options.repeat)
+
+            print(f"=== {num_servers} servidores ===")
+            for operation in ("loads", "dumps", "load_settings", "save_settings"):
+                line = f"{operation:14}"
+                for backend in backends:
+                    line += f"  {backend}: {results[backend][operation]:9.3f} ms"
+                if len(backends) > 1:
+                    speedup = results["stdlib"][operation] / max(results["orjson"][operation], 1e-9)
+                    line += f"  ({speedup:.1f}x)"
+                print(line)
+    finally:
+        json_backend.set_backend(original)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Suite de benchmarks dos caminhos criticos do MCPManager e do ConfigManager.
+
+Gera settings.json sinteticos (varios tamanhos, systemInstruction pequeno e
+grande), mede cada operacao e grava os resultados em JSON para comparacao
+entre commits.
+
+Uso:
+    python -m benchmarks.run_benchmarks [--sizes 10,1000,10000,100000] [--repeat 5]
+                                        [--output resultados.json]
+                                        [--compare resultados_anteriores.json]
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic import write_settings
+from src.core import json_backend
+from src.core.config_manager import ConfigManager
+from src.core.mcp_manager import MCPManager
+
+
+DEFAULT_SIZES = "10,1000,10000,100000"
+TEMPLATE_NAME = "context7"
+
+
+def _timings(func: Callable[[], Any], repeat: int,
+             setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """Executa func repeat vezes (setup fora da medicao) e retorna melhor tempo e mediana em ms."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"best_ms": round(min(samples), 4), "median_ms": round(statistics.median(samples), 4)}
+
+
+def _bench_mcp_manager(directory: str, num_servers: int, large_instruction: bool,
+                       repeat: int) -> Dict[str, Dict[str, float]]:
+    """Mede as operacoes do MCPManager sobre um settings.json sintetico."""
+    settings_path = write_settings(directory, num_servers, large_instruction)
+    manager = MCPManager(str(settings_path))
+    settings = manager.load_settings()
+    results = {}
+
+    # Leitura fria: cada medicao usa um MCPManager novo, sem cache
+    cold = {}
+
+    def new_manager():
+        cold["manager"] = MCPManager(str(settings_path))
+
+    results["load_settings_cold"] = _timings(lambda: cold["manager"].load_settings(), repeat,
+                                             setup=new_manager)
+    results["load_settings_warm"] = _timings(manager.load_settings, repeat)
+
+    # Alterna entre duas versoes do settings: um save identico seria evitado
+    # pela comparacao de digest e nao gravaria nada
+    variants = [settings, dict(settings, benchmarkRun=1)]
+    turn = {"index": 0}
+
+    def save_next():
+        turn["index"] ^= 1
+        manager.save_settings(variants[turn["index"]])
+
+    results["save_settings"] = _timings(save_next, repeat)
+    results["get_mcps"] = _timings(manager.get_mcps, repeat)
+    results["toggle_allowed"] = _timings(lambda: manager.toggle_allowed("server-0"), repeat)
+
+    group = [f"server-{i}" for i in range(0, num_servers, 10)]
+    state = {"enable": True}
+
+    def flip_group():
+        if state["enable"]:
+            manager.set_allowed_many(group, [])
+        else:
+            manager.set_allowed_many([], group)
+        state["enable"] = not state["enable"]
+
+    results["set_allowed_many"] = _timings(flip_group, repeat)
+
+    def uninstall():
+        if manager.is_template_installed(TEMPLATE_NAME):
+            manager.remove_mcp(TEMPLATE_NAME)
+
+    results["install_from_template"] = _timings(
+        lambda: manager.install_from_template(TEMPLATE_NAME, skip_dependency_check=True),
+        repeat, setup=uninstall,
+    )
+    return results
+
+
+def _bench_config_manager(directory: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Mede as leituras do ConfigManager."""
+    config_path = Path(directory) / "mcp_config.json"
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump({"user_base_path": directory, "cli_type": "qwen"}, f, indent=2)
+
+    config_manager = ConfigManager(str(config_path))
+    return {
+        "get_cli_type": _timings(config_manager.get_cli_type, repeat),
+        "get_user_path": _timings(config_manager.get_user_path, repeat),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Retorna o commit atual, se disponivel."""
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=10, cwd=Path(__file__).resolve().parent)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def run(sizes: List[int], repeat: int) -> Dict[str, Any]:
+    """Executa a suite completa e retorna o documento de resultados."""
+    benchmarks = {}
+    for num_servers in sizes:
+        for large_instruction in (False, True):
+            key = f"servers={num_servers},instruction={'large' if large_instruction else 'small'}"
+            print(f"Executando {key}...", file=sys.stderr)
+            with tempfile.TemporaryDirectory() as temp_dir:
+                benchmarks[key] = _bench_mcp_manager(temp_dir, num_servers, large_instruction, repeat)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        benchmarks["config_manager"] = _bench_config_manager(temp_dir, max(repeat, 100))
+
+    return {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": json_backend.get_backend(),
+            "repeat": repeat,
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Monta as linhas de comparacao (mediana atual / mediana anterior) entre dois resultados."""
+    lines = [f"Comparacao com {baseline['metadata'].get('commit') or 'resultado anterior'} "
+             f"(mediana, razao < 1 = mais rapido)"]
+    for group, operations in current["benchmarks"].items():
+        previous_group = baseline["benchmarks"].get(group)
+        if previous_group is None:
+            continue
+        lines.append(f"== {group}")
+        for operation, timing in operations.items():
+            previous = previous_group.get(operation)
+            if previous is None:
+                continue
+            ratio = timing["median_ms"] / max(previous["median_ms"], 1e-9)
+            lines.append(f"  {operation:24} {previous['median_ms']:11.3f} ms -> "
+                         f"{timing['median_ms']:11.3f} ms  ({ratio:.2f}x)")
+    return lines
+
+
+def main():
+    """Executa a suite e grava/imprime os resultados."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="quantidades de servidores separadas por virgula")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="arquivo JSON de saida (padrao: stdout)")
+    parser.add_argument("--compare", help="arquivo JSON de uma execucao anterior")
+    options = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    sizes = [int(size) for size in options.sizes.split(",")]
+    results = run(sizes, options.repeat)
+
+    document = json.dumps(results, indent=2)
+    if options.output:
+        Path(options.output).write_text(document + "\n", encoding="utf-8")
+        print(f"Resultados gravados em {options.output}", file=sys.stderr)
+    else:
+        print(document)
+
+    if options.compare:
+        with open(options.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\n".join(compare(results, baseline)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geracao de arquivos settings.json sinteticos para os benchmarks.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+
+SMALL_INSTRUCTION = "Voce e um assistente de programacao."
+LARGE_INSTRUCTION = "Siga as boas praticas de desenvolvimento de software. " * 2000
+
+
+def make_settings(num_servers: int, large_instruction: bool = False,
+                  allowed_ratio: float = 0.5) -> Dict[str, Any]:
+    """
+    Cria uma estrutura de settings com num_servers servidores MCP.
+
+    Args:
+        num_servers: Quantidade de entradas em mcpServers
+        large_instruction: Se True, usa um systemInstruction de ~100 KB
+        allowed_ratio: Fracao dos servidores habilitados em mcp.allowed
+
+    Returns:
+        Dicionario no formato do settings.json
+    """
+    servers = {
+        f"server-{i}": {
+            "command": "npx" if i % 2 else "uvx",
+            "args": ["-y", f"@example/mcp-server-{i}", "--port", str(3000 + i % 1000)],
+        }
+        for i in range(num_servers)
+    }
+    allowed = [f"server-{i}" for i in range(int(num_servers * allowed_ratio))]
+    instruction = LARGE_INSTRUCTION if large_instruction else SMALL_INSTRUCTION
+    return {
+        "ide": {"hasSeenNudge": True, "enabled": True},
+        "mcp": {"allowed": allowed},
+        "mcpServers": servers,
+        "model": {"temperature": 0.7, "systemInstruction": instruction},
+        "generationConfig": {"temperature": 0.7},
+        "security": {"auth": {"selectedType": "oauth-personal"}},
+        "ui": {"theme": "Default"},
+    }
+
+
+def write_settings(directory: Path, num_servers: int, large_instruction: bool = False,
+                   cli_dir: str = ".gemini") -> Path:
+    """
+    Escreve um settings.json sintetico em directory/cli_dir/settings.json.
+
+    Returns:
+        Caminho do arquivo criado
+    """
+    settings_path = Path(directory) / cli_dir / "settings.json"
+    settings_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(settings_path, "w", encoding="utf-8") as f:
+        json.dump(make_settings(num_servers, large_instruction), f, indent=2, ensure_ascii=False)
+    return settings_path
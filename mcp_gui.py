@@ -32,11 +32,14 @@ os servidores disponÃ­veis.
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
+import itertools
 import logging
+import queue
 import sys
 import os
+import threading
+import time
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 
 # DependÃªncias de tema opcionais: sv_ttk e darkdetect
 try:
@@ -58,6 +61,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.core.config_manager import ConfigManager, ConfigManagerError
 from src.core.mcp_manager import MCPManager, MCPManagerError
+from src.core import instrumentation
 
 # Importação condicional do SpecKitManager (apenas para Windows)
 try:
@@ -76,6 +80,318 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _diff_rows(rendered, rows):
+    """
+    Compara as linhas exibidas com as novas (ambas dicionários chave -> valor)
+    e retorna (removidas, inseridas, alteradas) como listas de chaves.
+    """
+    removed = [key for key in rendered if key not in rows]
+    added = [key for key in rows if key not in rendered]
+    changed = [key for key, value in rows.items() if key in rendered and rendered[key] != value]
+    return removed, added, changed
+
+
+# Filas do agendador: tarefas da mesma fila executam uma de cada vez, em ordem
+MANAGER_LANE = "managers"
+SPECKIT_LANE = "speckit"
+
+
+class TaskCancelled(Exception):
+    """
+    Levantada por TaskHandle.check_cancelled() dentro de uma tarefa cancelada
+    """
+    pass
+
+
+class TaskHandle:
+    """
+    Tarefa enviada ao GUIService.
+
+    Fora da tarefa permite acompanhar o estado e cancelar; dentro dela
+    (quando enviada com with_handle=True) permite verificar o cancelamento
+    e reportar progresso.
+    """
+
+    def __init__(self, service, description, slot, lane, on_progress, cancel_on_close):
+        self.description = description
+        self.slot = slot
+        self.lane = lane
+        self.cancel_on_close = cancel_on_close
+        # pending, running, done, failed ou cancelled
+        self.state = "pending"
+        # Exceção levantada pela tarefa, se falhou
+        self.error = None
+        self._service = service
+        self._on_progress = on_progress
+        self._cancel_event = threading.Event()
+
+    def __repr__(self):
+        return f"TaskHandle(description={self.description!r}, lane={self.lane!r}, state={self.state!r})"
+
+    @property
+    def cancelled(self):
+        """
+        True se o cancelamento foi solicitado
+        """
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """
+        Solicita o cancelamento: uma tarefa pendente não chega a executar e uma
+        em execução para no próximo check_cancelled(). Os callbacks de resultado
+        não são chamados; on_cancel é chamado no lugar deles.
+        """
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        """
+        Levanta TaskCancelled se o cancelamento foi solicitado (chamar entre etapas)
+        """
+        if self.cancelled:
+            raise TaskCancelled(self.description or "Tarefa cancelada")
+
+    def report(self, value):
+        """
+        Envia um progresso para on_progress na thread do Tk (chamado de dentro da tarefa)
+        """
+        if self._on_progress is not None and not self.cancelled:
+            on_progress = self._on_progress
+            self._service._deliver(lambda: on_progress(value))
+
+
+class GUIService:
+    """
+    Camada de serviço da interface: agendador de tarefas de longa duração que
+    executa as chamadas ao MCPManager, ao ConfigManager e ao SpecKitManager em
+    threads de trabalho e entrega os resultados à thread do Tk com root.after.
+
+    Cada fila ("lane") tem uma thread própria, criada no primeiro uso e mantida
+    até shutdown(); as tarefas de uma fila executam uma de cada vez, por
+    prioridade e depois por ordem de envio, para que os gerenciadores nunca
+    sejam usados por duas threads ao mesmo tempo. Tarefas enviadas com o mesmo
+    slot se substituem: a nova cancela a anterior que ainda não terminou.
+    """
+
+    def __init__(self, root, on_busy_change=None):
+        """
+        Inicializa o serviço
+
+        Args:
+            root: Janela principal (usada para agendar callbacks na thread do Tk)
+            on_busy_change: Chamado com (ocupado, descrição) quando o estado muda
+        """
+        self.root = root
+        self.on_busy_change = on_busy_change
+        self._queues = {}
+        self._workers = {}
+        self._slots = {}
+        # Tarefas ainda não concluídas (mantido na thread do Tk)
+        self._active = []
+        self._sequence = itertools.count()
+        self._closed = False
+
+    @property
+    def busy(self):
+        """
+        True enquanto houver tarefas enviadas e ainda não concluídas
+        """
+        return bool(self._active)
+
+    def tasks(self, lane=None):
+        """
+        Retorna as tarefas ainda não concluídas (opcionalmente de uma fila)
+        """
+        return [handle for handle in self._active if lane is None or handle.lane == lane]
+
+    def submit(self, task, on_success=None, on_error=None, rollback=None, description=None,
+               slot=None, lane=MANAGER_LANE, priority=0, on_progress=None, on_cancel=None,
+               with_handle=False, cancel_on_close=False):
+        """
+        Agenda task na fila indicada
+
+        Args:
+            task: Função executada fora da thread do Tk; recebe o TaskHandle se with_handle=True
+            on_success: Recebe o resultado de task (thread do Tk)
+            on_error: Recebe a exceção levantada por task (thread do Tk);
+                      sem ele o erro é registrado e exibido em uma caixa de diálogo
+            rollback: Desfaz a atualização otimista feita antes do envio;
+                      chamado antes de on_error (thread do Tk)
+            description: Texto exibido na barra de status enquanto a tarefa executa
+            slot: Nome do slot; uma tarefa nova no mesmo slot cancela a anterior
+            lane: Fila de execução (MANAGER_LANE, SPECKIT_LANE, ...)
+            priority: Tarefas de maior prioridade passam à frente das pendentes da fila
+            on_progress: Recebe os valores de TaskHandle.report() (thread do Tk)
+            on_cancel: Chamado quando a tarefa termina cancelada (thread do Tk)
+            with_handle: Passa o TaskHandle para task
+            cancel_on_close: Cancela a tarefa em shutdown() em vez de aguardá-la
+
+        Returns:
+            O TaskHandle da tarefa (já cancelado se o serviço foi encerrado)
+        """
+        handle = TaskHandle(self, description, slot, lane, on_progress, cancel_on_close)
+        if self._closed:
+            handle.cancel()
+            handle.state = "cancelled"
+            return handle
+
+        if slot is not None:
+            previous = self._slots.get(slot)
+            if previous is not None:
+                previous.cancel()
+            self._slots[slot] = handle
+
+        self._active.append(handle)
+        if self.on_busy_change:
+            self.on_busy_change(True, description)
+
+        callbacks = (on_success, on_error, rollback, on_cancel)
+        self._lane_queue(lane).put((-priority, next(self._sequence), (handle, task, with_handle, callbacks)))
+        return handle
+
+    def cancel(self, lane=None):
+        """
+        Cancela as tarefas ainda não concluídas (opcionalmente de uma fila)
+
+        Returns:
+            Número de tarefas cujo cancelamento foi solicitado
+        """
+        handles = self.tasks(lane)
+        for handle in handles:
+            handle.cancel()
+        return len(handles)
+
+    def _lane_queue(self, lane):
+        """
+        Retorna a fila de lane, iniciando sua thread de trabalho no primeiro uso
+        """
+        if lane not in self._queues:
+            lane_queue = queue.PriorityQueue()
+            worker = threading.Thread(target=self._work, args=(lane_queue,),
+                                      name=f"mcp-gui-{lane}", daemon=True)
+            self._queues[lane] = lane_queue
+            self._workers[lane] = worker
+            worker.start()
+        return self._queues[lane]
+
+    def _work(self, lane_queue):
+        """
+        Laço da thread de trabalho de uma fila
+        """
+        while True:
+            _, _, item = lane_queue.get()
+            if item is None:
+                return
+            handle, task, with_handle, callbacks = item
+            if handle.cancelled:
+                outcome, value = "cancelled", None
+            else:
+                handle.state = "running"
+                try:
+                    value = task(handle) if with_handle else task()
+                    outcome = "done"
+                except TaskCancelled:
+                    outcome, value = "cancelled", None
+                except Exception as e:
+                    outcome, value = "failed", e
+                    handle.error = e
+            delivered = self._deliver(lambda handle=handle, outcome=outcome, value=value, callbacks=callbacks:
+                                      self._finish(handle, outcome, value, callbacks))
+            if not delivered:
+                self._drop(handle, outcome, value)
+
+    def _deliver(self, callback):
+        """
+        Agenda callback na thread do Tk (ignorado depois de shutdown)
+
+        Returns:
+            False se o callback não foi agendado
+        """
+        if self._closed:
+            return False
+        try:
+            self.root.after(0, callback)
+        except (RuntimeError, tk.TclError):
+            # Janela já destruída
+            return False
+        return True
+
+    def _drop(self, handle, outcome, value):
+        """
+        Conclui uma tarefa cujo resultado não pode mais ser entregue (após shutdown);
+        as falhas são registradas no log para não se perderem em silêncio
+        """
+        handle.state = outcome
+        if outcome == "failed":
+            logger.error(f"Erro em tarefa concluída após o encerramento "
+                         f"({handle.description or 'sem descrição'}): {value}")
+
+    def _finish(self, handle, outcome, value, callbacks):
+        """
+        Conclui uma tarefa na thread do Tk
+        """
+        if self._closed:
+            self._drop(handle, outcome, value)
+            return
+        on_success, on_error, rollback, on_cancel = callbacks
+        self._active.remove(handle)
+        if handle.slot is not None and self._slots.get(handle.slot) is handle:
+            del self._slots[handle.slot]
+        if self.on_busy_change and not self._active:
+            self.on_busy_change(False, None)
+
+        # Uma tarefa substituída ou cancelada não entrega resultado
+        if outcome == "cancelled" or handle.cancelled:
+            handle.state = "cancelled"
+            if on_cancel:
+                on_cancel()
+        elif outcome == "failed":
+            handle.state = "failed"
+            if rollback:
+                rollback()
+            if on_error:
+                on_error(value)
+            else:
+                logger.error(f"Erro em tarefa de segundo plano: {value}")
+                messagebox.showerror("Erro", f"Erro ao executar a operação:\n{value}")
+        else:
+            handle.state = "done"
+            if on_success:
+                on_success(value)
+
+    def shutdown(self, wait=True, timeout=10.0):
+        """
+        Encerra o serviço sem executar mais callbacks.
+
+        Tarefas enviadas com cancel_on_close=True são canceladas; as demais
+        (por exemplo, uma gravação pendente) executam antes de as threads
+        terminarem, e as que falharem são registradas no log. Com wait=True
+        aguarda as threads por até timeout segundos.
+
+        Returns:
+            True se todas as threads de trabalho terminaram
+        """
+        if not self._closed:
+            self._close_lanes()
+        if wait:
+            deadline = time.monotonic() + timeout if timeout is not None else None
+            for worker in self._workers.values():
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                worker.join(remaining)
+        return not any(worker.is_alive() for worker in self._workers.values())
+
+    def _close_lanes(self):
+        """
+        Marca o serviço como encerrado e enfileira a sentinela de cada fila
+        """
+        self._closed = True
+        for handle in self._active:
+            if handle.cancel_on_close:
+                handle.cancel()
+        for lane_queue in self._queues.values():
+            # Sentinela depois de todas as tarefas pendentes
+            lane_queue.put((float("inf"), next(self._sequence), None))
+
+
 class MCPGUI:
     """
     Classe principal da Interface GrÃ¡fica do MCP Manager
@@ -90,14 +406,26 @@ class MCPGUI:
         self.config_manager = None
         self.mcp_manager = None
         self.speckit_manager = None
-        self.mcp_vars = {}
+        self.mcp_states = {}
+        # Último estado confirmado pelos gerenciadores (evita leituras na thread do Tk)
+        self._cli_type = None
+        self._temperature = None
+        # Modelo das linhas exibidas (chave -> valores), usado para atualizar só o que mudou
+        self._mcp_rows = {}
+        self._template_cards = {}
         self.pending_changes = False
+        # Estados escolhidos pelo usuário e ainda não salvos (nome -> ativo);
+        # sobrevivem às atualizações da lista feitas em segundo plano
+        self._pending_toggles = {}
         self.temperature_var = None
         self.temperature_frame = None
         self.theming_available = False
         
         # Inicializar a janela principal com tratamento de erro para o tema
         self._init_window_with_theme()
+
+        # Chamadas aos gerenciadores fora da thread do Tk
+        self.service = GUIService(self.root, on_busy_change=self._on_busy_change)
         
         # Inicializar os gerenciadores
         self._init_managers()
@@ -169,7 +497,7 @@ class MCPGUI:
         Inicializa os gerenciadores de configuração e MCP
         """
         try:
-            self.config_manager = ConfigManager()
+            self.config_manager = ConfigManager.shared()
             self.mcp_manager = MCPManager(config_manager=self.config_manager)
             
             # Inicializar o SpecKitManager (apenas no Windows)
@@ -208,7 +536,9 @@ class MCPGUI:
         else:
             # Desabilita ou omite quando theming nÃ£o estÃ¡ disponÃ­vel
             view_menu.add_command(label="Alternar Tema (Claro/Escuro)", state='disabled')
+        view_menu.add_command(label="Recarregar", accelerator="F5", command=self._refresh_lists)
         menubar.add_cascade(label="Exibir", menu=view_menu)
+        self.root.bind('<F5>', lambda e: self._refresh_lists())
         self.root.config(menu=menubar)
 
         # Criar o notebook para abas
@@ -389,9 +719,32 @@ class MCPGUI:
         list_frame = ttk.LabelFrame(main_frame, text="Servidores", padding="15")
         list_frame.pack(fill='both', expand=True, pady=(0, 15))
         
-        # Scrollable frame para a lista de MCPs
-        canvas, scrollbar, inner_frame = self._make_scrollable_list(list_frame)
-        self.mcp_list_frame = inner_frame
+        # Lista virtualizada: o Treeview só desenha as linhas visíveis,
+        # então milhares de servidores não criam milhares de widgets
+        self.mcp_empty_label = ttk.Label(list_frame, text="Nenhum servidor MCP configurado")
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical")
+        self.mcp_tree = ttk.Treeview(
+            list_frame,
+            columns=("enabled", "name", "command"),
+            show="headings",
+            selectmode="browse",
+            yscrollcommand=scrollbar.set
+        )
+        scrollbar.configure(command=self.mcp_tree.yview)
+        self.mcp_tree.heading("enabled", text="Ativo")
+        self.mcp_tree.heading("name", text="Nome", anchor='w')
+        self.mcp_tree.heading("command", text="Comando", anchor='w')
+        self.mcp_tree.column("enabled", width=60, minwidth=60, stretch=False, anchor='center')
+        self.mcp_tree.column("name", width=220, minwidth=120, anchor='w')
+        self.mcp_tree.column("command", width=300, minwidth=120, anchor='w')
+        self.mcp_tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        # Clique na coluna "Ativo" ou espaço alternam; duplo clique edita; Delete remove
+        self.mcp_tree.bind("<Button-1>", self._on_mcp_tree_click)
+        self.mcp_tree.bind("<space>", lambda e: self._toggle_selected_mcp())
+        self.mcp_tree.bind("<Double-1>", self._on_mcp_tree_double_click)
+        self.mcp_tree.bind("<Delete>", lambda e: self._remove_selected_mcp())
         
         # Frame para botÃµes
         button_frame = ttk.Frame(main_frame)
@@ -402,6 +755,18 @@ class MCPGUI:
             text="Adicionar MCP",
             command=self._add_mcp_dialog
         ).pack(side='left', padx=5)
+
+        ttk.Button(
+            button_frame,
+            text="Editar",
+            command=lambda: self._edit_selected_mcp()
+        ).pack(side='left', padx=5)
+
+        ttk.Button(
+            button_frame,
+            text="Remover",
+            command=lambda: self._remove_selected_mcp()
+        ).pack(side='left', padx=5)
         
         ttk.Button(
             button_frame,
@@ -439,6 +804,7 @@ class MCPGUI:
         # Scrollable frame para a lista de templates
         canvas, scrollbar, inner_frame = self._make_scrollable_list(list_frame)
         self.templates_list_frame = inner_frame
+        self.templates_empty_label = ttk.Label(inner_frame, text="Nenhum template disponível")
     
     def _setup_speckit_tab(self):
         """
@@ -530,6 +896,15 @@ class MCPGUI:
             command=self._install_all_speckit
         )
         self.install_all_button.pack(fill='x', pady=8)
+
+        # Cancela a operação em andamento (ao fim da etapa atual)
+        self.cancel_speckit_button = ttk.Button(
+            buttons_frame,
+            text="Cancelar",
+            command=self._cancel_speckit_action,
+            state='disabled'
+        )
+        self.cancel_speckit_button.pack(fill='x', pady=8)
         
         # Desabilitar botões se o SpecKitManager não estiver disponível
         if not self.speckit_manager:
@@ -569,29 +944,50 @@ class MCPGUI:
             self.add_to_path_button.config(state=state)
         if hasattr(self, 'install_all_button') and self.install_all_button:
             self.install_all_button.config(state=state)
+        # O botão Cancelar fica habilitado apenas durante as operações
+        if hasattr(self, 'cancel_speckit_button') and self.cancel_speckit_button:
+            self.cancel_speckit_button.config(state='normal' if state == 'disabled' else 'disabled')
     
-    def _run_bg(self, task, on_done):
+    def _run_bg(self, task, on_done, description=None, slot=None):
         """
-        Wrapper para executar tarefas em background usando ThreadPoolExecutor
+        Agenda uma tarefa do Spec-Kit no agendador da interface (fila SPECKIT_LANE)
         
         Args:
-            task: Função a ser executada em background
-            on_done: Callback para ser chamado quando a tarefa terminar
+            task: Função executada em background; recebe o TaskHandle, cujo
+                  report(mensagem) escreve no log da aba e check_cancelled()
+                  interrompe a tarefa entre etapas
+            on_done: Callback (resultado, erro) chamado na thread principal
+            description: Texto exibido na barra de status durante a execução
+            slot: Slot da tarefa; uma nova tarefa no mesmo slot substitui a anterior
+
+        Returns:
+            O TaskHandle da tarefa
         """
-        def background_task():
-            try:
-                result = task()
-                # Agendar o callback para ser executado na thread principal
-                self.root.after(0, lambda: on_done(result, None))
-            except Exception as e:
-                # Agendar o callback com erro para ser executado na thread principal
-                self.root.after(0, lambda: on_done(None, e))
-        
-        # Criar e executar o ThreadPoolExecutor
-        executor = ThreadPoolExecutor(max_workers=1)
-        executor.submit(background_task)
-        executor.shutdown(wait=False)
-    
+        def on_cancel():
+            self._log_to_speckit("Operação cancelada", 'warning')
+            self.status_label.config(text="Operação cancelada")
+            self._set_speckit_buttons_state('normal')
+
+        return self.service.submit(
+            task,
+            on_success=lambda result: on_done(result, None),
+            on_error=lambda error: on_done(None, error),
+            on_cancel=on_cancel,
+            on_progress=self._log_to_speckit,
+            description=description,
+            slot=slot,
+            lane=SPECKIT_LANE,
+            with_handle=True,
+            cancel_on_close=True
+        )
+
+    def _cancel_speckit_action(self):
+        """
+        Solicita o cancelamento das operações do Spec-Kit em andamento
+        """
+        if self.service.cancel(lane=SPECKIT_LANE):
+            self._log_to_speckit("Cancelamento solicitado; a etapa atual será concluída antes de parar", 'warning')
+
     def _log_to_speckit(self, message: str, level: str = 'info'):
         """
         Método auxiliar para adicionar mensagens ao log da aba Spec-Kit
@@ -634,21 +1030,26 @@ class MCPGUI:
             self._log_to_speckit("SpecKitManager não disponível", 'error')
             return
         
-        try:
-            self._log_to_speckit("Verificando instalação do UV...")
-            installed, version = self.speckit_manager.check_uv_installed()
-            
+        self._log_to_speckit("Verificando instalação do UV...")
+
+        def on_done(result, error):
+            if error:
+                self._log_to_speckit(f"✗ Erro ao verificar UV: {error}", 'error')
+                messagebox.showerror("Erro", f"Erro ao verificar UV:\n{error}")
+                return
+
+            installed, version = result
             if installed:
                 self._log_to_speckit(f"✓ UV está instalado: {version}")
                 self.status_label.config(text="UV está instalado")
             else:
                 self._log_to_speckit("✗ UV não está instalado")
                 self.status_label.config(text="UV não está instalado")
-                
-        except Exception as e:
-            self._log_to_speckit(f"✗ Erro ao verificar UV: {e}", 'error')
-            messagebox.showerror("Erro", f"Erro ao verificar UV:\n{e}")
-    
+
+        # Uma nova verificação substitui a que ainda estiver pendente
+        self._run_bg(lambda task: self.speckit_manager.check_uv_installed(), on_done,
+                     description="Verificando UV...", slot="uv-status")
+
     def _install_uv_action(self):
         """
         Instala o UV
@@ -665,8 +1066,8 @@ class MCPGUI:
         self._log_to_speckit("Isso pode levar alguns minutos. Aguarde...")
         
         # Definir a tarefa de background
-        def install_task():
-            return self.speckit_manager.install_uv(log_callback=self._log_to_speckit)
+        def install_task(task):
+            return self.speckit_manager.install_uv(log_callback=task.report)
         
         # Definir o callback para quando a tarefa terminar
         def on_done(result, error):
@@ -692,7 +1093,7 @@ class MCPGUI:
             self._set_speckit_buttons_state('normal')
         
         # Executar a tarefa em background
-        self._run_bg(install_task, on_done)
+        self._run_bg(install_task, on_done, description="Instalando UV...")
     
     def _install_speckit_action(self):
         """
@@ -704,25 +1105,28 @@ class MCPGUI:
         
         # Verificar pré-requisitos
         self._log_to_speckit("Verificando pré-requisitos...")
-        uv_installed, _ = self.speckit_manager.check_uv_installed()
-        
-        if not uv_installed:
-            if not messagebox.askyesno(
+
+        def on_checked(result, error):
+            if error:
+                self._log_to_speckit(f"✗ Erro ao verificar UV: {error}", 'error')
+                messagebox.showerror("Erro", f"Erro ao verificar UV:\n{error}")
+                return
+            uv_installed, _ = result
+            if not uv_installed and not messagebox.askyesno(
                 "Pré-requisito Ausente",
                 "UV não está instalado. Deseja instalar o UV primeiro?"
             ):
                 self._log_to_speckit("Instalação cancelada pelo usuário", 'warning')
                 return
-            
-            # Instalar UV primeiro
-            self._install_uv_action()
-            
-            # Verificar novamente
-            uv_installed, _ = self.speckit_manager.check_uv_installed()
-            if not uv_installed:
-                self._log_to_speckit("✗ Falha na instalação do UV, não é possível continuar", 'error')
-                return
-        
+            self._run_install_speckit(install_uv_first=not uv_installed)
+
+        self._run_bg(lambda task: self.speckit_manager.check_uv_installed(), on_checked,
+                     description="Verificando pré-requisitos...")
+
+    def _run_install_speckit(self, install_uv_first):
+        """
+        Instala o Spec-Kit em background (instalando o UV antes, se necessário)
+        """
         # Desabilitar botões durante a instalação
         self._set_speckit_buttons_state('disabled')
         
@@ -731,8 +1135,16 @@ class MCPGUI:
         self._log_to_speckit("Isso pode levar até 10 minutos. Aguarde...")
         
         # Definir a tarefa de background
-        def install_task():
-            return self.speckit_manager.install_speckit(log_callback=self._log_to_speckit)
+        def install_task(task):
+            if install_uv_first:
+                # Instalar UV primeiro e verificar novamente
+                task.report("Instalando UV...")
+                self.speckit_manager.install_uv(log_callback=task.report)
+                uv_installed, _ = self.speckit_manager.check_uv_installed()
+                if not uv_installed:
+                    raise SpecKitManagerError("Falha na instalação do UV, não é possível continuar")
+                task.check_cancelled()
+            return self.speckit_manager.install_speckit(log_callback=task.report)
         
         # Definir o callback para quando a tarefa terminar
         def on_done(result, error):
@@ -756,7 +1168,7 @@ class MCPGUI:
             self._set_speckit_buttons_state('normal')
         
         # Executar a tarefa em background
-        self._run_bg(install_task, on_done)
+        self._run_bg(install_task, on_done, description="Instalando Spec-Kit...")
     
     def _add_to_path_action(self):
         """
@@ -773,15 +1185,15 @@ class MCPGUI:
         self._log_to_speckit("Obtendo caminho do binário do UV...")
         
         # Definir a tarefa de background
-        def add_path_task():
+        def add_path_task(task):
             bin_path = self.speckit_manager.get_uv_bin_path()
             
             if not bin_path:
                 raise Exception("Não foi possível determinar o caminho do UV. Certifique-se de que o UV está instalado.")
             
-            self._log_to_speckit(f"Caminho encontrado: {bin_path}")
+            task.report(f"Caminho encontrado: {bin_path}")
             
-            return self.speckit_manager.add_to_windows_path(bin_path, log_callback=self._log_to_speckit)
+            return self.speckit_manager.add_to_windows_path(bin_path, log_callback=task.report)
         
         # Definir o callback para quando a tarefa terminar
         def on_done(result, error):
@@ -819,7 +1231,7 @@ class MCPGUI:
             self._set_speckit_buttons_state('normal')
         
         # Executar a tarefa em background
-        self._run_bg(add_path_task, on_done)
+        self._run_bg(add_path_task, on_done, description="Adicionando ao PATH...")
     
     def _install_all_speckit(self):
         """
@@ -843,43 +1255,56 @@ class MCPGUI:
             return
         
         self._log_to_speckit("=== Iniciando instalação completa do Spec-Kit ===")
-        
-        try:
+        self._set_speckit_buttons_state('disabled')
+
+        # Todos os passos em uma única tarefa: executam em ordem e podem ser
+        # cancelados entre um passo e outro
+        def install_all_task(task):
             # Passo 1: Verificar UV
-            self._log_to_speckit("Passo 1/4: Verificando instalação do UV...")
-            self._check_uv_status()
-            
-            uv_installed, _ = self.speckit_manager.check_uv_installed()
-            
+            task.report("Passo 1/4: Verificando instalação do UV...")
+            uv_installed, version = self.speckit_manager.check_uv_installed()
+            task.report(f"✓ UV está instalado: {version}" if uv_installed else "✗ UV não está instalado")
+            task.check_cancelled()
+
             # Passo 2: Instalar UV (se necessário)
             if not uv_installed:
-                self._log_to_speckit("Passo 2/4: Instalando UV...")
-                self._install_uv_action()
-                
-                # Verificar novamente
+                task.report("Passo 2/4: Instalando UV...")
+                self.speckit_manager.install_uv(log_callback=task.report)
                 uv_installed, _ = self.speckit_manager.check_uv_installed()
                 if not uv_installed:
-                    self._log_to_speckit("✗ Falha na instalação do UV, interrompendo instalação", 'error')
-                    self.status_label.config(text="Instalação interrompida")
-                    return
+                    raise SpecKitManagerError("Falha na instalação do UV, interrompendo instalação")
             else:
-                self._log_to_speckit("Passo 2/4: UV já está instalado, pulando...")
-            
+                task.report("Passo 2/4: UV já está instalado, pulando...")
+            task.check_cancelled()
+
             # Passo 3: Instalar Spec-Kit
-            self._log_to_speckit("Passo 3/4: Instalando Spec-Kit...")
-            self._install_speckit_action()
-            
+            task.report("Passo 3/4: Instalando Spec-Kit...")
+            if not self.speckit_manager.install_speckit(log_callback=task.report):
+                raise SpecKitManagerError("Falha na instalação do Spec-Kit")
+            task.check_cancelled()
+
             # Passo 4: Adicionar ao PATH
-            self._log_to_speckit("Passo 4/4: Adicionando ao PATH...")
-            self._add_to_path_action()
-            
-            self._log_to_speckit("=== Instalação completa finalizada ===")
-            self.status_label.config(text="Instalação completa concluída")
-            
-        except Exception as e:
-            self._log_to_speckit(f"✗ Erro durante a instalação automática: {e}", 'error')
-            self.status_label.config(text="Instalação interrompida")
-            messagebox.showerror("Erro", f"Erro durante a instalação automática:\n{e}")
+            task.report("Passo 4/4: Adicionando ao PATH...")
+            bin_path = self.speckit_manager.get_uv_bin_path()
+            if not bin_path:
+                raise SpecKitManagerError("Não foi possível determinar o caminho do UV")
+            return self.speckit_manager.add_to_windows_path(bin_path, log_callback=task.report)
+
+        def on_done(result, error):
+            if error:
+                self._log_to_speckit(f"✗ Erro durante a instalação automática: {error}", 'error')
+                self.status_label.config(text="Instalação interrompida")
+                messagebox.showerror("Erro", f"Erro durante a instalação automática:\n{error}")
+            else:
+                if not result:
+                    self._log_to_speckit("✗ Falha ao adicionar ao PATH", 'error')
+                self._log_to_speckit("=== Instalação completa finalizada ===")
+                self.status_label.config(text="Instalação completa concluída")
+
+            # Reabilitar botões
+            self._set_speckit_buttons_state('normal')
+
+        self._run_bg(install_all_task, on_done, description="Instalando Spec-Kit (todos os passos)...")
     
     def _setup_status_bar(self):
         """
@@ -888,276 +1313,488 @@ class MCPGUI:
         status_frame = ttk.Frame(self.root)
         status_frame.pack(fill='x', side='bottom')
         
+        # Indicador de atividade (visível apenas enquanto há tarefas em execução)
+        self.busy_bar = ttk.Progressbar(status_frame, mode='indeterminate', length=120)
+
         self.status_label = ttk.Label(status_frame, text="Pronto", relief='sunken')
         self.status_label.pack(fill='x', padx=2, pady=2)
+
+    def _on_busy_change(self, busy, description):
+        """
+        Exibe ou oculta o estado de ocupado (cursor, barra de progresso e status)
+        """
+        if busy:
+            if description:
+                self.status_label.config(text=description)
+            if not self.busy_bar.winfo_ismapped():
+                self.busy_bar.pack(side='right', padx=2, before=self.status_label)
+                self.busy_bar.start(15)
+            self.root.config(cursor='watch')
+        else:
+            self.busy_bar.stop()
+            self.busy_bar.pack_forget()
+            self.root.config(cursor='')
     
     def _load_initial_data(self):
         """
-        Carrega os dados iniciais na interface
+        Carrega os dados iniciais na interface (leitura em segundo plano)
         """
-        try:
-            # Carregar configurações do CLI
+        def load():
             cli_type = self.config_manager.get_cli_type()
-            self.cli_var.set(cli_type)
+            data = self._read_state(cli_type)
+            data["user_path"] = self.config_manager.get_user_path()
+            return data
 
-            # Carregar caminho do usuário
-            user_path = self.config_manager.get_user_path()
-            if user_path:
-                self.path_label.config(text=user_path)
-            else:
-                self.path_label.config(text="Não configurado")
+        def on_success(data):
+            self._apply_state(data)
+            self.status_label.config(text="Dados carregados com sucesso")
+
+        def on_error(e):
+            logger.error(f"Erro ao carregar dados iniciais: {e}")
+            messagebox.showerror("Erro", f"Erro ao carregar dados:\n{e}")
 
-            # Carregar lista de MCPs
-            self._refresh_mcp_list()
+        self.service.submit(load, on_success, on_error, description="Carregando dados...",
+                            slot="refresh", cancel_on_close=True)
 
-            # Carregar lista de templates
-            self._refresh_templates_list()
+    def _read_state(self, cli_type):
+        """
+        Lê MCPs, templates e temperatura (executado na thread de trabalho)
+        """
+        data = self._read_lists()
+        data["cli_type"] = cli_type
+        data["temperature"] = self.mcp_manager.get_temperature() if cli_type in ["gemini", "qwen"] else None
+        return data
 
-            # Carregar configuração de temperatura e atualizar UI
+    def _apply_state(self, data):
+        """
+        Aplica na interface o resultado de _read_state (thread do Tk)
+        """
+        if "cli_type" in data:
+            self._cli_type = data["cli_type"]
+            self.cli_var.set(self._cli_type)
             self._update_temperature_visibility()
-            self._load_temperature_state()
+        if "user_path" in data:
+            self.path_label.config(text=data["user_path"] or "Não configurado")
+        if "mcps" in data:
+            self._render_mcp_list(data["mcps"])
+        if "templates" in data:
+            self._render_templates_list(data["templates"])
+        if data.get("temperature") is not None:
+            self._temperature = data["temperature"]
+            self._show_temperature(self._temperature)
 
-            self.status_label.config(text="Dados carregados com sucesso")
-            
-        except Exception as e:
-            logger.error(f"Erro ao carregar dados iniciais: {e}")
-            messagebox.showerror("Erro", f"Erro ao carregar dados:\n{e}")
-    
-    def _refresh_mcp_list(self):
+    def _refresh_lists(self):
         """
-        Atualiza a lista de MCPs na interface usando um layout de grid.
+        Recarrega as listas de MCPs e templates (F5); uma nova atualização
+        substitui a que ainda estiver pendente
         """
-        # Limpar widgets existentes
-        for widget in self.mcp_list_frame.winfo_children():
-            widget.destroy()
-        
-        self.mcp_vars.clear()
-        
-        # Configurar o grid para expandir a coluna do meio
-        self.mcp_list_frame.grid_columnconfigure(1, weight=1)
+        def on_error(e):
+            logger.error(f"Erro ao atualizar listas: {e}")
+            messagebox.showerror("Erro", f"Erro ao carregar MCPs:\n{e}")
 
-        try:
-            mcps = self.mcp_manager.get_mcps()
-            
-            if not mcps:
-                ttk.Label(
-                    self.mcp_list_frame,
-                    text="Nenhum servidor MCP configurado"
-                ).grid(row=0, column=0, pady=20, padx=10)
-                return
-            
-            for i, (name, details) in enumerate(mcps.items()):
-                var = tk.BooleanVar(value=details.get('enabled', False))
-                self.mcp_vars[name] = var
-                
-                # Checkbox para habilitar/desabilitar
-                cb = ttk.Checkbutton(
-                    self.mcp_list_frame,
-                    text=name,
-                    variable=var,
-                    command=self._on_mcp_toggle
-                )
-                cb.grid(row=i, column=0, sticky='w', padx=(5, 10), pady=8)
-                
-                # Label com detalhes do comando
-                cmd_text = f"Comando: {details.get('command', '')}"
-                cmd_label = ttk.Label(self.mcp_list_frame, text=cmd_text, font=('TkDefaultFont', 9))
-                cmd_label.grid(row=i, column=1, sticky='w', padx=(0, 10))
-                
-                # BotÃ£o para editar
-                edit_button = ttk.Button(
-                    self.mcp_list_frame,
-                    text="Editar",
-                    command=lambda n=name: self._edit_mcp(n)
-                )
-                edit_button.grid(row=i, column=2, sticky='e', padx=5)
+        self.service.submit(self._read_lists, self._apply_state, on_error,
+                            description="Atualizando listas...", slot="refresh", cancel_on_close=True)
 
-                # BotÃ£o para remover
-                remove_button = ttk.Button(
-                    self.mcp_list_frame,
-                    text="Remover",
-                    command=lambda n=name: self._remove_mcp(n)
-                )
-                remove_button.grid(row=i, column=3, sticky='e', padx=(0, 5))
-        
-        except Exception as e:
-            logger.error(f"Erro ao atualizar lista de MCPs: {e}")
-            messagebox.showerror("Erro", f"Erro ao carregar MCPs:\n{e}")
+    def _read_lists(self):
+        """
+        Lê MCPs e templates (executado na thread de trabalho)
+        """
+        return {
+            "mcps": self.mcp_manager.get_mcps(),
+            "templates": self.mcp_manager.get_templates_status(),
+        }
+
+    def _render_mcp_list(self, mcps):
+        """
+        Atualiza a lista de MCPs na interface (Treeview virtualizado).
+
+        Só as linhas inseridas, removidas ou alteradas desde a última
+        atualização são tocadas; as demais são mantidas como estão.
+        """
+        # Alternâncias ainda não salvas prevalecem sobre o estado lido do disco
+        states = {
+            name: self._pending_toggles.get(name, details.get('enabled', False))
+            for name, details in mcps.items()
+        }
+        rows = {
+            name: (self._check_mark(states[name]), name, details.get('command', ''))
+            for name, details in mcps.items()
+        }
+        self._render_mcp_rows(rows)
+        self.mcp_states = states
+
+    def _render_mcp_rows(self, rows):
+        """
+        Aplica no Treeview as diferenças entre as linhas exibidas e rows
+        """
+        removed, added, changed = _diff_rows(self._mcp_rows, rows)
+
+        if removed:
+            self.mcp_tree.delete(*removed)
+        for name in changed:
+            self.mcp_tree.item(name, values=rows[name])
+        for name in added:
+            self.mcp_tree.insert('', 'end', iid=name, values=rows[name])
+        # Reordenar apenas se a ordem das configurações mudou
+        if list(self.mcp_tree.get_children()) != list(rows):
+            for index, name in enumerate(rows):
+                self.mcp_tree.move(name, '', index)
+
+        self._mcp_rows = dict(rows)
+
+        if rows:
+            self.mcp_empty_label.pack_forget()
+        else:
+            self.mcp_empty_label.pack(before=self.mcp_tree, pady=20)
+
+    @staticmethod
+    def _check_mark(enabled):
+        """
+        Retorna o símbolo exibido na coluna "Ativo"
+        """
+        return "\u2611" if enabled else "\u2610"
+
+    def _selected_mcp(self):
+        """
+        Retorna o nome do MCP selecionado na lista (ou None)
+        """
+        selection = self.mcp_tree.selection()
+        return selection[0] if selection else None
+
+    def _toggle_mcp(self, name):
+        """
+        Alterna o estado de um MCP na lista (a gravação ocorre em "Salvar Alterações")
+        """
+        if name not in self.mcp_states:
+            return
+        enabled = not self.mcp_states[name]
+        self.mcp_states[name] = enabled
+        self._pending_toggles[name] = enabled
+        self._mcp_rows[name] = (self._check_mark(enabled),) + self._mcp_rows[name][1:]
+        self.mcp_tree.set(name, "enabled", self._check_mark(enabled))
+        self._on_mcp_toggle()
+
+    def _toggle_selected_mcp(self):
+        """
+        Alterna o MCP selecionado
+        """
+        name = self._selected_mcp()
+        if name:
+            self._toggle_mcp(name)
+        return "break"
+
+    def _on_mcp_tree_click(self, event):
+        """
+        Clique na coluna "Ativo" alterna o MCP da linha
+        """
+        if self.mcp_tree.identify_region(event.x, event.y) != "cell":
+            return None
+        if self.mcp_tree.identify_column(event.x) != "#1":
+            return None
+        name = self.mcp_tree.identify_row(event.y)
+        if name:
+            self.mcp_tree.selection_set(name)
+            self._toggle_mcp(name)
+        return "break"
+
+    def _on_mcp_tree_double_click(self, event):
+        """
+        Duplo clique em uma linha abre o diálogo de edição
+        """
+        if self.mcp_tree.identify_column(event.x) == "#1":
+            return None
+        name = self.mcp_tree.identify_row(event.y)
+        if name:
+            self._edit_mcp(name)
+        return "break"
+
+    def _edit_selected_mcp(self):
+        """
+        Edita o MCP selecionado
+        """
+        name = self._selected_mcp()
+        if name:
+            self._edit_mcp(name)
+        else:
+            messagebox.showinfo("Informação", "Selecione um MCP na lista")
+
+    def _remove_selected_mcp(self):
+        """
+        Remove o MCP selecionado
+        """
+        name = self._selected_mcp()
+        if name:
+            self._remove_mcp(name)
+        else:
+            messagebox.showinfo("Informação", "Selecione um MCP na lista")
+        return "break"
     
-    def _refresh_templates_list(self):
+    def _render_templates_list(self, templates):
         """
         Atualiza a lista de templates na interface com um design de cards.
+
+        Os cards são indexados pelo nome do template; só os cards de templates
+        novos, removidos ou com estado alterado são (re)construídos.
+
+        Args:
+            templates: Resultado de MCPManager.get_templates_status()
+        """
+        rows = {
+            name: (
+                status["template"].get('description', ''),
+                status["template"].get('command', ''),
+                status["installed"],
+                tuple(status["missing_dependencies"])
+            )
+            for name, status in templates.items()
+        }
+        rendered = {name: key for name, (key, _) in self._template_cards.items()}
+        removed, added, changed = _diff_rows(rendered, rows)
+
+        for name in removed:
+            self._template_cards.pop(name)[1].destroy()
+        for name in changed:
+            self._update_template_card(name, rows[name])
+        for name in added:
+            card_frame = ttk.Frame(self.templates_list_frame, relief='solid', borderwidth=1, padding=15)
+            card_frame.grid_columnconfigure(0, weight=1)
+            self._fill_template_card(card_frame, name, rows[name])
+            self._template_cards[name] = (rows[name], card_frame)
+
+        # Reempacotar (sem recriar widgets) apenas se a ordem mudou
+        if added or removed or list(self._template_cards) != list(rows):
+            for card_frame in self.templates_list_frame.pack_slaves():
+                card_frame.pack_forget()
+            self._template_cards = {name: self._template_cards[name] for name in rows}
+            for _, card_frame in self._template_cards.values():
+                card_frame.pack(fill='x', pady=10, padx=5)
+
+        if not rows:
+            self.templates_empty_label.pack(pady=20)
+
+    def _update_template_card(self, name, row):
+        """
+        Reconstrói o conteúdo de um card existente com o novo estado
         """
-        # Limpar widgets existentes
-        for widget in self.templates_list_frame.winfo_children():
+        card_frame = self._template_cards[name][1]
+        for widget in card_frame.winfo_children():
             widget.destroy()
-        
-        # Configurar a coluna do grid para expandir
-        self.templates_list_frame.grid_columnconfigure(0, weight=1)
+        self._fill_template_card(card_frame, name, row)
+        self._template_cards[name] = (row, card_frame)
 
-        try:
-            templates = self.mcp_manager.get_templates()
-            
-            if not templates:
-                ttk.Label(
-                    self.templates_list_frame,
-                    text="Nenhum template disponível"
-                ).pack(pady=20)
-                return
-            
-            for i, (name, template) in enumerate(templates.items()):
-                # Frame do card
-                card_frame = ttk.Frame(self.templates_list_frame, relief='solid', borderwidth=1, padding=15)
-                card_frame.pack(fill='x', pady=10, padx=5)
+    def _fill_template_card(self, card_frame, name, row):
+        """
+        Cria o conteúdo de um card de template
+        """
+        description, command, installed, missing_dependencies = row
 
-                card_frame.grid_columnconfigure(0, weight=1)
-
-                # Nome do template
-                name_label = ttk.Label(card_frame, text=name, font=('TkDefaultFont', 12, 'bold'))
-                name_label.grid(row=0, column=0, sticky='w', pady=(0, 10))
-
-                # Descrição
-                desc_label = ttk.Label(card_frame, text=template.get('description', ''), wraplength=500, justify="left")
-                desc_label.grid(row=1, column=0, sticky='w', padx=(10, 0), pady=(0, 5))
-                
-                # Comando
-                cmd_label = ttk.Label(card_frame, text=f"Comando: {template.get('command', '')}", font=('TkDefaultFont', 9, 'italic'))
-                cmd_label.grid(row=2, column=0, sticky='w', padx=(10, 0), pady=(0, 10))
-                
-                # Botão de Instalar ou Label de Status
-                if self.mcp_manager.is_template_installed(name):
-                    status_label = ttk.Label(card_frame, text="Já Instalado", foreground='green', font=('TkDefaultFont', 10, 'bold'))
-                    status_label.grid(row=3, column=0, sticky='w', padx=(10, 0), pady=(10, 0))
-                else:
-                    install_button = ttk.Button(
-                        card_frame,
-                        text="Instalar",
-                        command=lambda n=name: self._install_template(n)
-                    )
-                    install_button.grid(row=3, column=0, sticky='w', padx=(10, 0), pady=(10, 0))
-        
-        except Exception as e:
-            logger.error(f"Erro ao atualizar lista de templates: {e}")
-            messagebox.showerror("Erro", f"Erro ao carregar templates:\n{e}")
+        # Nome do template
+        name_label = ttk.Label(card_frame, text=name, font=('TkDefaultFont', 12, 'bold'))
+        name_label.grid(row=0, column=0, sticky='w', pady=(0, 10))
+
+        # Descrição
+        desc_label = ttk.Label(card_frame, text=description, wraplength=500, justify="left")
+        desc_label.grid(row=1, column=0, sticky='w', padx=(10, 0), pady=(0, 5))
+
+        # Comando
+        cmd_label = ttk.Label(card_frame, text=f"Comando: {command}", font=('TkDefaultFont', 9, 'italic'))
+        cmd_label.grid(row=2, column=0, sticky='w', padx=(10, 0), pady=(0, 10))
+
+        # Botão de Instalar ou Label de Status
+        if installed:
+            status_label = ttk.Label(card_frame, text="Já Instalado", foreground='green', font=('TkDefaultFont', 10, 'bold'))
+            status_label.grid(row=3, column=0, sticky='w', padx=(10, 0), pady=(10, 0))
+        else:
+            install_button = ttk.Button(
+                card_frame,
+                text="Instalar",
+                command=lambda n=name: self._install_template(n)
+            )
+            install_button.grid(row=3, column=0, sticky='w', padx=(10, 0), pady=(10, 0))
+
+            if missing_dependencies:
+                missing_label = ttk.Label(
+                    card_frame,
+                    text=f"Dependências ausentes: {', '.join(missing_dependencies)}",
+                    foreground='orange'
+                )
+                missing_label.grid(row=4, column=0, sticky='w', padx=(10, 0), pady=(5, 0))
     
     def _on_cli_change(self):
         """
         Manipulador para mudança do tipo de CLI
         """
-        # Primeiro persistir a mudança via ConfigManager antes de refresh_settings_path()
-        try:
-            self.config_manager.set_cli_type(self.cli_var.get())
+        self._apply_cli_type(self.cli_var.get(), show_message=False)
 
-            # Após persistir, então chamar refresh_settings_path(), _refresh_mcp_list() e _refresh_templates_list()
+    def _apply_cli_type(self, cli_type, show_message):
+        """
+        Persiste o tipo de CLI e recarrega os dados do novo CLI em segundo plano.
+
+        A seleção na interface é aplicada imediatamente e revertida em caso de erro.
+        """
+        previous = self._cli_type
+        # Atualização otimista: a interface já reflete o CLI escolhido
+        self._cli_type = cli_type
+        self._update_temperature_visibility()
+
+        def change():
+            # Primeiro persistir a mudança via ConfigManager antes de refresh_settings_path()
+            if not self.config_manager.set_cli_type(cli_type):
+                # Mesmo CLI já configurado: nada a recarregar
+                return None
             self.mcp_manager.refresh_settings_path()
-            self._refresh_mcp_list()
-            self._refresh_templates_list()
+            return self._read_state(cli_type)
 
-            # Atualizar visibilidade do checkbox de temperatura
+        def rollback():
+            self._cli_type = previous
+            if previous:
+                self.cli_var.set(previous)
             self._update_temperature_visibility()
 
-            self.status_label.config(text=f"CLI alterado para {self.cli_var.get()}")
-        except ConfigManagerError as e:
-            logger.error(f"Erro ao persistir tipo de CLI: {e}")
-            messagebox.showerror("Erro", f"Erro ao salvar tipo de CLI:\n{e}")
-            # Reverter a seleÃ§Ã£o na interface em caso de erro
-            try:
-                original_cli = self.config_manager.get_cli_type()
-                self.cli_var.set(original_cli)
-            except Exception:
-                pass
-        except Exception as e:
-            logger.error(f"Erro ao alterar CLI: {e}")
-            messagebox.showerror("Erro", f"Erro ao alterar CLI:\n{e}")
-    
+        def on_success(data):
+            if data is not None:
+                # Outro settings.json: as alternâncias pendentes não se aplicam a ele
+                self._discard_pending_toggles()
+                self._apply_state(data)
+            if show_message:
+                messagebox.showinfo("Sucesso", "Configurações salvas com sucesso!")
+                self.status_label.config(text="Configurações salvas")
+            else:
+                self.status_label.config(text=f"CLI alterado para {cli_type}")
+
+        def on_error(e):
+            if isinstance(e, ConfigManagerError):
+                logger.error(f"Erro ao persistir tipo de CLI: {e}")
+                messagebox.showerror("Erro", f"Erro ao salvar tipo de CLI:\n{e}")
+            else:
+                logger.error(f"Erro ao alterar CLI: {e}")
+                messagebox.showerror("Erro", f"Erro ao alterar CLI:\n{e}")
+
+        self.service.submit(change, on_success, on_error, rollback=rollback,
+                            description=f"Alterando CLI para {cli_type}...")
+
     def _on_mcp_toggle(self):
         """
         Manipulador para toggle de MCP
         """
         self.pending_changes = True
         self.changes_label.config(text="Há alterações pendentes", foreground='red')
+
+    def _discard_pending_toggles(self):
+        """
+        Descarta as alternâncias não salvas (ex.: ao trocar de settings.json)
+        """
+        self._pending_toggles = {}
+        self.pending_changes = False
+        self.changes_label.config(text="")
     
     def _save_config(self):
         """
         Salva as configurações do CLI
         """
-        try:
-            cli_type = self.cli_var.get()
-            self.config_manager.set_cli_type(cli_type)
-            
-            # Atualizar o MCP Manager
-            self.mcp_manager.refresh_settings_path()
-            self._refresh_mcp_list()
-            self._refresh_templates_list()
+        self._apply_cli_type(self.cli_var.get(), show_message=True)
 
-            messagebox.showinfo("Sucesso", "Configurações salvas com sucesso!")
-            self.status_label.config(text="Configurações salvas")
+    def _write_mcp_states(self, states):
+        """
+        Grava no settings.json os estados escolhidos (fora da thread do Tk)
 
-        except Exception as e:
-            logger.error(f"Erro ao salvar configurações: {e}")
-            messagebox.showerror("Erro", f"Erro ao salvar configurações:\n{e}")
+        Returns:
+            False se nenhum estado mudou
+        """
+        mcps = self.mcp_manager.get_mcps()
+
+        names_to_enable = []
+        names_to_disable = []
+
+        for name, details in mcps.items():
+            current_state = details.get('enabled', False)
+            new_state = states.get(name, current_state)
+
+            if current_state != new_state:
+                if new_state:
+                    names_to_enable.append(name)
+                else:
+                    names_to_disable.append(name)
+
+        if not names_to_enable and not names_to_disable:
+            return False
+        self.mcp_manager.set_allowed_many(names_to_enable, names_to_disable)
+        return True
 
     def _save_mcp_changes(self):
         """
         Salva as alterações nos MCPs
         """
-        try:
-            mcps = self.mcp_manager.get_mcps()
-            
-            names_to_enable = []
-            names_to_disable = []
-            
-            for name, details in mcps.items():
-                current_state = details.get('enabled', False)
-                new_state = self.mcp_vars.get(name, tk.BooleanVar()).get()
-                
-                if current_state != new_state:
-                    if new_state:
-                        names_to_enable.append(name)
-                    else:
-                        names_to_disable.append(name)
-            
-            if names_to_enable or names_to_disable:
-                self.mcp_manager.set_allowed_many(names_to_enable, names_to_disable)
-                self.pending_changes = False
-                self.changes_label.config(text="")
+        # Estados escolhidos na interface, capturados na thread do Tk
+        states = dict(self.mcp_states)
+        toggles = dict(self._pending_toggles)
+
+        # Atualização otimista: as alterações já aparecem como salvas
+        self.pending_changes = False
+        self.changes_label.config(text="")
+
+        def on_success(saved):
+            # Esquecer só as alternâncias gravadas; as feitas durante o save continuam pendentes
+            for name, enabled in toggles.items():
+                if self._pending_toggles.get(name) == enabled:
+                    del self._pending_toggles[name]
+            if saved:
                 messagebox.showinfo("Sucesso", "Alterações salvas com sucesso!")
                 self.status_label.config(text="Alterações nos MCPs salvas")
             else:
                 messagebox.showinfo("Informação", "Nenhuma alteração para salvar")
 
-        except Exception as e:
+        def on_error(e):
             logger.error(f"Erro ao salvar alterações nos MCPs: {e}")
             messagebox.showerror("Erro", f"Erro ao salvar alterações:\n{e}")
 
+        self.service.submit(lambda: self._write_mcp_states(states), on_success, on_error,
+                            rollback=self._on_mcp_toggle, description="Salvando alterações...")
+
     def _change_user_path(self):
         """
         Abre diálogo para alterar o caminho do usuário
         """
         from tkinter import filedialog
         
+        current_text = self.path_label.cget("text")
+        initial_dir = current_text if os.path.isdir(current_text) else str(Path.home())
         path = filedialog.askdirectory(
             title="Selecione o diretório do usuário",
-            initialdir=str(self.config_manager.get_user_path() or Path.home())
+            initialdir=initial_dir
         )
         
-        if path:
-            try:
-                self.config_manager.set_user_path(path)
-                self.path_label.config(text=path)
-                
-                # Atualizar o MCP Manager
-                self.mcp_manager.refresh_settings_path()
-                self._refresh_mcp_list()
-                self._refresh_templates_list()
+        if not path:
+            return
 
-                messagebox.showinfo("Sucesso", "Caminho do usuário alterado com sucesso!")
-                self.status_label.config(text="Caminho do usuário alterado")
+        cli_type = self._cli_type or self.cli_var.get()
+
+        def change():
+            # Atualizar o MCP Manager apenas se o caminho mudou
+            if not self.config_manager.set_user_path(path):
+                return None
+            self.mcp_manager.refresh_settings_path()
+            return self._read_state(cli_type)
+
+        # Atualização otimista do caminho exibido
+        self.path_label.config(text=path)
+
+        def on_success(data):
+            if data is not None:
+                # Outro settings.json: as alternâncias pendentes não se aplicam a ele
+                self._discard_pending_toggles()
+                self._apply_state(data)
+            messagebox.showinfo("Sucesso", "Caminho do usuário alterado com sucesso!")
+            self.status_label.config(text="Caminho do usuário alterado")
+
+        def on_error(e):
+            logger.error(f"Erro ao alterar caminho do usuário: {e}")
+            messagebox.showerror("Erro", f"Erro ao alterar caminho:\n{e}")
+
+        self.service.submit(change, on_success, on_error,
+                            rollback=lambda: self.path_label.config(text=current_text),
+                            description="Alterando caminho do usuário...")
 
-            except Exception as e:
-                logger.error(f"Erro ao alterar caminho do usuário: {e}")
-                messagebox.showerror("Erro", f"Erro ao alterar caminho:\n{e}")
-    
     def _add_mcp_dialog(self):
         """
         Abre diálogo para adicionar um novo MCP
@@ -1205,28 +1842,43 @@ class MCPGUI:
             if args_text_content:
                 args = [arg.strip() for arg in args_text_content.split('\n') if arg.strip()]
             
-            try:
+            def add():
                 self.mcp_manager.add_mcp(name, command, args)
-                self._refresh_mcp_list()
+                return self._read_lists()
+
+            def on_success(data):
+                self._apply_state(data)
                 dialog.destroy()
                 messagebox.showinfo("Sucesso", "MCP adicionado com sucesso!")
-                
-            except Exception as e:
+
+            def on_error(e):
+                save_button.state(['!disabled'])
                 messagebox.showerror("Erro", f"Erro ao adicionar MCP:\n{e}")
+
+            save_button.state(['disabled'])
+            self.service.submit(add, on_success, on_error, description=f"Adicionando MCP '{name}'...")
         
-        ttk.Button(button_frame, text="Salvar", command=save_mcp).pack(side='left', padx=5)
+        save_button = ttk.Button(button_frame, text="Salvar", command=save_mcp)
+        save_button.pack(side='left', padx=5)
         ttk.Button(button_frame, text="Cancelar", command=dialog.destroy).pack(side='left', padx=5)
     
     def _edit_mcp(self, name):
         """
         Abre diÃ¡logo para editar um MCP existente
         """
+        def on_success(details):
+            if not details:
+                messagebox.showerror("Erro", f"MCP '{name}' nÃ£o encontrado")
+                return
+            self._open_edit_dialog(name, details)
+
         # Obter detalhes do MCP
-        details = self.mcp_manager.get_mcp_details(name)
-        if not details:
-            messagebox.showerror("Erro", f"MCP '{name}' nÃ£o encontrado")
-            return
-        
+        self.service.submit(lambda: self.mcp_manager.get_mcp_details(name), on_success)
+
+    def _open_edit_dialog(self, name, details):
+        """
+        Exibe o diálogo de edição com os detalhes já carregados
+        """
         dialog = tk.Toplevel(self.root)
         dialog.title(f"Editar MCP: {name}")
         dialog.geometry("450x350")
@@ -1275,38 +1927,58 @@ class MCPGUI:
             if args_text_content:
                 args = [arg.strip() for arg in args_text_content.split('\n') if arg.strip()]
             
-            try:
+            def update():
                 self.mcp_manager.update_mcp(name, command, args)
-                self._refresh_mcp_list()
+                return self._read_lists()
+
+            def on_success(data):
+                self._apply_state(data)
                 dialog.destroy()
                 messagebox.showinfo("Sucesso", "MCP atualizado com sucesso!")
-                
-            except Exception as e:
+
+            def on_error(e):
+                save_button.state(['!disabled'])
                 messagebox.showerror("Erro", f"Erro ao atualizar MCP:\n{e}")
+
+            save_button.state(['disabled'])
+            self.service.submit(update, on_success, on_error, description=f"Atualizando MCP '{name}'...")
         
-        ttk.Button(button_frame, text="Salvar", command=save_changes).pack(side='left', padx=5)
+        save_button = ttk.Button(button_frame, text="Salvar", command=save_changes)
+        save_button.pack(side='left', padx=5)
         ttk.Button(button_frame, text="Cancelar", command=dialog.destroy).pack(side='left', padx=5)
     
     def _remove_mcp(self, name):
         """
         Remove um MCP
         """
-        if messagebox.askyesno("Confirmar", f"Deseja remover o MCP '{name}'?"):
-            try:
-                self.mcp_manager.remove_mcp(name)
-                self._refresh_mcp_list()
-                messagebox.showinfo("Sucesso", "MCP removido com sucesso!")
-                
-            except Exception as e:
-                messagebox.showerror("Erro", f"Erro ao remover MCP:\n{e}")
-    
+        if not messagebox.askyesno("Confirmar", f"Deseja remover o MCP '{name}'?"):
+            return
+
+        def remove():
+            self.mcp_manager.remove_mcp(name)
+            return self._read_lists()
+
+        # Atualização otimista: a linha some imediatamente e volta se a remoção falhar
+        previous_rows = dict(self._mcp_rows)
+        self._render_mcp_rows({key: row for key, row in previous_rows.items() if key != name})
+
+        def on_success(data):
+            self._apply_state(data)
+            messagebox.showinfo("Sucesso", "MCP removido com sucesso!")
+
+        def on_error(e):
+            messagebox.showerror("Erro", f"Erro ao remover MCP:\n{e}")
+
+        self.service.submit(remove, on_success, on_error,
+                            rollback=lambda: self._render_mcp_rows(previous_rows),
+                            description=f"Removendo MCP '{name}'...")
+
     def _install_template(self, template_name):
         """
         Instala um template
         """
-        try:
+        def on_checked(missing_deps):
             # Verificar dependências
-            missing_deps = self.mcp_manager.get_missing_dependencies(template_name)
             if missing_deps:
                 dep_list = ", ".join(missing_deps)
                 if not messagebox.askyesno(
@@ -1315,67 +1987,103 @@ class MCPGUI:
                     "Deseja continuar com a instalação?"
                 ):
                     return
-            
-            self.mcp_manager.install_from_template(template_name)
-            self._refresh_mcp_list()
-            self._refresh_templates_list()
+            self._run_install_template(template_name, skip_dependency_check=bool(missing_deps))
+
+        def on_error(e):
+            messagebox.showerror("Erro", f"Erro ao instalar template:\n{e}")
+
+        self.service.submit(lambda: self.mcp_manager.get_missing_dependencies(template_name),
+                            on_checked, on_error, description="Verificando dependências...")
+
+    def _run_install_template(self, template_name, skip_dependency_check):
+        """
+        Instala o template em segundo plano, exibindo o card como instalado de imediato
+        """
+        def install():
+            self.mcp_manager.install_from_template(template_name, skip_dependency_check=skip_dependency_check)
+            return self._read_lists()
+
+        # Atualização otimista do card
+        previous_row = None
+        if template_name in self._template_cards:
+            previous_row = self._template_cards[template_name][0]
+            self._update_template_card(template_name, previous_row[:2] + (True, ()))
+
+        def rollback():
+            if previous_row is not None and template_name in self._template_cards:
+                self._update_template_card(template_name, previous_row)
+
+        def on_success(data):
+            self._apply_state(data)
             messagebox.showinfo("Sucesso", f"Template '{template_name}' instalado com sucesso!")
-            
-        except Exception as e:
+
+        def on_error(e):
             messagebox.showerror("Erro", f"Erro ao instalar template:\n{e}")
-    
+
+        self.service.submit(install, on_success, on_error, rollback=rollback,
+                            description=f"Instalando template '{template_name}'...")
+
     def _on_closing(self):
         """
         Manipulador para o evento de fechamento da janela
         """
-        if self.pending_changes:
-            if messagebox.askyesno(
-                "Alterações Pendentes",
-                "Há alterações pendentes nos MCPs. Deseja salvá-las antes de sair?"
-            ):
-                self._save_mcp_changes()
-        
+        save_on_exit = self.pending_changes and messagebox.askyesno(
+            "Alterações Pendentes",
+            "Há alterações pendentes nos MCPs. Deseja salvá-las antes de sair?"
+        )
+
+        # A gravação final entra na fila do MCPManager, depois das já enviadas,
+        # para nunca usar o gerenciador ao mesmo tempo que a thread de trabalho
+        final_save = None
+        if save_on_exit:
+            states = dict(self.mcp_states)
+            final_save = self.service.submit(lambda: self._write_mcp_states(states),
+                                             description="Salvando alterações...")
+
+        # Cancelar leituras e operações do Spec-Kit e aguardar as gravações enviadas
+        stopped = self.service.shutdown(wait=True)
+
+        # Os callbacks não executam mais após shutdown(): informar o resultado aqui
+        if final_save is not None:
+            if final_save.error is not None:
+                messagebox.showerror("Erro", f"As alterações nos MCPs não foram salvas:\n{final_save.error}")
+            elif not stopped:
+                logger.warning("A gravação das alterações nos MCPs não terminou antes do encerramento")
+                messagebox.showwarning("Aviso", "As alterações nos MCPs ainda estavam sendo salvas "
+                                                "ao fechar e podem não ter sido gravadas.")
+
+        # Resumo de tempos da sessão (somente com MCP_INSTRUMENTATION=1)
+        instrumentation.report(logger)
+
         self.root.destroy()
 
     def _update_temperature_visibility(self):
         """
         Atualiza a visibilidade do checkbox de temperature baseado no CLI selecionado
         """
-        try:
-            cli_type = self.config_manager.get_cli_type()
-
-            if self.temperature_frame is not None:
-                if cli_type in ["gemini", "qwen"]:
-                    # Mostrar para Gemini e Qwen
-                    self.temperature_frame.pack(fill='x', pady=(0, 20))
-                    self._load_temperature_state()
-                else:
-                    # Esconder para outros CLIs
-                    self.temperature_frame.pack_forget()
-        except Exception as e:
-            logger.error(f"Erro ao atualizar visibilidade do temperature: {e}")
+        if self.temperature_frame is not None:
+            if self._cli_type in ["gemini", "qwen"]:
+                # Mostrar para Gemini e Qwen
+                self.temperature_frame.pack(fill='x', pady=(0, 20))
+            else:
+                # Esconder para outros CLIs
+                self.temperature_frame.pack_forget()
 
-    def _load_temperature_state(self):
+    def _show_temperature(self, temperature_value):
         """
-        Carrega o valor atual da temperatura e atualiza o slider e o label
+        Atualiza o slider e o label com o valor da temperatura
         """
-        try:
-            cli_type = self.config_manager.get_cli_type()
-            if self.temperature_var is not None and cli_type in ["gemini", "qwen"]:
-                temperature_value = self.mcp_manager.get_temperature()
-                self.temperature_var.set(temperature_value)
-                if hasattr(self, "temperature_value_label") and self.temperature_value_label:
-                    self.temperature_value_label.config(text=f"Valor atual: {temperature_value:.1f}")
-        except Exception as e:
-            logger.error(f"Erro ao carregar estado do temperature: {e}")
+        if self.temperature_var is not None:
+            self.temperature_var.set(temperature_value)
+            if hasattr(self, "temperature_value_label") and self.temperature_value_label:
+                self.temperature_value_label.config(text=f"Valor atual: {temperature_value:.1f}")
 
     def _on_temperature_change(self, value=None):
         """
         Atualiza apenas o label com o valor atual durante o arraste do slider
         """
         try:
-            cli_type = self.config_manager.get_cli_type()
-            if cli_type not in ["gemini", "qwen"]:
+            if self._cli_type not in ["gemini", "qwen"]:
                 return
 
             current_value = self.temperature_var.get()
@@ -1389,23 +2097,30 @@ class MCPGUI:
         """
         Persiste o valor ao soltar o mouse no slider
         """
-        try:
-            cli_type = self.config_manager.get_cli_type()
-            if cli_type not in ["gemini", "qwen"]:
-                return
+        if self._cli_type not in ["gemini", "qwen"]:
+            return
 
-            current_value = self.temperature_var.get()
-            temp_rounded = round(float(current_value), 1)
-            self.mcp_manager.set_temperature(temp_rounded)
+        previous = self._temperature
+        temp_rounded = round(float(self.temperature_var.get()), 1)
+        # Atualização otimista: o slider já mostra o novo valor
+        self._show_temperature(temp_rounded)
+
+        def on_success(_):
+            self._temperature = temp_rounded
             if hasattr(self, "status_label") and self.status_label:
                 self.status_label.config(text=f"Temperature definida para {temp_rounded:.1f}")
-        except Exception as e:
+
+        def rollback():
+            if previous is not None:
+                self._show_temperature(previous)
+
+        def on_error(e):
             logger.error(f"Erro ao alterar temperature: {e}")
             messagebox.showerror("Erro", f"Erro ao alterar temperature:\n{e}")
-            try:
-                self._load_temperature_state()
-            except:
-                pass
+
+        self.service.submit(lambda: self.mcp_manager.set_temperature(temp_rounded),
+                            on_success, on_error, rollback=rollback,
+                            description="Salvando temperature...")
 
     def run(self):
         """
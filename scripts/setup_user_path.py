@@ -9,23 +9,8 @@ from pathlib import Path
 from src.core.config_manager import ConfigManager, ConfigManagerError
 
 
-def main():
-    """Configura o caminho base do usuario."""
-    print("=== Configuracao do Caminho Base do Usuario ===\n")
-
-    # Criar instancia do ConfigManager
-    config = ConfigManager()
-
-    # Verificar se ja existe uma configuracao
-    current_path = config.get_user_path()
-    if current_path:
-        print(f"Caminho atual configurado: {current_path}")
-        response = input("Deseja alterar o caminho? (s/N): ").strip().lower()
-        if response not in ["s", "sim"]:
-            print("Configuracao mantida. Encerrando.")
-            return
-
-    # Obter o caminho do usuario
+def _ask_user_path():
+    """Pergunta o caminho base do usuario ate receber um diretorio existente."""
     while True:
         user_path = input(
             "\nDigite o caminho base do usuario (ex: C:/Users/SEU_NOME): "
@@ -48,21 +33,11 @@ def main():
             print(f"Erro: '{user_path}' nao e um diretorio.")
             continue
 
-        # Tentar configurar o caminho
-        try:
-            success = config.set_user_path(user_path)
-            if success:
-                print(f"\nCaminho configurado com sucesso: {user_path}")
-                print(f"O arquivo de configuracao foi salvo em: {config.config_path}")
-                break
-        except ConfigManagerError as e:
-            print(f"Erro ao configurar o caminho: {e}")
-            response = input("Deseja tentar novamente? (S/n): ").strip().lower()
-            if response in ["n", "nao"]:
-                print("Configuracao cancelada. Encerrando.")
-                return
+        return user_path
 
-    # Obter o tipo de CLI preferido
+
+def _ask_cli_type():
+    """Pergunta o tipo de CLI preferido (gemini ou qwen)."""
     while True:
         cli_type = input(
             "\nEscolha o CLI preferido (gemini/qwen) [gemini]: "
@@ -72,15 +47,47 @@ def main():
             cli_type = "gemini"
 
         if cli_type in ["gemini", "qwen"]:
-            try:
-                config.set_cli_type(cli_type)
-                print(f"CLI preferido configurado como: {cli_type}")
-                break
-            except ConfigManagerError as e:
-                print(f"Erro ao configurar o CLI: {e}")
-                break
-        else:
-            print("Erro: Escolha invalida. Por favor, digite 'gemini' ou 'qwen'.")
+            return cli_type
+        print("Erro: Escolha invalida. Por favor, digite 'gemini' ou 'qwen'.")
+
+
+def main():
+    """Configura o caminho base do usuario."""
+    print("=== Configuracao do Caminho Base do Usuario ===\n")
+
+    # Criar instancia do ConfigManager
+    config = ConfigManager()
+
+    # Verificar se ja existe uma configuracao
+    current_path = config.get_user_path()
+    if current_path:
+        print(f"Caminho atual configurado: {current_path}")
+        response = input("Deseja alterar o caminho? (s/N): ").strip().lower()
+        if response not in ["s", "sim"]:
+            print("Configuracao mantida. Encerrando.")
+            return
+
+    while True:
+        user_path = _ask_user_path()
+        cli_type = _ask_cli_type()
+
+        # Gravar caminho e CLI de uma vez
+        try:
+            changed = config.update(user_base_path=user_path, cli_type=cli_type)
+            break
+        except ConfigManagerError as e:
+            print(f"Erro ao salvar a configuracao: {e}")
+            response = input("Deseja tentar novamente? (S/n): ").strip().lower()
+            if response in ["n", "nao"]:
+                print("Configuracao cancelada. Encerrando.")
+                return
+
+    if changed:
+        print(f"\nCaminho configurado com sucesso: {user_path}")
+        print(f"CLI preferido configurado como: {cli_type}")
+        print(f"O arquivo de configuracao foi salvo em: {config.config_path}")
+    else:
+        print("\nA configuracao ja tinha esses valores; nada foi alterado.")
 
     print("\nConfiguracao concluida!")
 
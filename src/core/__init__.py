@@ -1,9 +1,18 @@
 from .config_manager import ConfigManager, ConfigManagerError
-from .mcp_manager import MCPManager, MCPManagerError
+from .fleet_manager import FleetManager, FleetResult
+from .frozen import FrozenDict
+from .mcp_manager import ConcurrentModificationError, MCPManager, MCPManagerError, SaveResult
+from .settings_recovery import RecoveryReport
 
 __all__ = [
+    'ConcurrentModificationError',
     'ConfigManager',
     'ConfigManagerError',
+    'FleetManager',
+    'FleetResult',
+    'FrozenDict',
     'MCPManager',
-    'MCPManagerError'
+    'MCPManagerError',
+    'RecoveryReport',
+    'SaveResult'
 ]
\ No newline at end of file
@@ -2,12 +2,21 @@
 Módulo para gerenciar configurações do usuário, especificamente o caminho base do usuário.
 """
 
+import copy
 import json
 import logging
 import os
 import stat
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from . import json_backend
+from .instrumentation import get_registry
+
+_registry = get_registry()
 
 
 class ConfigManagerError(Exception):
@@ -21,7 +30,27 @@ class ConfigManager:
     
     Armazena e recupera o caminho base do usuário, validando caminhos e
     tratando erros de forma adequada.
+
+    As leituras do arquivo são compartilhadas por todas as instâncias do
+    processo: o conteúdo analisado fica em cache por caminho e só é relido
+    quando o arquivo muda (mtime/tamanho/inode) ou é gravado por esta classe.
     """
+
+    # Cache de leitura do processo: caminho -> (chave de stat, configuração analisada)
+    _file_cache: Dict[str, Tuple[tuple, Dict[str, Any]]] = {}
+    # Instâncias compartilhadas retornadas por shared(), por caminho de configuração
+    _shared_instances: Dict[Optional[str], "ConfigManager"] = {}
+    _cache_lock = threading.Lock()
+    # Verificações de permissão de escrita: (diretório, agressivo) -> (resultado, expira em)
+    _permission_cache: Dict[Tuple[str, bool], Tuple[bool, float]] = {}
+    _permission_stats: Dict[str, int] = {
+        "checks": 0,
+        "cache_hits": 0,
+        "probe_writes": 0,
+        "probe_writes_avoided": 0,
+    }
+    # Validade, em segundos, de um resultado de verificação de permissão
+    permission_cache_ttl = 30.0
     
     def __init__(self, config_path: Optional[str] = None):
         """
@@ -55,6 +84,77 @@ class ConfigManager:
             self._fallback_path = None
         
         self._logger = logging.getLogger(__name__)
+        # Alterações pendentes enquanto um batch() está aberto
+        self._batch: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def shared(cls, config_path: Optional[str] = None) -> "ConfigManager":
+        """
+        Retorna a instância compartilhada do processo para o caminho de configuração.
+
+        Args:
+            config_path: Caminho do arquivo de configuração (None para o padrão).
+
+        Returns:
+            Sempre a mesma instância para o mesmo caminho.
+        """
+        key = None if config_path is None else str(Path(config_path).absolute())
+        with cls._cache_lock:
+            instance = cls._shared_instances.get(key)
+            if instance is None:
+                instance = cls(config_path)
+                cls._shared_instances[key] = instance
+            return instance
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Descarta o cache de leitura, as verificações de permissão e as instâncias compartilhadas."""
+        with cls._cache_lock:
+            cls._file_cache.clear()
+            cls._shared_instances.clear()
+            cls._permission_cache.clear()
+
+    def _read_config_file(self, path: Path) -> Dict[str, Any]:
+        """
+        Lê e analisa um arquivo de configuração, usando o cache enquanto o arquivo não mudar.
+
+        Returns:
+            Cópia da configuração (pode ser alterada pelo chamador).
+
+        Raises:
+            OSError, json.JSONDecodeError: Se o arquivo não puder ser lido ou analisado.
+        """
+        key = str(path.absolute())
+        try:
+            st = os.stat(path)
+            stat_key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            stat_key = None
+
+        with self._cache_lock:
+            cached = self._file_cache.get(key)
+        if cached is not None and stat_key is not None and cached[0] == stat_key:
+            return copy.deepcopy(cached[1])
+
+        with open(path, 'r', encoding='utf-8') as f:
+            st = os.fstat(f.fileno())
+            data = json_backend.loads(f.read())
+        if isinstance(data, dict):
+            with self._cache_lock:
+                self._file_cache[key] = ((st.st_mtime_ns, st.st_size, st.st_ino), copy.deepcopy(data))
+        return data
+
+    def _remember_written(self, path: Path, config: Dict[str, Any]) -> None:
+        """Atualiza o cache de leitura com o conteúdo que acabou de ser gravado em path."""
+        key = str(path.absolute())
+        try:
+            st = os.stat(path)
+        except OSError:
+            with self._cache_lock:
+                self._file_cache.pop(key, None)
+            return
+        with self._cache_lock:
+            self._file_cache[key] = ((st.st_mtime_ns, st.st_size, st.st_ino), copy.deepcopy(config))
     
     def get_user_path(self) -> Optional[str]:
         """
@@ -90,44 +190,13 @@ class ConfigManager:
             user_path: O caminho base do usuário a ser armazenado.
             
         Returns:
-            True se o caminho foi definido com sucesso.
+            True se o caminho foi alterado; False se a configuração já tinha esse caminho
+            (nada é gravado).
             
         Raises:
             ConfigManagerError: Se o caminho for inválido ou ocorrer erro ao salvar.
         """
-        if not user_path or not isinstance(user_path, str):
-            raise ConfigManagerError("Caminho do usuário deve ser uma string não vazia")
-        
-        # Validação do caminho
-        path_obj = Path(user_path)
-        if not path_obj.exists():
-            raise ConfigManagerError(f"O caminho não existe: {user_path}")
-        
-        if not path_obj.is_dir():
-            raise ConfigManagerError(f"O caminho não é um diretório: {user_path}")
-        
-        try:
-            # Carrega configuração existente ou cria nova
-            config = self._load_config()
-            
-            # Normaliza o caminho para usar barras forward
-            normalized_path = path_obj.as_posix()
-            config["user_base_path"] = normalized_path
-            
-            # Salva a configuração
-            self._save_config(config)
-            
-            self._logger.info(f"Caminho do usuário definido com sucesso: {normalized_path}")
-            return True
-            
-        except PermissionError as e:
-            error_msg = f"Sem permissão para acessar o arquivo de configuração: {e}"
-            self._logger.error(error_msg)
-            raise ConfigManagerError(error_msg)
-        except Exception as e:
-            error_msg = f"Erro ao definir caminho do usuário: {e}"
-            self._logger.error(error_msg)
-            raise ConfigManagerError(error_msg)
+        return self.update(user_base_path=user_path)
 
     def get_cli_type(self) -> str:
         """
@@ -157,31 +226,125 @@ class ConfigManager:
             cli_type: O tipo de CLI a ser armazenado ('gemini' ou 'qwen').
 
         Returns:
-            True se o tipo de CLI foi definido com sucesso.
+            True se o tipo de CLI foi alterado; False se já era o configurado
+            (nada é gravado).
 
         Raises:
             ConfigManagerError: Se o tipo de CLI for inválido ou ocorrer erro ao salvar.
         """
-        if cli_type not in ["gemini", "qwen"]:
-            raise ConfigManagerError("Tipo de CLI deve ser 'gemini' ou 'qwen'")
+        return self.update(cli_type=cli_type)
 
-        try:
-            # Carrega configuração existente ou cria nova
-            config = self._load_config()
+    def _normalize_field(self, name: str, value: Any) -> Any:
+        """
+        Valida um campo da configuração e retorna o valor a ser armazenado.
 
-            config["cli_type"] = cli_type
+        Raises:
+            ConfigManagerError: Se o campo for desconhecido ou o valor inválido.
+        """
+        if name == "user_base_path":
+            if not value or not isinstance(value, str):
+                raise ConfigManagerError("Caminho do usuário deve ser uma string não vazia")
 
-            # Salva a configuração
-            self._save_config(config)
+            path_obj = Path(value)
+            if not path_obj.exists():
+                raise ConfigManagerError(f"O caminho não existe: {value}")
 
-            self._logger.info(f"Tipo de CLI definido com sucesso: {cli_type}")
-            return True
+            if not path_obj.is_dir():
+                raise ConfigManagerError(f"O caminho não é um diretório: {value}")
 
+            # Normaliza o caminho para usar barras forward
+            return path_obj.as_posix()
+
+        if name == "cli_type":
+            if value not in ["gemini", "qwen"]:
+                raise ConfigManagerError("Tipo de CLI deve ser 'gemini' ou 'qwen'")
+            return value
+
+        raise ConfigManagerError(f"Campo de configuração desconhecido: {name}")
+
+    def update(self, **fields: Any) -> bool:
+        """
+        Valida e grava vários campos da configuração de uma só vez.
+
+        Todos os campos são validados antes de qualquer escrita, e o arquivo é
+        gravado no máximo uma vez (nenhuma vez se nada mudou). Dentro de batch()
+        as alterações são acumuladas e gravadas ao final do bloco.
+
+        Exemplo:
+            config.update(user_base_path="C:/Users/SEU_NOME", cli_type="qwen")
+
+        Args:
+            **fields: 'user_base_path' e/ou 'cli_type'.
+
+        Returns:
+            True se algum valor foi alterado; False caso contrário.
+
+        Raises:
+            ConfigManagerError: Se algum campo for inválido ou ocorrer erro ao salvar.
+        """
+        values = {name: self._normalize_field(name, value) for name, value in fields.items()}
+
+        try:
+            if self._batch is not None:
+                current = {**self._load_config(), **self._batch}
+                self._batch.update(values)
+                return any(current.get(name) != value for name, value in values.items())
+
+            config = self._load_config()
+            changes = {name: value for name, value in values.items() if config.get(name) != value}
+            if not changes:
+                self._logger.debug(f"Configuração já atualizada, nada a gravar: {sorted(values)}")
+                return False
+
+            config.update(changes)
+            self._save_config(config)
+        except PermissionError as e:
+            error_msg = f"Sem permissão para acessar o arquivo de configuração: {e}"
+            self._logger.error(error_msg)
+            raise ConfigManagerError(error_msg)
+        except ConfigManagerError as e:
+            self._logger.error(f"Erro ao atualizar configuração: {e}")
+            raise
         except Exception as e:
-            error_msg = f"Erro ao definir o tipo de CLI: {e}"
+            error_msg = f"Erro ao atualizar configuração: {e}"
             self._logger.error(error_msg)
             raise ConfigManagerError(error_msg)
-    
+
+        for name, value in changes.items():
+            self._logger.info(f"Configuração '{name}' definida com sucesso: {value}")
+        return True
+
+    @contextmanager
+    def batch(self) -> Iterator["ConfigManager"]:
+        """
+        Agrupa chamadas a update()/set_*() em uma única gravação.
+
+        Os setters continuam validando imediatamente e retornando se o valor muda;
+        ao final do bloco a configuração é gravada uma vez, se algo mudou. Se o
+        bloco levantar exceção, nada é gravado. Blocos aninhados se juntam ao externo.
+
+        Exemplo:
+            with config.batch():
+                config.set_user_path("C:/Users/SEU_NOME")
+                config.set_cli_type("qwen")
+
+        Raises:
+            ConfigManagerError: Se ocorrer erro ao salvar.
+        """
+        if self._batch is not None:
+            yield self
+            return
+
+        self._batch = {}
+        try:
+            yield self
+            pending = self._batch
+            self._batch = None
+            if pending:
+                self.update(**pending)
+        finally:
+            self._batch = None
+
     def has_config(self) -> bool:
         """
         Verifica se existe uma configuração válida.
@@ -220,12 +383,11 @@ class ConfigManager:
             if hasattr(self, '_fallback_path') and self._fallback_path is not None and self._fallback_path.exists():
                 try:
                     self._logger.info(f"Arquivo de configuração principal não encontrado em {self.config_path}, tentando fallback")
-                    with open(self._fallback_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        # if successful, also update config_path to fallback for this instance
-                        self.config_path = self._fallback_path
-                        self._logger.info(f"Usando arquivo de configuração fallback: {self._fallback_path}")
-                        return data
+                    data = self._read_config_file(self._fallback_path)
+                    # if successful, also update config_path to fallback for this instance
+                    self.config_path = self._fallback_path
+                    self._logger.info(f"Usando arquivo de configuração fallback: {self._fallback_path}")
+                    return data
                 except Exception as e:
                     self._logger.warning(f"Falha ao ler arquivo de configuração fallback {self._fallback_path}: {e}")
                     return {}
@@ -233,21 +395,19 @@ class ConfigManager:
             return {}
 
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self._logger.debug(f"Configuração carregada com sucesso de: {self.config_path}")
-                return data
+            data = self._read_config_file(self.config_path)
+            self._logger.debug(f"Configuração carregada com sucesso de: {self.config_path}")
+            return data
         except (json.JSONDecodeError, PermissionError) as e:
             self._logger.warning(f"Falha ao ler arquivo de configuração principal {self.config_path}: {e}")
             # try fallback
             if hasattr(self, '_fallback_path') and self._fallback_path is not None and self._fallback_path.exists():
                 try:
                     self._logger.info(f"Tentando arquivo de configuração fallback: {self._fallback_path}")
-                    with open(self._fallback_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        self.config_path = self._fallback_path
-                        self._logger.info(f"Usando arquivo de configuração fallback: {self._fallback_path}")
-                        return data
+                    data = self._read_config_file(self._fallback_path)
+                    self.config_path = self._fallback_path
+                    self._logger.info(f"Usando arquivo de configuração fallback: {self._fallback_path}")
+                    return data
                 except Exception as e:
                     self._logger.warning(f"Falha ao ler arquivo de configuração fallback {self._fallback_path}: {e}")
                     return {}
@@ -268,8 +428,6 @@ class ConfigManager:
             Se o diretório padrão for somente leitura, tentará usar o diretório
             home do usuário como caminho alternativo.
         """
-        import tempfile
-        
         try:
             # Tenta salvar no caminho principal primeiro
             try:
@@ -284,19 +442,7 @@ class ConfigManager:
                     if not self._check_write_permission(self.config_path.parent, aggressive_check=True):
                         raise PermissionError(f"Sem permissão de escrita no diretório: {self.config_path.parent}")
                 
-                # Garante que o diretório pai exista
-                self.config_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Escreve atomicamente: escreve JSON em um arquivo temporário no diretório do destino,
-                # e então substitui o arquivo de destino
-                with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8',
-                                                dir=self.config_path.parent,
-                                                suffix='.json', delete=False) as temp_file:
-                    json.dump(config, temp_file, indent=2, ensure_ascii=False)
-                    temp_name = temp_file.name
-                
-                # Substitui o arquivo alvo pelo temporário
-                Path(temp_name).replace(self.config_path)
+                self._write_config_file(self.config_path, config)
                     
                 self._logger.info(f"Configuração salva em: {self.config_path}")
                 return
@@ -313,17 +459,8 @@ class ConfigManager:
                         if not self._check_write_permission(self._fallback_path.parent, aggressive_check=True):
                             raise PermissionError(f"Sem permissão de escrita no diretório de fallback: {self._fallback_path.parent}")
                     
-                    self._fallback_path.parent.mkdir(parents=True, exist_ok=True)
-                    
                     # Escreve atomicamente no caminho de fallback também
-                    with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8',
-                                                    dir=self._fallback_path.parent,
-                                                    suffix='.json', delete=False) as temp_file:
-                        json.dump(config, temp_file, indent=2, ensure_ascii=False)
-                        temp_name = temp_file.name
-                    
-                    # Substitui o arquivo alvo pelo temporário
-                    Path(temp_name).replace(self._fallback_path)
+                    self._write_config_file(self._fallback_path, config)
                         
                     self._logger.info(f"Configuração salva no caminho alternativo: {self._fallback_path}")
                     # Atualiza o caminho de configuração para o fallback
@@ -337,8 +474,110 @@ class ConfigManager:
             raise ConfigManagerError(f"Sem permissão para escrever no arquivo de configuração: {e}")
         except Exception as e:
             raise ConfigManagerError(f"Erro ao salvar configuração: {e}")
-    
+
+    def _write_config_file(self, path: Path, config: Dict[str, Any]) -> None:
+        """
+        Grava config em path atomicamente (arquivo temporário no mesmo diretório + replace).
+
+        Uma falha de escrita real descarta as verificações de permissão memorizadas
+        para o diretório; uma gravação bem-sucedida as confirma.
+
+        Raises:
+            OSError: Se o arquivo não puder ser gravado.
+        """
+        import tempfile
+
+        try:
+            # Garante que o diretório pai exista
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Escreve JSON em um arquivo temporário no diretório do destino e então
+            # substitui o arquivo de destino
+            with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8',
+                                             dir=path.parent,
+                                             suffix='.json', delete=False) as temp_file:
+                temp_file.write(json_backend.dumps(config))
+                temp_name = temp_file.name
+
+            Path(temp_name).replace(path)
+        except OSError:
+            self._forget_write_permission(path.parent)
+            raise
+
+        self._remember_write_permission(path.parent)
+        self._remember_written(path, config)
+
+    @classmethod
+    def get_permission_stats(cls) -> Dict[str, int]:
+        """
+        Retorna os contadores das verificações de permissão de escrita do processo.
+
+        Returns:
+            Dicionário com:
+            {
+                "checks": int,                # chamadas a _check_write_permission
+                "cache_hits": int,            # respondidas pelo cache
+                "probe_writes": int,          # escritas de teste (modo agressivo) realizadas
+                "probe_writes_avoided": int   # verificações agressivas respondidas pelo cache
+            }
+        """
+        with cls._cache_lock:
+            return dict(cls._permission_stats)
+
+    @classmethod
+    def _count_permission(cls, counter: str) -> None:
+        with cls._cache_lock:
+            cls._permission_stats[counter] += 1
+
+    def _forget_write_permission(self, directory: Path) -> None:
+        """Descarta os resultados memorizados de verificação de permissão de directory."""
+        key = str(directory.absolute())
+        with self._cache_lock:
+            for aggressive_check in (False, True):
+                self._permission_cache.pop((key, aggressive_check), None)
+
+    def _remember_write_permission(self, directory: Path) -> None:
+        """Registra que directory acabou de aceitar uma escrita real."""
+        key = str(directory.absolute())
+        expires = time.monotonic() + self.permission_cache_ttl
+        with self._cache_lock:
+            for aggressive_check in (False, True):
+                self._permission_cache[(key, aggressive_check)] = (True, expires)
+
     def _check_write_permission(self, directory: Path, aggressive_check: bool = False) -> bool:
+        """
+        Verifica permissão de escrita, reutilizando o resultado memorizado por diretório.
+
+        O resultado de cada (diretório, modo) vale por permission_cache_ttl segundos,
+        de modo que salvamentos e operações em lote seguidos não repetem as escritas
+        de teste do modo agressivo. Veja _probe_write_permission().
+
+        Args:
+            directory: Diretório a verificar.
+            aggressive_check: Quando True, faz tentativa de escrita real (controlada).
+
+        Returns:
+            True se houver evidência confiável de permissão de escrita; False caso contrário.
+        """
+        key = (str(directory.absolute()), aggressive_check)
+        now = time.monotonic()
+        self._count_permission("checks")
+        with self._cache_lock:
+            cached = self._permission_cache.get(key)
+        if cached is not None and cached[1] > now:
+            self._count_permission("cache_hits")
+            if aggressive_check:
+                self._count_permission("probe_writes_avoided")
+                if _registry.enabled:
+                    _registry.record("ConfigManager.probe_write_avoided", 0.0)
+            return cached[0]
+
+        result = self._probe_write_permission(directory, aggressive_check)
+        with self._cache_lock:
+            self._permission_cache[key] = (result, now + self.permission_cache_ttl)
+        return result
+
+    def _probe_write_permission(self, directory: Path, aggressive_check: bool = False) -> bool:
         """
         Verifica permissão de escrita de forma conservadora primeiro e só realiza
         tentativa de escrita real quando explicitamente solicitado.
@@ -367,7 +606,8 @@ class ConfigManager:
                 # Verificação agressiva controlada: cria arquivo temporário dentro do diretório
                 import tempfile
                 try:
-                    with tempfile.NamedTemporaryFile(
+                    self._count_permission("probe_writes")
+                    with _registry.timer("ConfigManager.probe_write"), tempfile.NamedTemporaryFile(
                         dir=directory,
                         prefix=".perm_test_",
                         suffix=".tmp",
@@ -394,7 +634,9 @@ class ConfigManager:
             # Mesmo que os.access no pai falhe, confirmamos com tentativa controlada
             import tempfile
             try:
-                with tempfile.TemporaryDirectory(prefix=".perm_test_", dir=parent) as tmp_dir:
+                self._count_permission("probe_writes")
+                with _registry.timer("ConfigManager.probe_write"), \
+                        tempfile.TemporaryDirectory(prefix=".perm_test_", dir=parent) as tmp_dir:
                     test_path = Path(tmp_dir) / ".t.tmp"
                     with open(test_path, "w", encoding="utf-8") as fh:
                         fh.write("ok")
@@ -0,0 +1,182 @@
+"""
+Executable Index Module
+
+Cached replacement for repeated shutil.which() calls. The directories of PATH
+are listed once and merged into a name -> candidate paths index (honouring
+PATHEXT on Windows); lookups then cost a dictionary access plus one check of
+the matching file. The index is revalidated against PATH, PATHEXT and the
+modification time of every PATH directory, and only directories that changed
+are listed again. A change of PATH/PATHEXT is seen immediately; directory
+mtimes are re-checked at most every recheck_interval seconds.
+"""
+
+import os
+import shutil
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_IS_WINDOWS = os.name == "nt"
+
+
+def _is_executable(path: str) -> bool:
+    return os.access(path, os.X_OK) and not os.path.isdir(path)
+
+
+class ExecutableIndex:
+    """
+    Index of the executables reachable through PATH.
+
+    Example:
+        index = ExecutableIndex()
+        index.resolve("npx")                  # '/usr/bin/npx' or None
+        index.resolve_many(["npx", "uvx"])    # {'npx': ..., 'uvx': None}
+    """
+
+    def __init__(self, recheck_interval: float = 2.0):
+        """
+        Initialize the index (built lazily on first lookup).
+
+        Args:
+            recheck_interval: Seconds during which lookups trust the index without
+                              re-checking PATH and the directory mtimes
+        """
+        self.recheck_interval = recheck_interval
+        self._lock = threading.Lock()
+        # directory -> (st_mtime_ns, names in the directory)
+        self._listings: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+        # lookup key (lower-case on Windows) -> (PATH position, path) candidates in PATH order
+        self._index: Dict[str, Tuple[Tuple[int, str], ...]] = {}
+        self._extensions: List[str] = []
+        self._env_key: Optional[tuple] = None
+        self._dir_mtimes: Tuple[Optional[int], ...] = ()
+        self._checked_at = float("-inf")
+        self.builds = 0
+
+    def __repr__(self) -> str:
+        return f"ExecutableIndex(directories={len(self._listings)}, names={len(self._index)})"
+
+    def invalidate(self) -> None:
+        """Force the next lookup to re-list every PATH directory."""
+        with self._lock:
+            self._listings.clear()
+            self._env_key = None
+            self._checked_at = float("-inf")
+
+    @staticmethod
+    def _environment() -> Tuple[str, str, List[str], List[str]]:
+        """Return (PATH, PATHEXT, directories to search, extensions) like shutil.which does."""
+        path = os.environ.get("PATH", os.defpath)
+        pathext = os.environ.get("PATHEXT", "") if _IS_WINDOWS else ""
+        directories = [directory for directory in path.split(os.pathsep) if directory]
+        extensions = []
+        if _IS_WINDOWS:
+            # shutil.which also looks in the current directory first
+            directories.insert(0, os.curdir)
+            extensions = [ext.lower() for ext in pathext.split(os.pathsep) if ext]
+        return path, pathext, list(dict.fromkeys(directories)), extensions
+
+    @staticmethod
+    def _mtime(directory: str) -> Optional[int]:
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def _list_directory(self, directory: str, mtime: Optional[int]) -> Tuple[str, ...]:
+        listing = self._listings.get(directory)
+        if listing is not None and listing[0] == mtime:
+            return listing[1]
+        try:
+            names = tuple(entry.name for entry in os.scandir(directory))
+        except OSError:
+            names = ()
+        self._listings[directory] = (mtime, names)
+        return names
+
+    def _ensure_current(self) -> None:
+        """Rebuild the index if PATH, PATHEXT or a PATH directory changed. Caller holds the lock."""
+        path, pathext, directories, extensions = self._environment()
+        env_key = (path, pathext, os.getcwd() if _IS_WINDOWS else None)
+        now = time.monotonic()
+        if env_key == self._env_key and now - self._checked_at < self.recheck_interval:
+            return
+
+        mtimes = tuple(self._mtime(directory) for directory in directories)
+        self._checked_at = now
+        if env_key == self._env_key and mtimes == self._dir_mtimes:
+            return
+
+        index: Dict[str, list] = {}
+        for position, (directory, mtime) in enumerate(zip(directories, mtimes)):
+            for name in self._list_directory(directory, mtime):
+                key = name.lower() if _IS_WINDOWS else name
+                index.setdefault(key, []).append((position, os.path.join(directory, name)))
+        # Drop listings of directories no longer on PATH
+        for directory in set(self._listings) - set(directories):
+            del self._listings[directory]
+
+        self._index = {key: tuple(paths) for key, paths in index.items()}
+        self._env_key = env_key
+        self._dir_mtimes = mtimes
+        self._extensions = extensions
+        self.builds += 1
+
+    def _candidates(self, command: str) -> List[str]:
+        """Lookup keys for command, in the order shutil.which tries them."""
+        if not _IS_WINDOWS:
+            return [command]
+        lowered = command.lower()
+        if any(lowered.endswith(ext) for ext in self._extensions):
+            return [lowered]
+        return [lowered + ext for ext in self._extensions]
+
+    def _resolve(self, command: str) -> Optional[str]:
+        if not command:
+            return None
+        if os.path.dirname(command):
+            # Explicit paths are not looked up in PATH
+            return shutil.which(command)
+        keys = self._candidates(command)
+        if len(keys) == 1:
+            candidates = [path for _, path in self._index.get(keys[0], ())]
+        else:
+            # Windows: directory by directory, each PATHEXT extension in order
+            ranked = [(position, order, path)
+                      for order, key in enumerate(keys)
+                      for position, path in self._index.get(key, ())]
+            candidates = [path for _, _, path in sorted(ranked)]
+        for path in candidates:
+            if _is_executable(path):
+                return path
+        return None
+
+    def resolve(self, command: str) -> Optional[str]:
+        """
+        Return the full path of command, like shutil.which(command).
+
+        Returns:
+            The executable path, or None if command is not on PATH
+        """
+        with self._lock:
+            self._ensure_current()
+            return self._resolve(command)
+
+    def resolve_many(self, commands: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve several commands with a single index validation.
+
+        Returns:
+            {command: executable path or None}
+        """
+        with self._lock:
+            self._ensure_current()
+            return {command: self._resolve(command) for command in dict.fromkeys(commands)}
+
+
+_default_index = ExecutableIndex()
+
+
+def get_executable_index() -> ExecutableIndex:
+    """Return the process-wide index used by MCPManager."""
+    return _default_index
@@ -0,0 +1,229 @@
+"""
+File Lock Module
+
+Advisory inter-process lock used around read-modify-write cycles of
+settings.json. On POSIX the lock is an fcntl.flock on a sidecar lock file;
+elsewhere the lock file itself is created exclusively (O_EXCL) and removed on
+release. The holder keeps touching that file, so only lock files whose owner
+stopped refreshing them (a crashed process) are broken as stale.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class FileLockError(Exception):
+    """Raised when the lock cannot be acquired."""
+    pass
+
+
+class FileLock:
+    """
+    Advisory lock on a lock file, usable as a context manager.
+
+    Example:
+        with FileLock(Path("settings.json.lock")):
+            ...  # read, modify and write settings.json
+    """
+
+    def __init__(self, path: Path, timeout: float = 10.0, poll_interval: float = 0.05,
+                 stale_after: float = 30.0, use_fcntl: Optional[bool] = None):
+        """
+        Initialize the lock.
+
+        Args:
+            path: Lock file path (usually '<settings file>.lock')
+            timeout: Seconds to wait for the lock before raising FileLockError
+            poll_interval: Seconds between acquisition attempts
+            stale_after: Age in seconds after which an exclusive lock file left
+                         behind by another process is considered abandoned
+                         (lock file fallback only; the holder refreshes the
+                         file every stale_after / 3 seconds)
+            use_fcntl: Force (True) or disable (False) fcntl locking; defaults to
+                       fcntl when available
+        """
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._use_fcntl = (fcntl is not None) if use_fcntl is None else (use_fcntl and fcntl is not None)
+        self._fd: Optional[int] = None
+        self._heartbeat: Optional[threading.Thread] = None
+        self._stop_heartbeat = threading.Event()
+        self._logger = logging.getLogger(__name__)
+
+    def __repr__(self) -> str:
+        return f"FileLock(path='{self.path}')"
+
+    @property
+    def is_locked(self) -> bool:
+        """True while this instance holds the lock."""
+        return self._fd is not None
+
+    def acquire(self) -> None:
+        """
+        Acquire the lock, waiting up to timeout seconds.
+
+        Raises:
+            FileLockError: If the lock is still held elsewhere after timeout, or
+                           the lock file cannot be created
+        """
+        if self._fd is not None:
+            raise FileLockError(f"Lock already held: {self.path}")
+
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                if self._try_acquire():
+                    return
+            except OSError as e:
+                raise FileLockError(f"Cannot create lock file '{self.path}': {e}")
+
+            if time.monotonic() >= deadline:
+                raise FileLockError(f"Timed out after {self.timeout}s waiting for lock '{self.path}'")
+            time.sleep(self.poll_interval)
+
+    def _try_acquire(self) -> bool:
+        if self._use_fcntl:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+            except BaseException:
+                os.close(fd)
+                raise
+            self._fd = fd
+            return True
+
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            self._break_if_stale()
+            return False
+        os.write(fd, str(os.getpid()).encode('ascii'))
+        self._fd = fd
+        self._start_heartbeat(fd)
+        return True
+
+    def _start_heartbeat(self, fd: int) -> None:
+        """Keep the lock file's mtime fresh so long holds are not broken as stale."""
+        self._stop_heartbeat.clear()
+        interval = max(self.stale_after / 3, self.poll_interval)
+
+        def beat():
+            while not self._stop_heartbeat.wait(interval):
+                self._touch(fd)
+
+        self._heartbeat = threading.Thread(target=beat, name=f"FileLock heartbeat {self.path.name}",
+                                           daemon=True)
+        self._heartbeat.start()
+
+    def _stop_heartbeat_thread(self) -> None:
+        if self._heartbeat is not None:
+            self._stop_heartbeat.set()
+            self._heartbeat.join()
+            self._heartbeat = None
+
+    def _owns_path(self, fd: int) -> bool:
+        """True if the lock file on disk is still the one opened as fd."""
+        try:
+            return os.path.samestat(os.fstat(fd), os.stat(self.path))
+        except OSError:
+            return False
+
+    def _touch(self, fd: int) -> None:
+        if self._owns_path(fd):
+            try:
+                os.utime(self.path)
+            except OSError as e:
+                self._logger.debug(f"Could not refresh lock file {self.path}: {e}")
+
+    def _break_if_stale(self) -> None:
+        """
+        Remove the lock file if its owner stopped refreshing it.
+
+        The file is first moved aside with an atomic rename, then checked to be
+        the very file that was judged stale; if another waiter broke it and a
+        new holder created a fresh one in between, that fresh file is put back.
+        A PermissionError (Windows, file still open by its owner) means the
+        lock is still held.
+        """
+        try:
+            stale = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        age = time.time() - stale.st_mtime
+        if age <= self.stale_after:
+            return
+
+        aside = self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex}.stale")
+        try:
+            os.rename(self.path, aside)
+        except (FileNotFoundError, PermissionError):
+            return
+
+        try:
+            moved = os.stat(aside)
+        except FileNotFoundError:
+            return
+        if os.path.samestat(stale, moved) and moved.st_mtime == stale.st_mtime:
+            self._logger.warning(f"Removing stale lock file ({age:.0f}s old): {self.path}")
+            try:
+                os.unlink(aside)
+            except OSError:
+                pass
+            return
+
+        # Not the file judged stale: a live holder's lock, put it back
+        try:
+            os.link(aside, self.path)
+        except OSError:
+            pass
+        try:
+            os.unlink(aside)
+        except OSError:
+            pass
+
+    def release(self) -> None:
+        """Release the lock; does nothing if it is not held."""
+        fd = self._fd
+        if fd is None:
+            return
+        self._fd = None
+        if self._use_fcntl:
+            # The lock file stays in place; unlinking it would race with waiters
+            try:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            finally:
+                os.close(fd)
+            return
+        self._stop_heartbeat_thread()
+        # Only remove the lock file if it is still ours (it may have been broken)
+        owned = self._owns_path(fd)
+        os.close(fd)
+        if owned:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
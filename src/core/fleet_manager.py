@@ -0,0 +1,163 @@
+"""
+Fleet Manager Module
+
+Applies the same MCPManager operation to many settings files (e.g. the
+.gemini/.qwen settings of every user home on a shared host) concurrently on a
+bounded thread pool, collecting one result per target.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .config_manager import ConfigManager, ConfigManagerError
+from .mcp_manager import MCPManager, MCPManagerError
+
+
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class FleetResult:
+    """Outcome of one fleet operation on a single settings file."""
+
+    target: Path
+    ok: bool
+    result: Any = None
+    error: Optional[Exception] = None
+    duration: float = 0.0
+
+
+class FleetManager:
+    """
+    Runs MCPManager operations over many settings files in parallel.
+
+    Each target gets its own MCPManager, kept between runs so that repeated
+    operations reuse its settings cache. A failure on one target is recorded
+    in its FleetResult and never affects the others.
+    """
+
+    def __init__(self, settings_paths: Optional[Iterable[str]] = None,
+                 user_base_paths: Optional[Iterable[str]] = None,
+                 cli_types: Optional[Iterable[str]] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Initialize the fleet.
+
+        Args:
+            settings_paths: Explicit settings.json paths to manage.
+            user_base_paths: User base paths (e.g. '/home/alice'). Each one is
+                             expanded to <base>/.<cli_type>/settings.json for
+                             every entry of cli_types.
+            cli_types: CLI types used with user_base_paths (e.g. ['gemini', 'qwen']).
+                       Defaults to the CLI type configured in ConfigManager.
+            max_workers: Upper bound on concurrent targets.
+
+        Raises:
+            MCPManagerError: If no target was given or max_workers is invalid
+        """
+        self._logger = logging.getLogger(__name__)
+
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise MCPManagerError("max_workers must be a positive integer")
+        self.max_workers = max_workers
+
+        targets = [Path(path).expanduser() for path in settings_paths or ()]
+
+        if user_base_paths is not None:
+            cli_types = list(cli_types) if cli_types is not None else [self._configured_cli_type()]
+            for base in user_base_paths:
+                base_path = Path(base).expanduser()
+                targets.extend(base_path / f".{cli}" / "settings.json" for cli in cli_types)
+
+        # Same file twice would race with itself
+        self.targets: List[Path] = list(dict.fromkeys(targets))
+        if not self.targets:
+            raise MCPManagerError("FleetManager requires at least one target")
+
+        self._managers: Dict[Path, MCPManager] = {}
+
+    def __repr__(self) -> str:
+        return f"FleetManager(targets={len(self.targets)}, max_workers={self.max_workers})"
+
+    def _configured_cli_type(self) -> str:
+        try:
+            return ConfigManager.shared().get_cli_type()
+        except ConfigManagerError as e:
+            self._logger.warning(f"Error loading config ({e}), using 'gemini' for fleet targets")
+            return "gemini"
+
+    def _manager_for(self, target: Path) -> MCPManager:
+        manager = self._managers.get(target)
+        if manager is None:
+            manager = MCPManager(settings_path=str(target))
+            self._managers[target] = manager
+        return manager
+
+    def _run_one(self, func: Callable[[MCPManager], Any], target: Path) -> FleetResult:
+        start = time.perf_counter()
+        try:
+            result = func(self._manager_for(target))
+        except Exception as e:
+            self._logger.error(f"Fleet operation failed for {target}: {e}")
+            return FleetResult(target, False, error=e, duration=time.perf_counter() - start)
+        return FleetResult(target, True, result=result, duration=time.perf_counter() - start)
+
+    def run(self, func: Callable[[MCPManager], Any]) -> List[FleetResult]:
+        """
+        Apply func to the MCPManager of every target concurrently.
+
+        Args:
+            func: Callable receiving the target's MCPManager; its return value
+                  is stored in FleetResult.result.
+
+        Returns:
+            One FleetResult per target, in target order
+        """
+        workers = min(self.max_workers, len(self.targets))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mcp-fleet") as pool:
+            futures = [pool.submit(self._run_one, func, target) for target in self.targets]
+            results = [future.result() for future in futures]
+
+        failed = sum(1 for result in results if not result.ok)
+        self._logger.info(f"Fleet operation finished: {len(results) - failed} ok, {failed} failed")
+        return results
+
+    def install_template(self, template_name: str, enable: bool = True,
+                         skip_dependency_check: bool = False) -> List[FleetResult]:
+        """
+        Install a template on every target.
+
+        Targets that already have the template are left untouched and report
+        result False; newly installed ones report True.
+
+        Raises:
+            MCPManagerError: If the template doesn't exist or its dependencies are
+                             missing on this host (checked once for the whole fleet)
+        """
+        if template_name not in self._manager_for(self.targets[0]).template_catalog:
+            raise MCPManagerError(f"Template '{template_name}' not found")
+
+        if not skip_dependency_check:
+            missing_deps = self._manager_for(self.targets[0]).get_missing_dependencies(template_name)
+            if missing_deps:
+                dep_list = ", ".join(missing_deps)
+                raise MCPManagerError(f"Dependências ausentes: {dep_list}. Instale as dependências antes de continuar.")
+
+        def install(manager: MCPManager) -> bool:
+            if manager.is_template_installed(template_name):
+                return False
+            return manager.install_from_template(template_name, enable=enable, skip_dependency_check=True)
+
+        return self.run(install)
+
+    def set_allowed_many(self, names_to_enable: List[str], names_to_disable: List[str]) -> List[FleetResult]:
+        """Enable and disable the given MCPs on every target."""
+        return self.run(lambda manager: manager.set_allowed_many(names_to_enable, names_to_disable))
+
+    def set_temperature(self, temperature: float) -> List[FleetResult]:
+        """Set the model temperature on every target."""
+        return self.run(lambda manager: manager.set_temperature(temperature))
@@ -0,0 +1,144 @@
+"""
+Frozen Settings Module
+
+Read-only views of JSON-like settings data. Dictionaries become FrozenDict
+mappings and lists become tuples, so a snapshot can be shared between readers
+without copying. freeze_settings() reuses the frozen mcpServers entries of the
+previous snapshot that did not change (structural sharing by identity).
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class FrozenDict(Mapping):
+    """
+    Immutable mapping used for settings snapshots.
+
+    Supports the read-only Mapping API (``[]``, ``get``, ``in``, iteration,
+    ``items``...) and compares equal to dicts with the same content.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenDict):
+            return self._data == other._data
+        if isinstance(other, dict):
+            # Lists in other match the tuples freeze() produced
+            return (len(self._data) == len(other)
+                    and all(key in other and _equal(value, other[key]) for key, value in self._data.items()))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({self._data!r})"
+
+
+def _equal(frozen: Any, other: Any) -> bool:
+    """Compare a frozen value with a plain or frozen one, treating lists as tuples."""
+    if isinstance(frozen, tuple) and isinstance(other, list):
+        return len(frozen) == len(other) and all(_equal(a, b) for a, b in zip(frozen, other))
+    return frozen == other
+
+
+def freeze(value: Any) -> Any:
+    """
+    Build a read-only copy of a JSON-like value.
+
+    Args:
+        value: dict/list/scalar structure to freeze
+
+    Returns:
+        FrozenDict for dicts, tuple for lists, the value itself for scalars.
+    """
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        if not any(isinstance(item, (dict, list, tuple)) for item in value):
+            # Lists of scalars (e.g. mcp.allowed) need no recursion
+            return tuple(value)
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def freeze_settings(settings: Dict[str, Any],
+                    previous: Optional[Tuple[FrozenDict, Dict[str, Tuple[Any, Any]]]] = None
+                    ) -> Tuple[FrozenDict, Dict[str, Tuple[Any, Any]]]:
+    """
+    Freeze a settings dictionary, sharing unchanged mcpServers entries with a previous snapshot.
+
+    MCPManager never mutates an mcpServers entry in place (operations replace the
+    entry), so an entry that is the same object as when the previous snapshot was
+    built is unchanged and its frozen copy is reused. If every entry is reused, the
+    frozen mcpServers mapping itself is reused. Other sections are small and are
+    frozen again.
+
+    Args:
+        settings: Settings dictionary
+        previous: Value returned by the previous call, or None
+
+    Returns:
+        (snapshot, entries) where entries maps each server name to
+        (source entry, frozen entry); pass the pair back on the next call.
+    """
+    previous_snapshot, previous_entries = previous if previous is not None else (None, {})
+    servers = settings.get('mcpServers')
+    entries: Dict[str, Tuple[Any, Any]] = {}
+    data = {}
+    for key, value in settings.items():
+        if key != 'mcpServers' or not isinstance(servers, dict):
+            data[key] = freeze(value)
+            continue
+
+        frozen_servers = {}
+        all_reused = len(servers) == len(previous_entries)
+        for name, config in servers.items():
+            cached = previous_entries.get(name)
+            if cached is not None and cached[0] is config:
+                frozen_config = cached[1]
+            else:
+                frozen_config = freeze(config)
+                all_reused = False
+            entries[name] = (config, frozen_config)
+            frozen_servers[name] = frozen_config
+
+        previous_servers = previous_snapshot.get('mcpServers') if previous_snapshot is not None else None
+        if all_reused and isinstance(previous_servers, FrozenDict) and list(previous_servers) == list(servers):
+            data[key] = previous_servers
+        else:
+            data[key] = FrozenDict(frozen_servers)
+    return FrozenDict(data), entries
+
+
+def thaw(value: Any) -> Any:
+    """
+    Build a mutable deep copy of a frozen value.
+
+    Args:
+        value: Value returned by freeze()
+
+    Returns:
+        Equivalent structure made of dicts and lists.
+    """
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
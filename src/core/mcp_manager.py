@@ -5,17 +5,32 @@ A Python module for managing MCP (Model Context Protocol) server configurations
 in the settings.json file. Provides CRUD operations and validation for MCP server configurations.
 """
 
+import hashlib
 import json
+import os
 import shutil
 import logging
 import copy
 import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Set, Any
 import uuid
 from tempfile import NamedTemporaryFile
+from . import json_backend
 from .config_manager import ConfigManager, ConfigManagerError
+from .executable_index import get_executable_index
+from .file_lock import FileLock, FileLockError
+from .frozen import FrozenDict, freeze_settings
+from .instrumentation import get_registry, timed
+from .settings_journal import SettingsJournal
+from .settings_recovery import RecoveryReport, salvage_settings
+from .snapshot_store import SNAPSHOT_DIR_NAME, Snapshot, SnapshotError, SnapshotStore
+from .template_catalog import TemplateCatalog
 
 
 DEFAULT_SYSTEM_INSTRUCTION = (
@@ -38,6 +53,9 @@ Todos os commits devem seguir estritamente o padrão **Conventional Commits**. A
 Ao ser solicitado para criar um commit, você DEVE usar este formato.
 """
 
+_GUIDELINES_MARKER_RE = re.compile(r"(?m)^#\s+Diretrizes\s+para\s+o\s+Projeto")
+_SECTION_HEADER_RE = re.compile(r"(?m)^#\s+")
+
 MCP_TEMPLATES = {
     "context7": {
         "name": "context7",
@@ -62,11 +80,111 @@ MCP_TEMPLATES = {
 }
 
 
+_registry = get_registry()
+_executable_index = get_executable_index()
+# Built-in templates plus the JSON files listed in MCP_TEMPLATES_PATH
+_template_catalog = TemplateCatalog(builtin=MCP_TEMPLATES)
+
+
 class MCPManagerError(Exception):
     """Custom exception for MCP Manager errors."""
     pass
 
 
+class ConcurrentModificationError(MCPManagerError):
+    """Raised when settings.json changed underneath a writer and its changes cannot be re-applied."""
+    pass
+
+
+@dataclass(frozen=True)
+class SaveResult:
+    """Outcome of the last MCPManager.save_settings() call."""
+
+    saved: bool
+    """False when the serialized settings matched the file on disk and the write was skipped."""
+    bytes_written: int
+    """Number of bytes written to settings.json (0 when skipped)."""
+    digest: str
+    """SHA-256 of the canonical serialized settings."""
+
+
+class _AllowedIndex:
+    """
+    Ordered-set index over settings['mcp']['allowed'].
+
+    Membership, add and discard are O(1). Additions are appended to the list
+    right away; removals mark the list stale and it is rebuilt once, in order,
+    by sync(). Duplicate names in the list are dropped on the next sync().
+    """
+
+    __slots__ = ("_mcp", "_order", "_stale")
+
+    def __init__(self, mcp_section: Dict[str, Any]):
+        self._mcp = mcp_section
+        allowed = mcp_section.setdefault('allowed', [])
+        self._order = dict.fromkeys(allowed)
+        self._stale = len(self._order) != len(allowed)
+
+    def covers(self, settings: Dict[str, Any]) -> bool:
+        """Return True if this index tracks the 'mcp' section of settings."""
+        return settings.get('mcp') is self._mcp
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._order
+
+    def add(self, name: str) -> bool:
+        """Enable name; returns False if it was already enabled."""
+        if name in self._order:
+            return False
+        self._order[name] = None
+        if not self._stale:
+            self._mcp['allowed'].append(name)
+        return True
+
+    def discard(self, name: str) -> bool:
+        """Disable name; returns False if it was not enabled."""
+        if name not in self._order:
+            return False
+        del self._order[name]
+        self._stale = True
+        return True
+
+    def sync(self) -> None:
+        """Rewrite the allowed list from the index if removals made it stale."""
+        if self._stale:
+            self._mcp['allowed'] = list(self._order)
+            self._stale = False
+
+
+class _Transaction:
+    """In-memory working copy of the settings for MCPManager.transaction()."""
+
+    __slots__ = ("settings", "depth", "dirty", "touched", "base_validated", "allowed", "etag", "ops", "effects",
+                 "owner")
+
+    def __init__(self, settings: Dict[str, Any], base_validated: bool, etag: Optional[tuple]):
+        self.settings = settings
+        # Thread that opened the transaction; only it sees the working copy
+        self.owner = threading.get_ident()
+        self.depth = 1
+        self.dirty = False
+        # mcpServers entries changed since the (validated) base state
+        self.touched = set()
+        self.base_validated = base_validated
+        self.allowed: Optional[_AllowedIndex] = None
+        # Stat key of the file the base settings were read from
+        self.etag = etag
+        # (op, args, touched, entities) in order, replayed if the file changed before commit
+        self.ops = []
+        # Journal records of the applied operations (see settings_journal)
+        self.effects = []
+
+    def sync(self) -> None:
+        """Bring the working settings in line with the allowed index."""
+        if self.allowed is not None:
+            self.allowed.sync()
+
+
 class MCPManager:
     """
     A class for managing MCP server configurations in settings.json.
@@ -75,7 +193,18 @@ class MCPManager:
     with data validation.
     """
 
-    def __init__(self, settings_path: Optional[str] = None, user_base_path: Optional[str] = None, config_manager: Optional[ConfigManager] = None):
+    # Seconds to wait for the settings.json lock held by another writer
+    lock_timeout = 10.0
+    # Journal mode: compact into settings.json once the journal reaches this size or age
+    journal_max_bytes = 256 * 1024
+    journal_max_age = 60.0
+    # Snapshot retention: newest snapshots kept, and maximum age in seconds
+    snapshot_keep_last = 50
+    snapshot_max_age = 30 * 24 * 3600.0
+
+    def __init__(self, settings_path: Optional[str] = None, user_base_path: Optional[str] = None,
+                 config_manager: Optional[ConfigManager] = None, journal: bool = False,
+                 snapshots: bool = True, template_catalog: Optional[TemplateCatalog] = None):
         """
         Initialize the MCP Manager.
 
@@ -88,6 +217,17 @@ class MCPManager:
                             Takes priority over ConfigManager.
             config_manager: Optional ConfigManager instance to use.
                             If provided, will be used instead of creating a new instance.
+            journal: If True, committed changes are appended to 'settings.json.journal'
+                     and settings.json is only rewritten (compacted) when the journal
+                     exceeds journal_max_bytes/journal_max_age or on flush(). Every
+                     manager replays a journal found next to settings.json on load.
+            snapshots: If True, every write of settings.json records a snapshot of it and
+                       of the guidelines file in '.mcp-snapshots' (see snapshot_store),
+                       which restore_snapshot() can bring back; old snapshots are
+                       pruned per snapshot_keep_last/snapshot_max_age.
+                       create_snapshot() records explicit checkpoints either way.
+            template_catalog: Templates to offer; defaults to the built-in MCP_TEMPLATES
+                              plus the JSON files listed in MCP_TEMPLATES_PATH.
 
         Priority order:
             1. settings_path (if provided)
@@ -98,6 +238,42 @@ class MCPManager:
         """
         self._logger = logging.getLogger(__name__)
         self._settings_cache = None
+        self._settings_stat = None
+        self._snapshot = None
+        # mcpServers name -> (source entry, frozen entry) of the current snapshot
+        self._snapshot_entries = {}
+        self._snapshot_source = None
+        self._snapshot_version = 0
+        self._allowed_set_cache = None
+        self._mutation_version = 0
+        self._txn = None
+        self._guidelines_state = None
+        self._persisted = None
+        self._base_digest = None
+        # Set when the journal replayed on load is older than journal_max_age
+        self._journal_expired = False
+        self.journal_enabled = journal
+        self.snapshots_enabled = snapshots
+        self.template_catalog = template_catalog if template_catalog is not None else _template_catalog
+        self._snapshot_store_cache: Optional[SnapshotStore] = None
+        self._cache_validated = False
+        self.last_save_result: Optional[SaveResult] = None
+        # What was salvaged the last time a corrupt settings.json was loaded
+        self.last_recovery_report: Optional[RecoveryReport] = None
+        self._stats = {
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "guidelines_writes": 0,
+            "guidelines_writes_avoided": 0,
+            "settings_writes": 0,
+            "settings_writes_avoided": 0,
+            "bytes_written": 0,
+            "conflicts_rebased": 0,
+            "journal_appends": 0,
+            "journal_compactions": 0,
+            "snapshots_created": 0,
+        }
+        self._lock = threading.RLock()
         self._external_config_manager = config_manager
 
         if settings_path is not None:
@@ -152,7 +328,129 @@ class MCPManager:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
+        if self.journal_enabled:
+            try:
+                self.flush()
+            except MCPManagerError as e:
+                self._logger.warning(f"Failed to compact settings journal: {e}")
+        self._invalidate_cache()
+
+    def _invalidate_cache(self) -> None:
+        """Drop the cached settings so the next read re-parses the file."""
         self._settings_cache = None
+        self._settings_stat = None
+        self._persisted = None
+        self._base_digest = None
+        self._cache_validated = False
+
+    def _journal(self) -> SettingsJournal:
+        return SettingsJournal(self.settings_path.with_name(self.settings_path.name + ".journal"))
+
+    def _stat_settings_file(self) -> Optional[tuple]:
+        """
+        Return the cache validation key of the settings file.
+
+        Returns:
+            (settings.json key, journal key or None), each key being
+            (st_mtime_ns, st_size, st_ino); None if settings.json does not exist.
+        """
+        settings_key = self._stat_file(self.settings_path)
+        if settings_key is None:
+            return None
+        return (settings_key, self._stat_file(self._journal().path))
+
+    @staticmethod
+    def _stat_file(path: Path) -> Optional[tuple]:
+        """Return (st_mtime_ns, st_size, st_ino) of path, or None if it does not exist."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    @staticmethod
+    def _format_etag(stat_key: Optional[tuple]) -> str:
+        """Render a stat key as an etag string ('0' when the file does not exist)."""
+        if stat_key is None:
+            return "0"
+        settings_key, journal_key = stat_key
+        parts = settings_key + (journal_key or ())
+        return "-".join(format(part, "x") for part in parts)
+
+    @timed("MCPManager.get_etag")
+    def get_etag(self) -> str:
+        """
+        Get the version tag of the settings returned by the last read.
+
+        Pass it to save_settings(expected_etag=...) to detect writes made by other
+        processes between load_settings() and save_settings().
+
+        Returns:
+            Opaque etag string; '0' when settings.json does not exist
+        """
+        with self._lock:
+            if self._txn is not None:
+                return self._format_etag(self._txn.etag)
+            self._load_cached()
+            return self._format_etag(self._settings_stat)
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """
+        Hold the advisory lock on settings.json (shared with other processes).
+
+        Raises:
+            MCPManagerError: If the lock cannot be acquired in lock_timeout seconds
+        """
+        lock = FileLock(self.settings_path.with_name(self.settings_path.name + ".lock"),
+                        timeout=self.lock_timeout)
+        try:
+            with _registry.timer("phase.lock_wait"):
+                lock.acquire()
+        except FileLockError as e:
+            raise MCPManagerError(f"Could not lock settings file: {e}")
+        try:
+            yield
+        finally:
+            lock.release()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the I/O counters collected by this manager.
+
+        Returns:
+            Dictionary with the counters, e.g.:
+            {
+                "cache_hits": int,                # reads served from the validated cache
+                "cache_misses": int,              # reads that had to (re-)parse settings.json
+                "guidelines_writes": int,         # Gemini.md/Qwen.md rewrites
+                "guidelines_writes_avoided": int, # rewrites skipped because the file was canonical
+                "settings_writes": int,           # settings.json replacements
+                "settings_writes_avoided": int,   # no-op saves and journal appends skipped
+                "bytes_written": int,             # total bytes written to settings.json
+                "conflicts_rebased": int,         # commits re-applied after a concurrent write
+                "journal_appends": int,           # commits appended to the journal (journal mode)
+                "journal_compactions": int,       # journals materialized into settings.json
+                "snapshots_created": int          # snapshots recorded after writes
+            }
+        """
+        return dict(self._stats)
+
+    @staticmethod
+    def _digest(text: str) -> str:
+        """Return the SHA-256 hex digest of serialized settings text."""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _config_manager(self) -> ConfigManager:
+        """
+        Return the ConfigManager to consult: the one passed to __init__, or a new one.
+
+        New instances are cheap: ConfigManager shares parsed config files across the
+        process and only re-reads them when they change.
+        """
+        if self._external_config_manager is not None:
+            return self._external_config_manager
+        return ConfigManager()
 
     def _get_auth_type(self) -> str:
         """
@@ -173,14 +471,7 @@ class MCPManager:
                     return "oauth-personal"
 
             # Fallback to ConfigManager if not inferred from settings_path
-            if self._external_config_manager:
-                config_mgr = self._external_config_manager
-                self._logger.debug("Using external ConfigManager for auth type lookup")
-            else:
-                config_mgr = ConfigManager()
-                self._logger.debug("Created new ConfigManager for auth type lookup")
-            
-            cli_type = config_mgr.get_cli_type()
+            cli_type = self._config_manager().get_cli_type()
             self._logger.debug(f"Determined CLI type for auth: {cli_type}")
 
             if cli_type == "qwen":
@@ -207,14 +498,7 @@ class MCPManager:
                     self._logger.debug("Inferred CLI type 'gemini' from settings_path")
                     return "gemini"
 
-            if self._external_config_manager:
-                config_mgr = self._external_config_manager
-                self._logger.debug("Using external ConfigManager for CLI type lookup")
-            else:
-                config_mgr = ConfigManager()
-                self._logger.debug("Created new ConfigManager for CLI type lookup")
-
-            cli_type = config_mgr.get_cli_type()
+            cli_type = self._config_manager().get_cli_type()
             self._logger.debug(f"Determined CLI type from ConfigManager: {cli_type}")
 
             if cli_type in ("gemini", "qwen"):
@@ -231,16 +515,23 @@ class MCPManager:
         The "# Diretrizes para o Projeto" section is replaced with GUIDELINES_CONTENT while any
         user content before or after that section is preserved. This method runs automatically
         when settings are saved.
+
+        The file is only rewritten when its content differs from the canonical result. Once a
+        file is known to be canonical, its stat key is remembered so later calls skip even the
+        read while the file is unchanged.
         """
         try:
-            cli_type = self._get_cli_type_from_path()
-            filename = "Gemini.md" if cli_type == "gemini" else "Qwen.md"
-            guidelines_path = self.settings_path.parent / filename
+            guidelines_path = self._guidelines_path()
+
+            stat_key = self._stat_file(guidelines_path)
+            if stat_key is not None and self._guidelines_state == (guidelines_path, stat_key):
+                self._stats["guidelines_writes_avoided"] += 1
+                self._logger.debug(f"Guidelines file unchanged since last check: {guidelines_path}")
+                return
 
-            content_to_write = GUIDELINES_CONTENT
             existing_content = ""
 
-            if guidelines_path.exists():
+            if stat_key is not None:
                 try:
                     existing_content = guidelines_path.read_text(encoding="utf-8")
                     self._logger.debug(f"Read existing guidelines file: {guidelines_path}")
@@ -248,62 +539,90 @@ class MCPManager:
                     self._logger.warning(f"Failed to read existing guidelines file '{guidelines_path}': {read_error}")
                     existing_content = ""
 
-            if existing_content:
-                marker_pattern = re.compile(r"(?m)^#\s+Diretrizes\s+para\s+o\s+Projeto")
-                marker_match = marker_pattern.search(existing_content)
+            content_to_write = self._build_guidelines_content(existing_content)
 
-                if marker_match:
-                    after_marker = existing_content[marker_match.end():]
-                    next_section_match = re.search(r"(?m)^#\s+", after_marker)
-                    if next_section_match:
-                        section_end = marker_match.end() + next_section_match.start()
-                    else:
-                        section_end = len(existing_content)
+            if stat_key is not None and content_to_write == existing_content:
+                self._guidelines_state = (guidelines_path, stat_key)
+                self._stats["guidelines_writes_avoided"] += 1
+                self._logger.debug(f"Guidelines file already canonical: {guidelines_path}")
+                return
 
-                    before_section = existing_content[:marker_match.start()]
-                    after_section = existing_content[section_end:]
+            guidelines_path.parent.mkdir(parents=True, exist_ok=True)
 
-                    rebuilt_content = before_section
-                    if before_section and not before_section.endswith("\n"):
-                        rebuilt_content += "\n"
+            with _registry.timer("phase.guidelines_write", len(content_to_write.encode('utf-8'))):
+                with NamedTemporaryFile('w', delete=False, dir=str(guidelines_path.parent), encoding='utf-8') as tf:
+                    tf.write(content_to_write)
+                    temp_name = tf.name
 
-                    rebuilt_content += GUIDELINES_CONTENT
-                    if not rebuilt_content.endswith("\n"):
-                        rebuilt_content += "\n"
+                Path(temp_name).replace(guidelines_path)
+            self._guidelines_state = (guidelines_path, self._stat_file(guidelines_path))
+            self._stats["guidelines_writes"] += 1
+            self._logger.info(f"Guidelines file ensured at {guidelines_path}")
+        except (PermissionError, IOError) as file_error:
+            self._logger.warning(f"Could not write guidelines file: {file_error}")
+        except Exception as e:
+            self._logger.warning(f"Unexpected error ensuring guidelines file: {e}")
+
+    def _guidelines_path(self) -> Path:
+        """Return the path of the CLI-specific guidelines file (Gemini.md or Qwen.md)."""
+        filename = "Gemini.md" if self._get_cli_type_from_path() == "gemini" else "Qwen.md"
+        return self.settings_path.parent / filename
+
+    def _build_guidelines_content(self, existing_content: str) -> str:
+        """
+        Build the guidelines markdown with the canonical section merged into existing content.
 
-                    if after_section:
-                        if not after_section.startswith("\n"):
-                            rebuilt_content += "\n"
-                        rebuilt_content += after_section
+        Args:
+            existing_content: Current file content ("" if the file does not exist)
 
-                    content_to_write = rebuilt_content
-                    self._logger.debug("Merged existing guidelines content with canonical section")
+        Returns:
+            The full content the guidelines file should have.
+        """
+        content_to_write = GUIDELINES_CONTENT
+
+        if existing_content:
+            marker_match = _GUIDELINES_MARKER_RE.search(existing_content)
+
+            if marker_match:
+                next_section_match = _SECTION_HEADER_RE.search(existing_content, marker_match.end())
+                if next_section_match:
+                    section_end = next_section_match.start()
                 else:
-                    existing_body = existing_content.rstrip("\n")
-                    guidelines_body = GUIDELINES_CONTENT.rstrip("\n")
+                    section_end = len(existing_content)
 
-                    if existing_body:
-                        content_to_write = f"{existing_body}\n\n{guidelines_body}"
-                    else:
-                        content_to_write = GUIDELINES_CONTENT
+                before_section = existing_content[:marker_match.start()]
+                after_section = existing_content[section_end:]
 
-                    self._logger.debug("Guidelines marker not found; appending canonical content while preserving existing markdown")
+                rebuilt_content = before_section
+                if before_section and not before_section.endswith("\n"):
+                    rebuilt_content += "\n"
 
-            if not content_to_write.endswith("\n"):
-                content_to_write += "\n"
+                rebuilt_content += GUIDELINES_CONTENT
+                if not rebuilt_content.endswith("\n"):
+                    rebuilt_content += "\n"
 
-            guidelines_path.parent.mkdir(parents=True, exist_ok=True)
+                if after_section:
+                    if not after_section.startswith("\n"):
+                        rebuilt_content += "\n"
+                    rebuilt_content += after_section
 
-            with NamedTemporaryFile('w', delete=False, dir=str(guidelines_path.parent), encoding='utf-8') as tf:
-                tf.write(content_to_write)
-                temp_name = tf.name
+                content_to_write = rebuilt_content
+                self._logger.debug("Merged existing guidelines content with canonical section")
+            else:
+                existing_body = existing_content.rstrip("\n")
+                guidelines_body = GUIDELINES_CONTENT.rstrip("\n")
 
-            Path(temp_name).replace(guidelines_path)
-            self._logger.info(f"Guidelines file ensured at {guidelines_path}")
-        except (PermissionError, IOError) as file_error:
-            self._logger.warning(f"Could not write guidelines file: {file_error}")
-        except Exception as e:
-            self._logger.warning(f"Unexpected error ensuring guidelines file: {e}")
+                if existing_body:
+                    content_to_write = f"{existing_body}\n\n{guidelines_body}"
+                else:
+                    content_to_write = GUIDELINES_CONTENT
+
+                self._logger.debug("Guidelines marker not found; appending canonical content while preserving existing markdown")
+
+        if not content_to_write.endswith("\n"):
+            content_to_write += "\n"
+
+        return content_to_write
 
     def _get_default_model_settings(self) -> Dict[str, Any]:
         """
@@ -328,79 +647,143 @@ class MCPManager:
             "ui": {"theme": "Default"}
         }
 
+    @timed("MCPManager.load_settings")
     def load_settings(self) -> Dict[str, Any]:
         """
         Load settings from the JSON file.
 
+        The parsed file is cached and validated against (st_mtime_ns, st_size, st_ino)
+        of settings.json, so repeated reads are served from memory while the file is
+        unchanged and re-parsed once after an external write.
+
+        Returns:
+            Dictionary containing the settings (deep copy to prevent external mutation).
+            Callers that only read should use get_settings_snapshot() instead.
+
+        Raises:
+            MCPManagerError: If file cannot be read or parsed
+        """
+        with self._lock:
+            settings = self._load_compacted()
+        with _registry.timer("phase.deepcopy"):
+            return copy.deepcopy(settings)
+
+    @staticmethod
+    def _working_copy(settings: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy the cached settings for a transaction in O(sections) instead of O(file).
+
+        The top level, each section and mcp.allowed are copied; deeper objects such as
+        individual mcpServers entries are shared with the cache, so operations must
+        replace them instead of mutating them in place.
+        """
+        working = {key: value.copy() if isinstance(value, (dict, list)) else value
+                   for key, value in settings.items()}
+        mcp = working.get('mcp')
+        if isinstance(mcp, dict) and isinstance(mcp.get('allowed'), list):
+            mcp['allowed'] = list(mcp['allowed'])
+        return working
+
+    @timed("MCPManager.get_settings_snapshot")
+    def get_settings_snapshot(self) -> FrozenDict:
+        """
+        Get a read-only snapshot of the current settings.
+
+        The snapshot is built once per settings version and shared between callers,
+        so repeated reads do not copy anything. After a change, the frozen
+        mcpServers entries that were not replaced are shared with the previous snapshot.
+
         Returns:
-            Dictionary containing the settings (deep copy to prevent external mutation)
+            FrozenDict view of the settings (nested dicts are FrozenDict, lists are tuples)
 
         Raises:
             MCPManagerError: If file cannot be read or parsed
         """
-        if self._settings_cache is not None:
-            return copy.deepcopy(self._settings_cache)
+        with self._lock:
+            settings = self._load_compacted()
+            if self._snapshot_source is not settings or self._snapshot_version != self._mutation_version:
+                previous = (self._snapshot, self._snapshot_entries) if self._snapshot is not None else None
+                self._snapshot, self._snapshot_entries = freeze_settings(settings, previous)
+                self._snapshot_source = settings
+                self._snapshot_version = self._mutation_version
+            return self._snapshot
+
+    def _load_cached(self) -> Dict[str, Any]:
+        """
+        Return the validated settings cache, (re-)parsing settings.json when needed.
 
+        Inside a transaction the pending working copy is returned instead, so reads
+        observe uncommitted changes. The caller holds self._lock: a transaction keeps
+        it until commit or rollback, so other threads wait and then read the committed
+        cache. The returned dictionary must not be mutated.
+
+        Raises:
+            MCPManagerError: If file cannot be read or parsed
+        """
+        txn = self._txn
+        if txn is not None and txn.owner == threading.get_ident():
+            txn.sync()
+            return txn.settings
+
+        stat_key = self._stat_settings_file()
+        if self._settings_cache is not None and stat_key == self._settings_stat:
+            self._stats["cache_hits"] += 1
+            return self._settings_cache
+
+        self._stats["cache_misses"] += 1
+        self._base_digest = None
         try:
-            if not self.settings_path.exists():
+            if stat_key is None:
                 self._logger.info(f"Settings file not found, creating default structure")
                 default_settings = self._create_default_settings()
                 self._settings_cache = default_settings
-                return copy.deepcopy(self._settings_cache)
-
-            with open(self.settings_path, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-
-            # Validate required structure with strong type checking
-            # mcp
-            if not isinstance(settings.get('mcp'), dict):
-                settings['mcp'] = {'allowed': []}
-            if not isinstance(settings['mcp'].get('allowed'), list):
-                settings['mcp']['allowed'] = []
-            # mcpServers
-            if not isinstance(settings.get('mcpServers'), dict):
-                settings['mcpServers'] = {}
-            else:
-                for name, cfg in list(settings['mcpServers'].items()):
-                    if not isinstance(cfg, dict):
-                        del settings['mcpServers'][name]
-                        continue
-                    cmd = cfg.get('command')
-                    args = cfg.get('args', [])
-                    if not isinstance(cmd, str) or not cmd:
-                        del settings['mcpServers'][name]
-                        continue
-                    if not isinstance(args, list) or any(not isinstance(a, str) for a in args):
-                        cfg['args'] = [str(a) for a in args] if isinstance(args, list) else []
-            # model
-            if not isinstance(settings.get('model'), dict):
-                settings['model'] = self._get_default_model_settings()
-            else:
-                model = settings['model']
-                if not isinstance(model.get('temperature'), (int, float)):
-                    model['temperature'] = 0.7
-                elif model['temperature'] < 0:
-                    model['temperature'] = 0.0
-                elif model['temperature'] > 2:
-                    model['temperature'] = 2.0
-
-            # generationConfig
-            if not isinstance(settings.get('generationConfig'), dict):
-                settings['generationConfig'] = {'temperature': 0.7}
-            else:
-                gen_config = settings['generationConfig']
-                if not isinstance(gen_config.get('temperature'), (int, float)):
-                    gen_config['temperature'] = 0.7
-                elif gen_config['temperature'] < 0:
-                    gen_config['temperature'] = 0.0
-                elif gen_config['temperature'] > 2:
-                    gen_config['temperature'] = 2.0
+                self._settings_stat = None
+                self._cache_validated = True
+                return self._settings_cache
+
+            with _registry.timer("phase.read") as span, open(self.settings_path, 'r', encoding='utf-8') as f:
+                # Key the cache on the file actually read, not on the earlier stat
+                st = os.fstat(f.fileno())
+                settings_key = (st.st_mtime_ns, st.st_size, st.st_ino)
+                raw_text = f.read()
+                span.nbytes = st.st_size
+
+            base_digest = self._digest(raw_text)
+            with _registry.timer("phase.parse", len(raw_text)):
+                settings = json_backend.loads(raw_text)
+
+            with _registry.timer("phase.normalize"):
+                self._normalize_settings(settings)
+
+            # Replay journaled commits made on top of this settings.json
+            with _registry.timer("phase.journal_replay"):
+                journal_key, batches = self._journal().read(base_digest)
+                self._journal_expired = False
+                if batches:
+                    allowed = _AllowedIndex(settings['mcp'])
+                    for batch in batches:
+                        SettingsJournal.apply(settings, batch, allowed)
+                    allowed.sync()
+                    self._logger.debug(f"Replayed {len(batches)} journal records")
+                    if self.journal_enabled:
+                        info = self._journal().info(base_digest)
+                        self._journal_expired = (info is not None
+                                                 and time.time() - info[1] >= self.journal_max_age)
+
+            stat_key = (settings_key, journal_key)
+            self._base_digest = base_digest
+            # Remember what is on disk so identical saves can be skipped
+            self._persisted = None if batches else (stat_key, base_digest)
 
             self._settings_cache = settings
-            return copy.deepcopy(self._settings_cache)
+            self._settings_stat = stat_key
+            # Loaded from disk: the first save runs a full validation
+            self._cache_validated = False
+            return self._settings_cache
 
         except json.JSONDecodeError as e:
-            # Handle corrupt JSON file by renaming it and creating default structure
+            # Handle corrupt JSON file by renaming it and rebuilding the settings from
+            # the default structure plus whatever can still be parsed from it.
             # Try multiple names with incremental/UUID suffix in case of race conditions
             max_attempts = 5
             base_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -421,12 +804,10 @@ class MCPManager:
                     
                     self._logger.warning(f"Corrupt JSON file renamed to: {corrupt_path}")
                     self._logger.info(f"Creating default settings structure due to corrupt JSON: {e}")
-                    
-                    # Create default settings structure
-                    default_settings = self._create_default_settings()
-                    
-                    self._settings_cache = default_settings
-                    return copy.deepcopy(self._settings_cache)
+
+                    self._settings_cache = self._recover_settings(raw_text, str(e), corrupt_path)
+                    self._settings_stat = None
+                    return self._settings_cache
                     
                 except (OSError, PermissionError, shutil.Error) as rename_error:
                     self._logger.warning(f"Attempt {attempt + 1}/{max_attempts} failed to rename corrupt file: {rename_error}")
@@ -442,64 +823,232 @@ class MCPManager:
         except Exception as e:
             raise MCPManagerError(f"Error loading settings: {e}")
 
-    def save_settings(self, settings: Dict[str, Any]) -> bool:
+    def _load_compacted(self) -> Dict[str, Any]:
+        """
+        Like _load_cached(), but first fold a journal older than journal_max_age into
+        settings.json, so an idle manager does not keep replaying an old journal.
+
+        The caller holds self._lock.
+        """
+        settings = self._load_cached()
+        if self._journal_expired and self._txn is None:
+            self._journal_expired = False
+            try:
+                self.flush()
+            except MCPManagerError as e:
+                self._logger.warning(f"Failed to compact settings journal: {e}")
+            self._journal_expired = False
+            settings = self._load_cached()
+        return settings
+
+    def _recover_settings(self, raw_text: str, error: str, corrupt_path: Path) -> Dict[str, Any]:
+        """
+        Build settings from the default structure and the salvageable part of a corrupt file.
+
+        Every complete mcpServers entry, the mcp.allowed names and the top-level
+        sections before the first broken token are kept (see settings_recovery).
+        The result is only cached; it reaches disk with the next save.
+
+        Args:
+            raw_text: Content of the corrupt settings.json
+            error: Strict parser error message
+            corrupt_path: Where the corrupt file was moved
+
+        Returns:
+            The recovered settings dictionary
+        """
+        settings = self._create_default_settings()
+        with _registry.timer("phase.recover", len(raw_text)):
+            salvaged, report = salvage_settings(raw_text, error)
+        report.corrupt_path = str(corrupt_path)
+        self.last_recovery_report = report
+
+        if report.recovered_anything:
+            settings.update(salvaged)
+            self._normalize_settings(settings)
+            self._logger.warning(report.summary())
+            # Salvaged content has not been through validation yet
+            self._cache_validated = False
+        else:
+            self._logger.warning(f"Nothing could be recovered from corrupt settings file: {corrupt_path}")
+            self._cache_validated = True
+        return settings
+
+    def _normalize_settings(self, settings: Dict[str, Any]) -> None:
+        """Repair the structure of freshly parsed settings in place."""
+        # Validate required structure with strong type checking
+        # mcp
+        if not isinstance(settings.get('mcp'), dict):
+            settings['mcp'] = {'allowed': []}
+        if not isinstance(settings['mcp'].get('allowed'), list):
+            settings['mcp']['allowed'] = []
+        else:
+            # Drop repeated (and non-string) names left behind by hand edits, keeping order
+            allowed = settings['mcp']['allowed']
+            deduped = list(dict.fromkeys(name for name in allowed if isinstance(name, str)))
+            if len(deduped) != len(allowed):
+                self._logger.debug(f"Removed {len(allowed) - len(deduped)} duplicate/invalid entries from mcp.allowed")
+                settings['mcp']['allowed'] = deduped
+        # mcpServers
+        if not isinstance(settings.get('mcpServers'), dict):
+            settings['mcpServers'] = {}
+        else:
+            for name, cfg in list(settings['mcpServers'].items()):
+                if not isinstance(cfg, dict):
+                    del settings['mcpServers'][name]
+                    continue
+                cmd = cfg.get('command')
+                args = cfg.get('args', [])
+                if not isinstance(cmd, str) or not cmd:
+                    del settings['mcpServers'][name]
+                    continue
+                if not isinstance(args, list) or any(not isinstance(a, str) for a in args):
+                    cfg['args'] = [str(a) for a in args] if isinstance(args, list) else []
+        # model
+        if not isinstance(settings.get('model'), dict):
+            settings['model'] = self._get_default_model_settings()
+        else:
+            model = settings['model']
+            if not isinstance(model.get('temperature'), (int, float)):
+                model['temperature'] = 0.7
+            elif model['temperature'] < 0:
+                model['temperature'] = 0.0
+            elif model['temperature'] > 2:
+                model['temperature'] = 2.0
+
+        # generationConfig
+        if not isinstance(settings.get('generationConfig'), dict):
+            settings['generationConfig'] = {'temperature': 0.7}
+        else:
+            gen_config = settings['generationConfig']
+            if not isinstance(gen_config.get('temperature'), (int, float)):
+                gen_config['temperature'] = 0.7
+            elif gen_config['temperature'] < 0:
+                gen_config['temperature'] = 0.0
+            elif gen_config['temperature'] > 2:
+                gen_config['temperature'] = 2.0
+
+    @timed("MCPManager.save_settings")
+    def save_settings(self, settings: Dict[str, Any], expected_etag: Optional[str] = None) -> bool:
         """
         Save settings to the JSON file.
 
+        The settings are serialized canonically and hashed; when the digest matches the
+        content last read from or written to an unchanged settings.json, both the write
+        and the guidelines update are skipped. The outcome is available in
+        last_save_result. The write happens under the settings.json lock.
+
         Args:
             settings: Dictionary containing the settings to save
+            expected_etag: Optional value of get_etag() taken when the settings were
+                           loaded; the save is refused if the file changed since then
 
         Returns:
             True if successful
 
         Raises:
+            ConcurrentModificationError: If expected_etag no longer matches the file
             MCPManagerError: If file cannot be written
         """
+        with self._lock, self._exclusive():
+            if expected_etag is not None:
+                current = self._format_etag(self._stat_settings_file())
+                if current != expected_etag:
+                    raise ConcurrentModificationError(
+                        f"Settings file was modified by another writer: {self.settings_path}"
+                    )
+            return self._save_settings(settings)
+
+    @staticmethod
+    def _copy_for_cache(settings: Dict[str, Any]) -> Dict[str, Any]:
+        with _registry.timer("phase.deepcopy"):
+            return copy.deepcopy(settings)
+
+    def _validate_settings(self, settings: Dict[str, Any], touched: Optional[Set[str]] = None) -> None:
+        """
+        Validate the settings structure before saving.
+
+        Args:
+            settings: Settings dictionary to validate
+            touched: Names of the mcpServers entries changed since the last validated
+                     state. None validates every entry (full mode, used for settings
+                     loaded from disk or supplied by callers).
+
+        Raises:
+            MCPManagerError: If the structure is invalid
+        """
+        # Validate required structure with defensive checks
+        if 'mcp' not in settings:
+            raise MCPManagerError("Missing required 'mcp' key in settings")
+        if 'mcpServers' not in settings:
+            raise MCPManagerError("Missing required 'mcpServers' key in settings")
+        if not isinstance(settings['mcp'], dict):
+            raise MCPManagerError("'mcp' must be a dictionary")
+        if not isinstance(settings['mcpServers'], dict):
+            raise MCPManagerError("'mcpServers' must be a dictionary")
+        if not isinstance(settings['mcp'].get('allowed'), list):
+            raise MCPManagerError("'mcp.allowed' must be a list")
+
+        # Validate mcpServers structure
+        mcp_servers = settings['mcpServers']
+        if touched is None:
+            names = mcp_servers.keys()
+        else:
+            names = [name for name in touched if name in mcp_servers]
+        for name in names:
+            cfg = mcp_servers[name]
+            if not isinstance(cfg, dict):
+                raise MCPManagerError(f"MCP '{name}' configuration must be a dictionary")
+            if not isinstance(cfg.get('command'), str) or not cfg.get('command'):
+                raise MCPManagerError(f"MCP '{name}' must have a non-empty 'command' string")
+            if not isinstance(cfg.get('args'), list):
+                raise MCPManagerError(f"MCP '{name}' 'args' must be a list")
+            if any(not isinstance(arg, str) for arg in cfg['args']):
+                raise MCPManagerError(f"MCP '{name}' 'args' must contain only strings")
+
+        # Validate model structure (if present)
+        if 'model' in settings:
+            if not isinstance(settings['model'], dict):
+                raise MCPManagerError("'model' must be a dictionary")
+            if 'temperature' in settings['model']:
+                temp = settings['model']['temperature']
+                if not isinstance(temp, (int, float)):
+                    raise MCPManagerError("'model.temperature' must be a number")
+                if temp < 0 or temp > 2:
+                    raise MCPManagerError("'model.temperature' must be between 0.0 and 2.0")
+
+        # Validate generationConfig structure (if present)
+        if 'generationConfig' in settings:
+            if not isinstance(settings['generationConfig'], dict):
+                raise MCPManagerError("'generationConfig' must be a dictionary")
+            if 'temperature' in settings['generationConfig']:
+                temp = settings['generationConfig']['temperature']
+                if not isinstance(temp, (int, float)):
+                    raise MCPManagerError("'generationConfig.temperature' must be a number")
+                if temp < 0 or temp > 2:
+                    raise MCPManagerError("'generationConfig.temperature' must be between 0.0 and 2.0")
+
+    def _save_settings(self, settings: Dict[str, Any], touched: Optional[Set[str]] = None,
+                       adopt: bool = False) -> bool:
+        """
+        Validate and save settings; see save_settings().
+
+        Args:
+            settings: Dictionary containing the settings to save
+            touched: mcpServers entries changed since the last validated state, or None
+                     for full validation
+            adopt: If True, settings becomes the cache without being copied (the caller
+                   must not use it afterwards)
+
+        Returns:
+            True if successful
+
+        Raises:
+            MCPManagerError: If validation fails or the file cannot be written
+        """
         try:
-            # Validate required structure with defensive checks
-            if 'mcp' not in settings:
-                raise MCPManagerError("Missing required 'mcp' key in settings")
-            if 'mcpServers' not in settings:
-                raise MCPManagerError("Missing required 'mcpServers' key in settings")
-            if not isinstance(settings['mcp'], dict):
-                raise MCPManagerError("'mcp' must be a dictionary")
-            if not isinstance(settings['mcpServers'], dict):
-                raise MCPManagerError("'mcpServers' must be a dictionary")
-            if not isinstance(settings['mcp'].get('allowed'), list):
-                raise MCPManagerError("'mcp.allowed' must be a list")
-
-            # Validate mcpServers structure
-            for name, cfg in settings['mcpServers'].items():
-                if not isinstance(cfg, dict):
-                    raise MCPManagerError(f"MCP '{name}' configuration must be a dictionary")
-                if not isinstance(cfg.get('command'), str) or not cfg.get('command'):
-                    raise MCPManagerError(f"MCP '{name}' must have a non-empty 'command' string")
-                if not isinstance(cfg.get('args'), list):
-                    raise MCPManagerError(f"MCP '{name}' 'args' must be a list")
-                if any(not isinstance(arg, str) for arg in cfg['args']):
-                    raise MCPManagerError(f"MCP '{name}' 'args' must contain only strings")
-
-            # Validate model structure (if present)
-            if 'model' in settings:
-                if not isinstance(settings['model'], dict):
-                    raise MCPManagerError("'model' must be a dictionary")
-                if 'temperature' in settings['model']:
-                    temp = settings['model']['temperature']
-                    if not isinstance(temp, (int, float)):
-                        raise MCPManagerError("'model.temperature' must be a number")
-                    if temp < 0 or temp > 2:
-                        raise MCPManagerError("'model.temperature' must be between 0.0 and 2.0")
-
-            # Validate generationConfig structure (if present)
-            if 'generationConfig' in settings:
-                if not isinstance(settings['generationConfig'], dict):
-                    raise MCPManagerError("'generationConfig' must be a dictionary")
-                if 'temperature' in settings['generationConfig']:
-                    temp = settings['generationConfig']['temperature']
-                    if not isinstance(temp, (int, float)):
-                        raise MCPManagerError("'generationConfig.temperature' must be a number")
-                    if temp < 0 or temp > 2:
-                        raise MCPManagerError("'generationConfig.temperature' must be between 0.0 and 2.0")
+            with _registry.timer("phase.validate"):
+                self._validate_settings(settings, touched)
 
             # Ensure model is initialized with default systemInstruction when missing
             if 'model' not in settings:
@@ -507,19 +1056,51 @@ class MCPManager:
             elif isinstance(settings.get('model'), dict) and 'systemInstruction' not in settings['model']:
                 settings['model']['systemInstruction'] = DEFAULT_SYSTEM_INSTRUCTION
 
+            with _registry.timer("phase.serialize") as span:
+                serialized = json_backend.dumps(settings)
+                encoded = serialized.encode('utf-8')
+                digest = hashlib.sha256(encoded).hexdigest()
+                span.nbytes = len(encoded)
+
+            # Skip the write when the file on disk already holds exactly this content
+            current_stat = self._stat_settings_file()
+            if current_stat is not None and self._persisted == (current_stat, digest):
+                self._settings_cache = settings if adopt else self._copy_for_cache(settings)
+                self._settings_stat = current_stat
+                self._cache_validated = True
+                self._stats["settings_writes_avoided"] += 1
+                self.last_save_result = SaveResult(saved=False, bytes_written=0, digest=digest)
+                self._logger.debug("Settings unchanged, skipping write")
+                return True
+
             # Ensure target directory exists
             self.settings_path.parent.mkdir(parents=True, exist_ok=True)
 
             # Write to temp file in same directory
-            with NamedTemporaryFile('w', delete=False, dir=str(self.settings_path.parent), encoding='utf-8') as tf:
-                json.dump(settings, tf, indent=2, ensure_ascii=False)
-                temp_name = tf.name
+            with _registry.timer("phase.temp_write", len(encoded)):
+                with NamedTemporaryFile('w', delete=False, dir=str(self.settings_path.parent), encoding='utf-8') as tf:
+                    tf.write(serialized)
+                    temp_name = tf.name
 
             # Atomic replace
-            Path(temp_name).replace(self.settings_path)
+            with _registry.timer("phase.replace"):
+                Path(temp_name).replace(self.settings_path)
+            self._base_digest = digest
 
-            # Update cache
-            self._settings_cache = copy.deepcopy(settings)
+            # The new settings.json includes every journaled change
+            if self._journal().remove():
+                self._stats["journal_compactions"] += 1
+
+            # Update cache, keyed on the file we just wrote
+            self._settings_cache = settings if adopt else self._copy_for_cache(settings)
+            self._settings_stat = self._stat_settings_file()
+            self._cache_validated = True
+            self._persisted = (self._settings_stat, digest)
+
+            bytes_written = len(encoded)
+            self._stats["settings_writes"] += 1
+            self._stats["bytes_written"] += bytes_written
+            self.last_save_result = SaveResult(saved=True, bytes_written=bytes_written, digest=digest)
 
             # Ensure guidelines file is created or updated alongside settings
             try:
@@ -527,6 +1108,12 @@ class MCPManager:
             except Exception as guidelines_error:
                 self._logger.warning(f"Failed to ensure guidelines file: {guidelines_error}")
 
+            if self.snapshots_enabled:
+                try:
+                    self._record_snapshot(encoded, digest, "save")
+                except Exception as snapshot_error:
+                    self._logger.warning(f"Failed to record settings snapshot: {snapshot_error}")
+
             self._logger.info("Settings saved successfully")
             return True
 
@@ -537,6 +1124,365 @@ class MCPManager:
         except Exception as e:
             raise MCPManagerError(f"Error saving settings: {e}")
 
+    def _snapshot_store(self) -> SnapshotStore:
+        """Return the snapshot store of the current CLI directory."""
+        root = self.settings_path.parent / SNAPSHOT_DIR_NAME
+        if self._snapshot_store_cache is None or self._snapshot_store_cache.root != root:
+            self._snapshot_store_cache = SnapshotStore(root)
+        return self._snapshot_store_cache
+
+    def _record_snapshot(self, settings_data: Optional[bytes], settings_digest: Optional[str],
+                         reason: str) -> Optional[Snapshot]:
+        """
+        Snapshot settings.json and the guidelines file, then apply the retention policy.
+
+        Args:
+            settings_data: settings.json content, or None to read it from disk
+            settings_digest: SHA-256 of settings_data if already known
+            reason: Stored in the manifest
+
+        Returns:
+            The new snapshot, or None if nothing changed since the latest one
+        """
+        files = {}
+        digests = {}
+        with _registry.timer("phase.snapshot") as span:
+            if settings_data is None:
+                try:
+                    settings_data = self.settings_path.read_bytes()
+                except FileNotFoundError:
+                    settings_data = None
+            if settings_data is not None:
+                files[self.settings_path.name] = settings_data
+                if settings_digest is not None:
+                    digests[self.settings_path.name] = settings_digest
+            guidelines_path = self._guidelines_path()
+            try:
+                files[guidelines_path.name] = guidelines_path.read_bytes()
+            except FileNotFoundError:
+                pass
+            if not files:
+                return None
+
+            store = self._snapshot_store()
+            snapshot = store.create(files, reason, digests)
+            if snapshot is None:
+                return None
+            span.nbytes = sum(len(data) for data in files.values())
+            self._stats["snapshots_created"] += 1
+            if store.needs_pruning(self.snapshot_keep_last, self.snapshot_max_age):
+                store.prune(self.snapshot_keep_last, self.snapshot_max_age)
+        self._logger.debug(f"Recorded settings snapshot {snapshot.id}")
+        return snapshot
+
+    @timed("MCPManager.create_snapshot")
+    def create_snapshot(self, reason: str = "checkpoint") -> Optional[Snapshot]:
+        """
+        Record a snapshot of settings.json and the guidelines file as they are now.
+
+        Works whether or not automatic snapshots are enabled, so callers can take
+        a checkpoint before a bulk change and restore_snapshot() it afterwards.
+
+        Args:
+            reason: Stored in the manifest
+
+        Returns:
+            The new snapshot, or None if nothing changed since the latest one
+
+        Raises:
+            MCPManagerError: If called inside a transaction, or the snapshot cannot be written
+        """
+        with self._lock:
+            if self._txn is not None:
+                raise MCPManagerError("Cannot create a snapshot inside a transaction")
+            # Materialize pending journal records so the snapshot has them
+            self.flush()
+            with self._exclusive():
+                try:
+                    return self._record_snapshot(None, None, reason)
+                except OSError as e:
+                    raise MCPManagerError(f"Error creating snapshot: {e}")
+
+    @timed("MCPManager.list_snapshots")
+    def list_snapshots(self) -> List[Snapshot]:
+        """
+        List the snapshots recorded for the current CLI directory.
+
+        Returns:
+            Snapshots, oldest first
+        """
+        return self._snapshot_store().list()
+
+    @timed("MCPManager.restore_snapshot")
+    def restore_snapshot(self, snapshot_id: str) -> Snapshot:
+        """
+        Restore settings.json and the guidelines file from a snapshot.
+
+        The current files are snapshotted first (reason 'pre-restore'), so a restore
+        can itself be undone. Each file is replaced atomically, but not both as one
+        unit: if the second replace fails, the first file is already restored and
+        the 'pre-restore' snapshot brings it back. Any settings journal is discarded.
+
+        Args:
+            snapshot_id: Id of a snapshot returned by list_snapshots()
+
+        Returns:
+            The restored snapshot
+
+        Raises:
+            MCPManagerError: If called inside a transaction, or the snapshot is missing or damaged
+        """
+        with self._lock:
+            if self._txn is not None:
+                raise MCPManagerError("Cannot restore a snapshot inside a transaction")
+            store = self._snapshot_store()
+            try:
+                # Validate before touching anything
+                store.get(snapshot_id)
+            except SnapshotError as e:
+                raise MCPManagerError(str(e))
+            # Materialize pending journal records so the pre-restore snapshot has them
+            self.flush()
+            with self._exclusive():
+                try:
+                    self._record_snapshot(None, None, "pre-restore")
+                    snapshot = store.restore(snapshot_id, self.settings_path.parent)
+                except SnapshotError as e:
+                    raise MCPManagerError(str(e))
+                except OSError as e:
+                    raise MCPManagerError(f"Error restoring snapshot '{snapshot_id}': {e}")
+                self._journal().remove()
+                self._invalidate_cache()
+                self._guidelines_state = None
+        self._logger.info(f"Restored settings snapshot {snapshot_id}")
+        return snapshot
+
+    @contextmanager
+    def transaction(self) -> Iterator["MCPManager"]:
+        """
+        Group several mutations into a single validated, atomic write.
+
+        Inside the block, add_mcp, remove_mcp, update_mcp, toggle_allowed,
+        set_allowed_many, set_temperature and install_from_template are applied
+        to an in-memory copy and reads see the pending changes. On normal exit
+        the settings are saved once; if the block raises, every change is
+        discarded and nothing is written. Nested transactions join the outer one.
+
+        The transaction belongs to the thread that opened it and holds the
+        manager's lock until it ends: reads and transactions from other threads
+        wait for the commit (or rollback) and never see the pending changes.
+
+        The commit takes the settings.json lock. If another writer replaced the
+        file since the transaction started, the recorded operations are re-applied
+        on top of the new content instead of overwriting it.
+
+        Example:
+            with manager.transaction():
+                manager.add_mcp("a", "npx", ["-y", "a"])
+                manager.toggle_allowed("a", True)
+
+        Raises:
+            ConcurrentModificationError: If the operations conflict with a concurrent write
+            MCPManagerError: If the commit fails
+        """
+        with self._lock:
+            if self._txn is not None:
+                self._txn.depth += 1
+                try:
+                    yield self
+                finally:
+                    self._txn.depth -= 1
+                return
+
+            settings = self._working_copy(self._load_cached())
+            self._txn = _Transaction(settings, self._cache_validated, self._settings_stat)
+            try:
+                yield self
+                txn = self._txn
+                self._txn = None
+                txn.sync()
+                if txn.dirty:
+                    self._commit(txn)
+            finally:
+                if self._txn is not None:
+                    self._logger.debug("Transaction rolled back")
+                self._txn = None
+                self._mutation_version += 1
+
+    def _commit(self, txn: _Transaction) -> None:
+        """Write a finished transaction under the file lock, rebasing it if the file moved on."""
+        with self._exclusive():
+            if self._stat_settings_file() != txn.etag:
+                txn = self._rebase(txn)
+            touched = txn.touched if txn.base_validated else None
+            if self._journal_has_room():
+                # A transaction that ended where it started must not grow the journal
+                if txn.settings == self._settings_cache:
+                    self._stats["settings_writes_avoided"] += 1
+                    self._logger.debug("Settings unchanged, skipping journal append")
+                    return
+                self._append_journal(txn, touched)
+            else:
+                self._save_settings(txn.settings, touched, adopt=True)
+
+    def _journal_has_room(self) -> bool:
+        """True if a commit should be appended to the journal instead of rewriting settings.json."""
+        if not self.journal_enabled or self._base_digest is None:
+            return False
+        info = self._journal().info(self._base_digest)
+        if info is None:
+            return True
+        size, created = info
+        return size < self.journal_max_bytes and time.time() - created < self.journal_max_age
+
+    def _append_journal(self, txn: _Transaction, touched: Optional[Set[str]]) -> None:
+        """
+        Validate a transaction and append its effects to the journal.
+
+        Raises:
+            MCPManagerError: If validation or the append fails
+        """
+        try:
+            with _registry.timer("phase.validate"):
+                self._validate_settings(txn.settings, touched)
+            with _registry.timer("phase.journal_append") as span:
+                bytes_written = self._journal().append(txn.effects, self._base_digest)
+                span.nbytes = bytes_written
+        except MCPManagerError:
+            raise
+        except Exception as e:
+            raise MCPManagerError(f"Error writing settings journal: {e}")
+
+        self._settings_cache = txn.settings
+        self._settings_stat = self._stat_settings_file()
+        self._cache_validated = True
+        self._persisted = None
+        self._stats["journal_appends"] += 1
+        self._stats["bytes_written"] += bytes_written
+        self._logger.debug(f"Appended {len(txn.effects)} changes to settings journal")
+
+    @timed("MCPManager.flush")
+    def flush(self) -> bool:
+        """
+        Materialize the journal into settings.json and remove it.
+
+        Returns:
+            True if settings.json was rewritten, False if there was nothing to compact
+
+        Raises:
+            MCPManagerError: If the settings cannot be written
+        """
+        with self._lock, self._exclusive():
+            journal = self._journal()
+            if self._stat_file(journal.path) is None:
+                return False
+            self._invalidate_cache()
+            settings = copy.deepcopy(self._load_cached())
+            self._save_settings(settings, adopt=True)
+            # A journal for another base is not part of settings; drop it as well
+            if journal.remove():
+                self._stats["journal_compactions"] += 1
+                self._settings_stat = self._stat_settings_file()
+                self._persisted = None
+            return True
+
+    def _rebase(self, txn: _Transaction) -> _Transaction:
+        """
+        Re-apply the operations of txn on top of the current settings.json.
+
+        Raises:
+            ConcurrentModificationError: If an operation no longer applies (e.g. the
+                                         MCP was removed or added by the other writer)
+        """
+        self._logger.info("Settings file changed since the transaction started, re-applying changes")
+        self._stats["conflicts_rebased"] += 1
+        self._invalidate_cache()
+        base = self._working_copy(self._load_cached())
+        replay = _Transaction(base, self._cache_validated, self._settings_stat)
+        self._txn = replay
+        try:
+            for op, args, touched, entities in txn.ops:
+                self._apply_op(replay, op, args, touched, entities)
+            replay.sync()
+        except MCPManagerError as e:
+            raise ConcurrentModificationError(
+                f"Changes conflict with a concurrent update of {self.settings_path}: {e}"
+            )
+        finally:
+            self._txn = None
+        return replay
+
+    def _allowed_index(self, settings: Dict[str, Any]) -> _AllowedIndex:
+        """
+        Return the allowed-set index for the working settings of the current transaction.
+
+        The index is built once per transaction, so bulk enable/disable is linear.
+        """
+        txn = self._txn
+        if txn is not None and txn.allowed is not None and txn.allowed.covers(settings):
+            return txn.allowed
+        index = _AllowedIndex(settings.setdefault('mcp', {}))
+        if txn is not None:
+            txn.allowed = index
+        return index
+
+    def _allowed_names(self, snapshot: FrozenDict) -> frozenset:
+        """
+        Return the enabled MCP names of a snapshot as a set, for O(1) membership.
+
+        The set is cached for as long as the snapshot shares the same allowed tuple.
+        """
+        allowed = snapshot.get('mcp', {}).get('allowed', ())
+        cached = self._allowed_set_cache
+        if cached is None or cached[0] is not allowed:
+            cached = (allowed, frozenset(allowed))
+            self._allowed_set_cache = cached
+        return cached[1]
+
+    def _mutate(self, op, *args, touched: tuple = (), entities: tuple = ()) -> Any:
+        """
+        Apply a mutation operation inside a (possibly implicit) transaction.
+
+        Args:
+            op: Callable receiving the working settings dict followed by *args
+            *args: Operation arguments
+            touched: Names of the mcpServers entries the operation changes, so only
+                     those are re-validated on commit
+            entities: What the operation may change, for the journal:
+                      ("server", name), ("allow", name) or ("set", (key, ...))
+
+        Returns:
+            The value returned by op
+        """
+        with self.transaction():
+            result = self._apply_op(self._txn, op, args, touched, entities)
+            self._txn.dirty = True
+            self._mutation_version += 1
+            return result
+
+    def _apply_op(self, txn: _Transaction, op, args: tuple, touched: tuple, entities: tuple) -> Any:
+        """Run op on the working settings of txn and record it for replay and the journal."""
+        settings = txn.settings
+        result = op(settings, *args)
+        txn.ops.append((op, args, touched, entities))
+        txn.touched.update(touched)
+
+        if not self.journal_enabled:
+            return result
+
+        # Journal records hold the state right after the operation
+        for kind, key in entities:
+            if kind == "server":
+                config = settings.get('mcpServers', {}).get(key)
+                txn.effects.append(["server", key, copy.deepcopy(config)])
+            elif kind == "allow":
+                txn.effects.append(["allow", key, key in self._allowed_index(settings)])
+            else:
+                value = settings
+                for part in key:
+                    value = value.get(part) if isinstance(value, dict) else None
+                txn.effects.append(["set", list(key), copy.deepcopy(value)])
+        return result
 
     def _validate_and_normalize_user_path(self, user_base_path: str) -> Path:
         """
@@ -580,7 +1526,7 @@ class MCPManager:
                 )
 
         try:
-            config_manager = ConfigManager()
+            config_manager = self._config_manager()
             checker = getattr(config_manager, "_check_write_permission", None)
         except Exception as e:
             checker = None
@@ -601,6 +1547,7 @@ class MCPManager:
 
         return normalized
 
+    @timed("MCPManager.get_mcps")
     def get_mcps(self) -> Dict[str, Dict[str, Any]]:
         """
         Get all MCPs with their configuration and enabled status.
@@ -615,21 +1562,22 @@ class MCPManager:
                 }
             }
         """
-        settings = self.load_settings()
+        settings = self.get_settings_snapshot()
         result = {}
 
         mcp_servers = settings.get('mcpServers', {})
-        allowed_list = settings.get('mcp', {}).get('allowed', [])
+        allowed_list = self._allowed_names(settings)
 
         for name, config in mcp_servers.items():
             result[name] = {
                 'command': config.get('command', ''),
-                'args': config.get('args', []),
+                'args': list(config.get('args', ())),
                 'enabled': name in allowed_list
             }
 
         return result
 
+    @timed("MCPManager.get_templates")
     def get_templates(self) -> Dict[str, Dict[str, Any]]:
         """
         Get all available MCP templates.
@@ -645,8 +1593,9 @@ class MCPManager:
                 }
             }
         """
-        return copy.deepcopy(MCP_TEMPLATES)
+        return copy.deepcopy(self.template_catalog.all())
 
+    @timed("MCPManager.add_mcp")
     def add_mcp(self, name: str, command: str, args: List[str]) -> bool:
         """
         Add a new MCP server configuration.
@@ -674,23 +1623,25 @@ class MCPManager:
         if any(not isinstance(a, str) for a in args):
             args = [str(a) for a in args]
 
-        settings = self.load_settings()
+        self._mutate(self._op_add_mcp, name, command, args, touched=(name,),
+                     entities=(("server", name),))
+        self._logger.info(f"Added MCP '{name}'")
+        return True
 
+    @staticmethod
+    def _op_add_mcp(settings: Dict[str, Any], name: str, command: str, args: List[str]) -> None:
+        """Add an MCP entry to the working settings."""
         # Check if MCP already exists
         if name in settings.get('mcpServers', {}):
             raise MCPManagerError(f"MCP '{name}' already exists")
 
-        # Add new MCP
+        # Copy args: the settings may be adopted as the cache, and the caller keeps its list
         settings.setdefault('mcpServers', {})[name] = {
             'command': command,
-            'args': args
+            'args': list(args)
         }
 
-        # Save settings
-        self.save_settings(settings)
-        self._logger.info(f"Added MCP '{name}'")
-        return True
-
+    @timed("MCPManager.remove_mcp")
     def remove_mcp(self, name: str) -> bool:
         """
         Remove an MCP server configuration.
@@ -704,8 +1655,12 @@ class MCPManager:
         Raises:
             MCPManagerError: If MCP doesn't exist
         """
-        settings = self.load_settings()
+        self._mutate(self._op_remove_mcp, name, entities=(("server", name), ("allow", name)))
+        self._logger.info(f"Removed MCP '{name}'")
+        return True
 
+    def _op_remove_mcp(self, settings: Dict[str, Any], name: str) -> None:
+        """Remove an MCP entry (and its allowed flag) from the working settings."""
         # Check if MCP exists
         if name not in settings.get('mcpServers', {}):
             raise MCPManagerError(f"MCP '{name}' not found")
@@ -714,15 +1669,9 @@ class MCPManager:
         del settings['mcpServers'][name]
 
         # Remove from allowed list if present
-        allowed_list = settings.setdefault('mcp', {}).setdefault('allowed', [])
-        if name in allowed_list:
-            allowed_list.remove(name)
-
-        # Save settings
-        self.save_settings(settings)
-        self._logger.info(f"Removed MCP '{name}'")
-        return True
+        self._allowed_index(settings).discard(name)
 
+    @timed("MCPManager.toggle_allowed")
     def toggle_allowed(self, name: str, enabled: Optional[bool] = None) -> bool:
         """
         Toggle or set the allowed status of an MCP server.
@@ -737,14 +1686,22 @@ class MCPManager:
         Raises:
             MCPManagerError: If MCP doesn't exist
         """
-        settings = self.load_settings()
+        with self.transaction():
+            if enabled is None:
+                # Resolve the toggle now so a replay after a concurrent write keeps its meaning
+                enabled = name not in self._allowed_index(self._txn.settings)
+            new_state = self._mutate(self._op_toggle_allowed, name, enabled, entities=(("allow", name),))
+        self._logger.info(f"Set MCP '{name}' enabled state to: {new_state}")
+        return new_state
 
+    def _op_toggle_allowed(self, settings: Dict[str, Any], name: str, enabled: Optional[bool]) -> bool:
+        """Toggle or set the allowed flag of an MCP in the working settings."""
         # Check if MCP exists
         if name not in settings.get('mcpServers', {}):
             raise MCPManagerError(f"MCP '{name}' not found")
 
-        allowed_list = settings.setdefault('mcp', {}).setdefault('allowed', [])
-        current_state = name in allowed_list
+        allowed = self._allowed_index(settings)
+        current_state = name in allowed
 
         # Determine new state
         if enabled is None:
@@ -753,16 +1710,14 @@ class MCPManager:
             new_state = enabled
 
         # Update allowed list
-        if new_state and not current_state:
-            allowed_list.append(name)
-        elif not new_state and current_state:
-            allowed_list.remove(name)
+        if new_state:
+            allowed.add(name)
+        else:
+            allowed.discard(name)
 
-        # Save settings
-        self.save_settings(settings)
-        self._logger.info(f"Set MCP '{name}' enabled state to: {new_state}")
         return new_state
 
+    @timed("MCPManager.set_allowed_many")
     def set_allowed_many(self, names_to_enable: List[str], names_to_disable: List[str]) -> bool:
         """
         Enable/disable multiple MCPs at once.
@@ -777,9 +1732,15 @@ class MCPManager:
         Raises:
             MCPManagerError: If any MCP doesn't exist
         """
-        settings = self.load_settings()
+        entities = tuple(("allow", name) for name in names_to_enable + names_to_disable)
+        self._mutate(self._op_set_allowed_many, names_to_enable, names_to_disable, entities=entities)
+        self._logger.info(f"Updated {len(names_to_enable)} enabled and {len(names_to_disable)} disabled MCPs")
+        return True
+
+    def _op_set_allowed_many(self, settings: Dict[str, Any], names_to_enable: List[str],
+                             names_to_disable: List[str]) -> None:
+        """Enable/disable several MCPs in the working settings."""
         mcp_servers = settings.get('mcpServers', {})
-        allowed_list = settings.setdefault('mcp', {}).setdefault('allowed', [])
 
         # Validate all MCPs exist
         all_names = set(names_to_enable + names_to_disable)
@@ -787,24 +1748,19 @@ class MCPManager:
             if name not in mcp_servers:
                 raise MCPManagerError(f"MCP '{name}' not found")
 
-        # Apply changes in memory
+        allowed = self._allowed_index(settings)
+
         # Enable MCPs
         for name in names_to_enable:
-            if name not in allowed_list:
-                allowed_list.append(name)
+            if allowed.add(name):
                 self._logger.debug(f"Enabled MCP '{name}'")
 
         # Disable MCPs
         for name in names_to_disable:
-            if name in allowed_list:
-                allowed_list.remove(name)
+            if allowed.discard(name):
                 self._logger.debug(f"Disabled MCP '{name}'")
 
-        # Save settings once
-        self.save_settings(settings)
-        self._logger.info(f"Updated {len(names_to_enable)} enabled and {len(names_to_disable)} disabled MCPs")
-        return True
-
+    @timed("MCPManager.get_mcp_details")
     def get_mcp_details(self, name: str) -> Optional[Dict[str, Any]]:
         """
         Get details of a specific MCP server.
@@ -821,10 +1777,10 @@ class MCPManager:
                 "enabled": True/False
             }
         """
-        settings = self.load_settings()
+        settings = self.get_settings_snapshot()
 
         mcp_servers = settings.get('mcpServers', {})
-        allowed_list = settings.get('mcp', {}).get('allowed', [])
+        allowed_list = self._allowed_names(settings)
 
         if name not in mcp_servers:
             return None
@@ -833,10 +1789,11 @@ class MCPManager:
         return {
             'name': name,
             'command': config.get('command', ''),
-            'args': config.get('args', []),
+            'args': list(config.get('args', ())),
             'enabled': name in allowed_list
         }
 
+    @timed("MCPManager.update_mcp")
     def update_mcp(self, name: str, command: Optional[str] = None,
                    args: Optional[List[str]] = None) -> bool:
         """
@@ -853,33 +1810,39 @@ class MCPManager:
         Raises:
             MCPManagerError: If MCP doesn't exist or parameters are invalid
         """
-        settings = self.load_settings()
-
-        # Check if MCP exists
-        if name not in settings.get('mcpServers', {}):
-            raise MCPManagerError(f"MCP '{name}' not found")
-
         # Validate parameters if provided
         if command is not None and (not command or not isinstance(command, str)):
             raise MCPManagerError("MCP command must be a non-empty string")
         if args is not None and not isinstance(args, list):
             raise MCPManagerError("MCP args must be a list")
 
-        # Update configuration
-        config = settings['mcpServers'][name]
-        if command is not None:
-            config['command'] = command
         if args is not None:
             # Validate and coerce args elements to strings (consistent with load_settings behavior)
             if any(not isinstance(a, str) for a in args):
                 args = [str(a) for a in args]
-            config['args'] = args
 
-        # Save settings
-        self.save_settings(settings)
+        self._mutate(self._op_update_mcp, name, command, args, touched=(name,),
+                     entities=(("server", name),))
         self._logger.info(f"Updated MCP '{name}'")
         return True
 
+    @staticmethod
+    def _op_update_mcp(settings: Dict[str, Any], name: str, command: Optional[str],
+                       args: Optional[List[str]]) -> None:
+        """Update the command and/or args of an MCP in the working settings."""
+        # Check if MCP exists
+        if name not in settings.get('mcpServers', {}):
+            raise MCPManagerError(f"MCP '{name}' not found")
+
+        # Replace the entry: it may be shared with the cached settings
+        config = dict(settings['mcpServers'][name])
+        settings['mcpServers'][name] = config
+        if command is not None:
+            config['command'] = command
+        if args is not None:
+            config['args'] = list(args)
+
+    @timed("MCPManager.install_from_template")
     def install_from_template(self, template_name: str, enable: bool = True, skip_dependency_check: bool = False) -> bool:
         """
         Install an MCP from a predefined template.
@@ -895,16 +1858,13 @@ class MCPManager:
         Raises:
             MCPManagerError: If template doesn't exist, MCP already exists, or dependencies are missing
         """
-        # Check if template exists
-        if template_name not in MCP_TEMPLATES:
-            raise MCPManagerError(f"Template '{template_name}' not found")
-
         # Get template configuration
-        template = MCP_TEMPLATES[template_name]
+        template = self.template_catalog.get(template_name)
+        if template is None:
+            raise MCPManagerError(f"Template '{template_name}' not found")
 
         # Check if MCP already exists based on template['name']
-        mcps = self.get_mcps()
-        if template["name"] in mcps:
+        if template["name"] in self.get_settings_snapshot().get('mcpServers', {}):
             raise MCPManagerError(f"MCP '{template['name']}' already exists")
 
         # Check dependencies unless explicitly skipped
@@ -914,16 +1874,17 @@ class MCPManager:
                 dep_list = ", ".join(missing_deps)
                 raise MCPManagerError(f"Dependências ausentes: {dep_list}. Instale as dependências antes de continuar.")
 
-        # Install MCP
-        self.add_mcp(template["name"], template["command"], template["args"])
+        # Install and enable in a single write
+        with self.transaction():
+            self.add_mcp(template["name"], template["command"], list(template["args"]))
 
-        # Enable if requested
-        if enable:
-            self.toggle_allowed(template["name"], True)
+            if enable:
+                self.toggle_allowed(template["name"], True)
 
         self._logger.info(f"Installed MCP '{template_name}' from template")
         return True
 
+    @timed("MCPManager.is_template_installed")
     def is_template_installed(self, template_name: str) -> bool:
         """
         Check if a template is already installed.
@@ -934,13 +1895,47 @@ class MCPManager:
         Returns:
             True if the MCP from this template is installed
         """
-        if template_name not in MCP_TEMPLATES:
+        template = self.template_catalog.get(template_name)
+        if template is None:
             return False
 
-        template = MCP_TEMPLATES[template_name]
-        mcps = self.get_mcps()
-        return template["name"] in mcps
+        return template["name"] in self.get_settings_snapshot().get('mcpServers', {})
+
+    @timed("MCPManager.get_templates_status")
+    def get_templates_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the installation and dependency status of every template at once.
+
+        Reads one settings snapshot and resolves all template commands in a
+        single PATH index lookup, instead of calling is_template_installed()
+        and get_missing_dependencies() per template.
+
+        Returns:
+            Dictionary in catalog order, e.g.:
+            {
+                "context7": {
+                    "template": {...},                  # copy of the template
+                    "installed": bool,                  # MCP already in settings.json
+                    "missing_dependencies": List[str]   # commands not found on PATH
+                }
+            }
+        """
+        templates = self.template_catalog.all()
+        installed = self.get_settings_snapshot().get('mcpServers', {})
+        commands = [template.get('command') for template in templates.values() if template.get('command')]
+        available = self.check_commands_availability(commands)
+
+        status = {}
+        for name, template in templates.items():
+            command = template.get('command')
+            status[name] = {
+                "template": copy.deepcopy(template),
+                "installed": template.get("name", name) in installed,
+                "missing_dependencies": [command] if command and not available[command] else [],
+            }
+        return status
 
+    @timed("MCPManager.refresh_settings_path")
     def refresh_settings_path(self, settings_path: Optional[str] = None, user_base_path: Optional[str] = None) -> None:
         """
         Refresh the settings path by reloading from ConfigManager or using provided path.
@@ -961,12 +1956,7 @@ class MCPManager:
         """
         try:
             # Use external config manager if available, otherwise create new one
-            if self._external_config_manager is not None:
-                config_manager = self._external_config_manager
-                self._logger.debug("Using external ConfigManager for refresh")
-            else:
-                config_manager = ConfigManager()
-                self._logger.debug("Created new ConfigManager for refresh")
+            config_manager = self._config_manager()
 
             cli_type = config_manager.get_cli_type()
             cli_dir = f".{cli_type}"
@@ -999,11 +1989,15 @@ class MCPManager:
             self._logger.info("Execute `python setup_user_path.py` para configurar o caminho do usuário")
 
         # Clear cache to force reload
-        self._settings_cache = None
+        self._invalidate_cache()
 
+    @timed("MCPManager.check_command_availability")
     def check_command_availability(self, command: str) -> bool:
         """
         Check if a command is available in the system PATH.
+
+        Lookups go through a cached index of the PATH directories (see
+        executable_index) instead of searching PATH on every call.
         
         Args:
             command: The command to check (e.g., 'npx', 'uvx')
@@ -1011,8 +2005,23 @@ class MCPManager:
         Returns:
             True if the command is available, False otherwise
         """
-        return shutil.which(command) is not None
+        return _executable_index.resolve(command) is not None
+
+    @timed("MCPManager.check_commands_availability")
+    def check_commands_availability(self, commands: List[str]) -> Dict[str, bool]:
+        """
+        Check several commands against the system PATH in one pass.
+
+        Args:
+            commands: Commands to check
+
+        Returns:
+            {command: True if available}
+        """
+        return {command: path is not None
+                for command, path in _executable_index.resolve_many(commands).items()}
 
+    @timed("MCPManager.get_missing_dependencies")
     def get_missing_dependencies(self, template_name: str) -> List[str]:
         """
         Get list of missing dependencies for a template.
@@ -1026,10 +2035,10 @@ class MCPManager:
         Raises:
             MCPManagerError: If template doesn't exist
         """
-        if template_name not in MCP_TEMPLATES:
+        template = self.template_catalog.get(template_name)
+        if template is None:
             raise MCPManagerError(f"Template '{template_name}' not found")
         
-        template = MCP_TEMPLATES[template_name]
         command = template.get('command')
         
         if not command:
@@ -1041,6 +2050,7 @@ class MCPManager:
         
         return missing
 
+    @timed("MCPManager.get_temperature")
     def get_temperature(self) -> float:
         """
         Get the current temperature setting.
@@ -1048,7 +2058,7 @@ class MCPManager:
         Returns:
             The current temperature value (0.0 to 2.0)
         """
-        settings = self.load_settings()
+        settings = self.get_settings_snapshot()
         
         # Try to read from model.temperature first (for backward compatibility)
         model_temp = settings.get('model', {}).get('temperature')
@@ -1063,6 +2073,7 @@ class MCPManager:
         # Default fallback
         return 0.7
 
+    @timed("MCPManager.set_temperature")
     def set_temperature(self, temperature: float) -> bool:
         """
         Set the temperature value.
@@ -1084,12 +2095,18 @@ class MCPManager:
         if temperature < 0.0 or temperature > 2.0:
             raise MCPManagerError("Temperature must be between 0.0 and 2.0")
 
-        settings = self.load_settings()
+        self._mutate(self._op_set_temperature, temperature,
+                     entities=(("set", ("model", "temperature")), ("set", ("generationConfig", "temperature"))))
+        self._logger.info(f"Temperature set to: {temperature}")
+        return True
 
+    @staticmethod
+    def _op_set_temperature(settings: Dict[str, Any], temperature: float) -> None:
+        """Set model.temperature and generationConfig.temperature in the working settings."""
         # Ensure model section exists
         if 'model' not in settings:
             settings['model'] = {}
-            
+
         # Ensure generationConfig section exists
         if 'generationConfig' not in settings:
             settings['generationConfig'] = {}
@@ -1097,11 +2114,7 @@ class MCPManager:
         settings['model']['temperature'] = temperature
         settings['generationConfig']['temperature'] = temperature
 
-        # Save settings
-        self.save_settings(settings)
-        self._logger.info(f"Temperature set to: {temperature}")
-        return True
-
+    @timed("MCPManager.is_temperature_zero")
     def is_temperature_zero(self) -> bool:
         """
         Check if temperature is set to 0.0.
@@ -1111,6 +2124,7 @@ class MCPManager:
         """
         return abs(self.get_temperature() - 0.0) < 0.0001
 
+    @timed("MCPManager.set_temperature_zero")
     def set_temperature_zero(self) -> bool:
         """
         Set temperature to 0.0.
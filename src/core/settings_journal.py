@@ -0,0 +1,182 @@
+"""
+Settings Journal Module
+
+Append-only change log kept next to settings.json ('settings.json.journal').
+Each committed transaction is appended as one JSON line holding its effects,
+so a change costs O(change) instead of rewriting the whole file. The first
+line is a header with the SHA-256 of the settings.json content the journal
+applies to; once settings.json is rewritten (compaction) the header no longer
+matches and the journal is ignored until it is removed or restarted.
+
+Effects are state-based, so replaying them in order always reproduces the
+state the writer had:
+
+    ["server", name, config]       # config None: entry removed
+    ["allow", name, enabled]       # add to / remove from mcp.allowed
+    ["set", [key, ...], value]     # nested value (e.g. model.temperature)
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+JOURNAL_VERSION = 1
+
+_logger = logging.getLogger(__name__)
+
+
+def _header_matches(header: Any, base_digest: str) -> bool:
+    return (isinstance(header, dict)
+            and header.get("journal") == JOURNAL_VERSION
+            and header.get("base") == base_digest)
+
+
+class SettingsJournal:
+    """Reads and appends the journal file of one settings.json."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize the journal.
+
+        Args:
+            path: Journal file path (usually '<settings file>.journal')
+        """
+        self.path = Path(path)
+
+    def __repr__(self) -> str:
+        return f"SettingsJournal(path='{self.path}')"
+
+    def read(self, base_digest: Optional[str]) -> Tuple[Optional[tuple], List[List[Any]]]:
+        """
+        Read the effect batches recorded on top of a settings.json version.
+
+        Args:
+            base_digest: SHA-256 of the settings.json text the caller loaded
+
+        Returns:
+            (stat key of the journal file or None, list of effect batches). The list
+            is empty when there is no journal or it belongs to another base.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                st = os.fstat(f.fileno())
+                lines = f.read().split("\n")
+        except FileNotFoundError:
+            return None, []
+
+        stat_key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            header = None
+        if base_digest is None or not _header_matches(header, base_digest):
+            _logger.debug(f"Ignoring journal not based on the current settings file: {self.path}")
+            return stat_key, []
+
+        batches = []
+        for number, line in enumerate(lines[1:], start=2):
+            if not line:
+                continue
+            try:
+                batch = json.loads(line)
+            except ValueError:
+                # Torn write from an interrupted append: that commit never completed
+                _logger.warning(f"Skipping incomplete journal record at line {number} of {self.path}")
+                continue
+            if isinstance(batch, list):
+                batches.append(batch)
+        return stat_key, batches
+
+    def info(self, base_digest: str) -> Optional[Tuple[int, float]]:
+        """
+        Return (size in bytes, creation time) of a journal based on base_digest.
+
+        Returns:
+            None if there is no journal for that base
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                size = os.fstat(f.fileno()).st_size
+                first_line = f.readline()
+            header = json.loads(first_line)
+        except (FileNotFoundError, ValueError):
+            return None
+        if not _header_matches(header, base_digest):
+            return None
+        return size, float(header.get("created", 0.0))
+
+    def append(self, effects: List[List[Any]], base_digest: str) -> int:
+        """
+        Append one batch of effects, starting a new journal if needed.
+
+        A journal for another base is replaced. The caller must hold the
+        settings lock.
+
+        Returns:
+            Number of bytes written
+        """
+        record = json.dumps(effects, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+        if self.info(base_digest) is None:
+            header = json.dumps({"journal": JOURNAL_VERSION, "base": base_digest, "created": time.time()})
+            data = (header + "\n" + record).encode('utf-8')
+            with open(self.path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            return len(data)
+
+        data = record.encode('utf-8')
+        with open(self.path, 'rb+') as f:
+            # Terminate a torn last record so this one starts on its own line
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                data = b"\n" + data
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(data)
+
+    def remove(self) -> bool:
+        """Delete the journal file; returns False if it did not exist."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @staticmethod
+    def apply(settings: Dict[str, Any], batch: List[List[Any]], allowed) -> None:
+        """
+        Apply one batch of effects to settings.
+
+        Args:
+            settings: Settings dictionary to update in place
+            batch: Effects as written by append()
+            allowed: Ordered-set index over settings['mcp']['allowed'] (add/discard)
+        """
+        for effect in batch:
+            if not isinstance(effect, list) or len(effect) != 3:
+                continue
+            kind, key, value = effect
+            if kind == "server":
+                servers = settings.setdefault('mcpServers', {})
+                if value is None:
+                    servers.pop(key, None)
+                else:
+                    servers[key] = value
+            elif kind == "allow":
+                if value:
+                    allowed.add(key)
+                else:
+                    allowed.discard(key)
+            elif kind == "set" and isinstance(key, list) and key:
+                target = settings
+                for part in key[:-1]:
+                    if not isinstance(target.get(part), dict):
+                        target[part] = {}
+                    target = target[part]
+                target[key[-1]] = value
@@ -0,0 +1,235 @@
+"""
+Settings Recovery Module
+
+Tolerant parser for damaged settings.json files. The top-level object is
+scanned member by member with the C JSON decoder, descending into
+``mcpServers`` and ``mcp.allowed`` so every syntactically complete server entry
+and allowed name before the first broken token is kept. Sections located after
+the break are still looked up by key and salvaged the same way; a key match only
+counts at a key position (after '{' or ',' and outside any string), so text that
+merely quotes a section name inside a string value is not mistaken for it.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+_MCP_SERVERS_RE = re.compile(r'"mcpServers"[ \t\n\r]*:[ \t\n\r]*\{')
+_MCP_RE = re.compile(r'"mcp"[ \t\n\r]*:[ \t\n\r]*\{')
+_ESCAPE_RE = re.compile(r'\\.')
+
+# (items parsed, offset of the broken token or None, offset after the closing bracket or None)
+_ScanResult = Tuple[list, Optional[int], Optional[int]]
+
+
+@dataclass
+class RecoveryReport:
+    """What was salvaged from a corrupt settings.json."""
+
+    error: str
+    """The JSONDecodeError raised by the strict parser."""
+    broken_at: Optional[Tuple[int, int]] = None
+    """(line, column) of the first broken token, if the damage was located."""
+    recovered_sections: List[str] = field(default_factory=list)
+    """Top-level keys recovered completely (e.g. 'ide', 'model')."""
+    recovered_servers: List[str] = field(default_factory=list)
+    """mcpServers entries recovered."""
+    recovered_allowed: List[str] = field(default_factory=list)
+    """Names recovered from mcp.allowed."""
+    lost_server: Optional[str] = None
+    """mcpServers entry whose value was cut by the break, if its name was readable."""
+    corrupt_path: Optional[str] = None
+    """Where the damaged file was moved (set by MCPManager)."""
+
+    @property
+    def recovered_anything(self) -> bool:
+        return bool(self.recovered_sections or self.recovered_servers or self.recovered_allowed)
+
+    def summary(self) -> str:
+        """One-line human readable description."""
+        where = f" at line {self.broken_at[0]}, column {self.broken_at[1]}" if self.broken_at else ""
+        lost = f"; entry '{self.lost_server}' and everything after the break were lost" if self.lost_server else ""
+        return (f"Recovered {len(self.recovered_servers)} MCP servers, {len(self.recovered_allowed)} allowed "
+                f"names and {len(self.recovered_sections)} other sections from corrupt settings{where}{lost}")
+
+
+class _Scanner:
+    """Member-by-member scanner over JSON text that stops at the first broken token."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.decoder = json.JSONDecoder()
+        self.error_pos: Optional[int] = None
+        self.pending_key: Optional[str] = None
+
+    def _ws(self, pos: int) -> int:
+        return _WHITESPACE_RE.match(self.text, pos).end()
+
+    def _fail(self, pos: int) -> _ScanResult:
+        if self.error_pos is None or pos > self.error_pos:
+            self.error_pos = pos
+        return [], pos, None
+
+    def value(self, pos: int) -> Tuple[Any, Optional[int], Optional[int]]:
+        try:
+            value, end = self.decoder.raw_decode(self.text, pos)
+        except (ValueError, RecursionError):
+            self._fail(pos)
+            return None, pos, None
+        return value, None, end
+
+    def object_items(self, pos: int,
+                     descend: Optional[Dict[str, Tuple[str, Callable[[int], tuple]]]] = None) -> _ScanResult:
+        """
+        Scan the object starting at pos ('{'); members are (key, value) pairs.
+
+        descend maps a key to (opening bracket, handler): when that member starts
+        with the bracket, handler(pos) scans it and returns (value, error, end), so
+        a broken member still contributes what was parsed before the break.
+        """
+        text = self.text
+        items = []
+        pos = self._ws(pos + 1)
+        if text.startswith("}", pos):
+            return items, None, pos + 1
+
+        while True:
+            if not text.startswith('"', pos):
+                return items, self._fail(pos)[1], None
+            key, error, pos_after_key = self.value(pos)
+            if error is not None:
+                return items, error, None
+            pos = self._ws(pos_after_key)
+            if not text.startswith(":", pos):
+                self.pending_key = key
+                return items, self._fail(pos)[1], None
+            pos = self._ws(pos + 1)
+
+            bracket, handler = descend.get(key, (None, None)) if descend else (None, None)
+            if handler is not None and text.startswith(bracket, pos):
+                sub_value, error, end = handler(pos)
+                items.append((key, sub_value))
+                if error is not None:
+                    return items, error, None
+                pos = end
+            else:
+                value, error, end = self.value(pos)
+                if error is not None:
+                    self.pending_key = key
+                    return items, error, None
+                items.append((key, value))
+                pos = end
+
+            pos = self._ws(pos)
+            if text.startswith(",", pos):
+                pos = self._ws(pos + 1)
+            elif text.startswith("}", pos):
+                return items, None, pos + 1
+            else:
+                return items, self._fail(pos)[1], None
+
+    def array_items(self, pos: int) -> _ScanResult:
+        """Scan the array starting at pos ('[')."""
+        text = self.text
+        items = []
+        pos = self._ws(pos + 1)
+        if text.startswith("]", pos):
+            return items, None, pos + 1
+
+        while True:
+            value, error, end = self.value(pos)
+            if error is not None:
+                return items, error, None
+            items.append(value)
+            pos = self._ws(end)
+            if text.startswith(",", pos):
+                pos = self._ws(pos + 1)
+            elif text.startswith("]", pos):
+                return items, None, pos + 1
+            else:
+                return items, self._fail(pos)[1], None
+
+
+def _find_key(pattern: "re.Pattern[str]", text: str, pos: int) -> Optional["re.Match[str]"]:
+    """
+    Return the first match of pattern at or after pos that sits at a key position.
+
+    JSON strings cannot contain raw newlines, so a match is inside a string when
+    the text between the start of its line and the match holds an odd number of
+    unescaped quotes. A key must also follow '{' or ','.
+    """
+    for match in pattern.finditer(text, pos):
+        start = match.start()
+        line_start = text.rfind("\n", 0, start) + 1
+        if _ESCAPE_RE.sub("", text[line_start:start]).count('"') % 2:
+            continue
+        previous = start - 1
+        while previous >= 0 and text[previous] in " \t\n\r":
+            previous -= 1
+        if previous >= 0 and text[previous] in "{,":
+            return match
+    return None
+
+
+def _line_column(text: str, pos: int) -> Tuple[int, int]:
+    line = text.count("\n", 0, pos) + 1
+    return line, pos - (text.rfind("\n", 0, pos) + 1) + 1
+
+
+def salvage_settings(text: str, error: str = "") -> Tuple[Dict[str, Any], RecoveryReport]:
+    """
+    Recover what can be parsed from damaged settings.json text.
+
+    Args:
+        text: Content of the damaged file
+        error: Description of the strict parser error, stored in the report
+
+    Returns:
+        (partial settings dictionary, RecoveryReport). The dictionary holds only
+        the recovered members and still needs the usual normalization.
+    """
+    report = RecoveryReport(error=error)
+    scanner = _Scanner(text)
+    settings: Dict[str, Any] = {}
+
+    def servers_object(pos: int) -> tuple:
+        scanner.pending_key = None
+        items, error_pos, end = scanner.object_items(pos)
+        if error_pos is not None and report.lost_server is None:
+            report.lost_server = scanner.pending_key
+        return dict(items), error_pos, end
+
+    def mcp_object(pos: int) -> tuple:
+        items, error_pos, end = scanner.object_items(pos, descend={"allowed": ("[", scanner.array_items)})
+        return dict(items), error_pos, end
+
+    start = scanner._ws(0)
+    if text.startswith("{", start):
+        items, _, _ = scanner.object_items(start, descend={"mcpServers": ("{", servers_object),
+                                                           "mcp": ("{", mcp_object)})
+        settings.update(items)
+    first_error = scanner.error_pos
+
+    # Sections that sit after the break are located by key
+    resume = first_error or 0
+    if "mcpServers" not in settings:
+        match = _find_key(_MCP_SERVERS_RE, text, resume)
+        if match:
+            settings["mcpServers"] = servers_object(match.end() - 1)[0]
+    if "mcp" not in settings:
+        match = _find_key(_MCP_RE, text, resume)
+        if match:
+            settings["mcp"] = mcp_object(match.end() - 1)[0]
+
+    if isinstance(settings.get("mcpServers"), dict):
+        report.recovered_servers = list(settings["mcpServers"])
+    mcp = settings.get("mcp")
+    if isinstance(mcp, dict) and isinstance(mcp.get("allowed"), list):
+        report.recovered_allowed = [name for name in mcp["allowed"] if isinstance(name, str)]
+
+    report.recovered_sections = [key for key in settings if key not in ("mcpServers", "mcp")]
+    if first_error is not None:
+        report.broken_at = _line_column(text, first_error)
+    return settings, report
@@ -0,0 +1,290 @@
+"""
+Snapshot Store Module
+
+Content-addressed history of the files MCPManager writes (settings.json and
+Gemini.md/Qwen.md), kept in '.mcp-snapshots' next to them:
+
+    .mcp-snapshots/
+        objects/ab/ab12...   # file contents, named by their SHA-256
+        snapshots/<id>.json  # manifest: {"id", "created", "reason", "files": {name: sha256}}
+
+A file version is stored once no matter how many snapshots reference it, and a
+snapshot identical to the latest one is not recorded at all. Snapshot ids start
+with their UTC creation time, so they sort chronologically. Restoring writes
+each file to a temporary file in the target directory and moves it into place
+with an atomic replace; the files are replaced one after the other, not as a
+single transaction.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Dict, List, Optional
+
+SNAPSHOT_DIR_NAME = ".mcp-snapshots"
+
+_logger = logging.getLogger(__name__)
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot cannot be read or restored."""
+    pass
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One recorded version of the managed files."""
+
+    id: str
+    created: float
+    reason: str
+    files: Dict[str, str]
+    """File name -> SHA-256 of its content."""
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"id": self.id, "created": self.created, "reason": self.reason, "files": dict(self.files)}
+
+
+class SnapshotStore:
+    """Deduplicated snapshot storage rooted at one directory."""
+
+    def __init__(self, root: Path):
+        """
+        Initialize the store.
+
+        Args:
+            root: Store directory (usually '<CLI dir>/.mcp-snapshots'); created on first write
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "snapshots"
+        # Latest manifest, so consecutive identical snapshots are detected without I/O
+        self._latest: Optional[Snapshot] = None
+        self._latest_checked = False
+
+    def __repr__(self) -> str:
+        return f"SnapshotStore(root='{self.root}')"
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """Return the object name (SHA-256 hex digest) of data."""
+        return hashlib.sha256(data).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile('wb', delete=False, dir=str(path.parent)) as tf:
+            tf.write(data)
+            temp_name = tf.name
+        os.replace(temp_name, path)
+
+    def put_object(self, data: bytes, digest: Optional[str] = None) -> str:
+        """
+        Store data unless an object with the same content exists.
+
+        Args:
+            data: File content
+            digest: SHA-256 of data if the caller already computed it
+
+        Returns:
+            The object digest
+        """
+        digest = digest or self.digest(data)
+        path = self._object_path(digest)
+        if not path.exists():
+            self._write_atomic(path, data)
+        return digest
+
+    def read_object(self, digest: str) -> bytes:
+        """
+        Return the content of an object.
+
+        Raises:
+            SnapshotError: If the object is missing or does not match its digest
+        """
+        try:
+            data = self._object_path(digest).read_bytes()
+        except OSError as e:
+            raise SnapshotError(f"Snapshot object {digest} is unreadable: {e}")
+        if self.digest(data) != digest:
+            raise SnapshotError(f"Snapshot object {digest} is damaged")
+        return data
+
+    def latest(self) -> Optional[Snapshot]:
+        """Return the most recent snapshot, or None if there is none."""
+        # Another process may have pruned the remembered manifest
+        if self._latest is not None and not (self.manifests_dir / f"{self._latest.id}.json").exists():
+            self._latest_checked = False
+        if not self._latest_checked:
+            snapshots = self.list()
+            self._latest = snapshots[-1] if snapshots else None
+            self._latest_checked = True
+        return self._latest
+
+    def list(self) -> List[Snapshot]:
+        """Return every snapshot, oldest first."""
+        try:
+            names = sorted(entry.name for entry in os.scandir(self.manifests_dir)
+                           if entry.name.endswith(".json"))
+        except FileNotFoundError:
+            return []
+        snapshots = []
+        for name in names:
+            snapshot = self._read_manifest(self.manifests_dir / name)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+        return snapshots
+
+    def get(self, snapshot_id: str) -> Snapshot:
+        """
+        Return the snapshot with the given id.
+
+        Raises:
+            SnapshotError: If there is no such snapshot
+        """
+        snapshot = None
+        if snapshot_id and not any(sep in snapshot_id for sep in ("/", "\\", "..")):
+            snapshot = self._read_manifest(self.manifests_dir / f"{snapshot_id}.json")
+        if snapshot is None:
+            raise SnapshotError(f"Snapshot '{snapshot_id}' not found")
+        return snapshot
+
+    def _read_manifest(self, path: Path) -> Optional[Snapshot]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return Snapshot(id=str(data["id"]), created=float(data["created"]),
+                            reason=str(data.get("reason", "")), files=dict(data["files"]))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            _logger.warning(f"Ignoring unreadable snapshot manifest {path}: {e}")
+            return None
+
+    def create(self, files: Dict[str, bytes], reason: str = "",
+               digests: Optional[Dict[str, str]] = None) -> Optional[Snapshot]:
+        """
+        Record a snapshot of files.
+
+        Args:
+            files: File name -> content
+            reason: Short description stored in the manifest (e.g. 'save', 'pre-restore')
+            digests: Precomputed SHA-256 of some of the contents
+
+        Returns:
+            The new snapshot, or None if it is identical to the latest one
+        """
+        digests = digests or {}
+        hashes = {name: digests.get(name) or self.digest(data) for name, data in files.items()}
+        latest = self.latest()
+        if latest is not None and latest.files == hashes:
+            return None
+
+        for name, data in files.items():
+            self.put_object(data, hashes[name])
+
+        created = time.time()
+        snapshot_id = (datetime.fromtimestamp(created, timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+                       + "-" + self.digest("".join(sorted(hashes.values())).encode('ascii'))[:8])
+        snapshot = Snapshot(id=snapshot_id, created=created, reason=reason, files=hashes)
+        self._write_atomic(self.manifests_dir / f"{snapshot_id}.json",
+                           json.dumps(snapshot.to_dict(), indent=2).encode('utf-8'))
+        self._latest = snapshot
+        self._latest_checked = True
+        return snapshot
+
+    def restore(self, snapshot_id: str, target_dir: Path) -> Snapshot:
+        """
+        Write the files of a snapshot into target_dir.
+
+        Every object is read and verified before the first file is replaced;
+        each file is then moved into place with its own atomic replace. If a
+        replace fails, the files replaced before it stay restored.
+
+        Raises:
+            SnapshotError: If the snapshot or one of its objects is missing or damaged
+        """
+        snapshot = self.get(snapshot_id)
+        contents = {name: self.read_object(digest) for name, digest in snapshot.files.items()}
+        target_dir = Path(target_dir)
+        try:
+            for name, data in contents.items():
+                self._write_atomic(target_dir / name, data)
+        except OSError as e:
+            raise SnapshotError(f"Could not restore snapshot '{snapshot_id}': {e}")
+        return snapshot
+
+    def prune(self, keep_last: Optional[int] = None, max_age: Optional[float] = None) -> int:
+        """
+        Apply the retention policy and delete objects no snapshot references anymore.
+
+        The most recent snapshot is always kept.
+
+        Args:
+            keep_last: Keep at most this many snapshots
+            max_age: Delete snapshots older than this many seconds
+
+        Returns:
+            Number of snapshots deleted
+        """
+        snapshots = self.list()
+        doomed = set()
+        if keep_last is not None and len(snapshots) > max(keep_last, 1):
+            doomed.update(snapshot.id for snapshot in snapshots[:len(snapshots) - max(keep_last, 1)])
+        if max_age is not None:
+            cutoff = time.time() - max_age
+            doomed.update(snapshot.id for snapshot in snapshots[:-1] if snapshot.created < cutoff)
+        if not doomed:
+            return 0
+
+        for snapshot_id in doomed:
+            try:
+                os.unlink(self.manifests_dir / f"{snapshot_id}.json")
+            except FileNotFoundError:
+                pass
+        referenced = {digest for snapshot in snapshots if snapshot.id not in doomed
+                      for digest in snapshot.files.values()}
+        self._collect_garbage(referenced)
+        _logger.debug(f"Pruned {len(doomed)} snapshots from {self.root}")
+        return len(doomed)
+
+    def _collect_garbage(self, referenced: set) -> None:
+        try:
+            buckets = list(os.scandir(self.objects_dir))
+        except FileNotFoundError:
+            return
+        for bucket in buckets:
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name not in referenced:
+                    try:
+                        os.unlink(entry.path)
+                    except OSError as e:
+                        _logger.debug(f"Could not delete snapshot object {entry.path}: {e}")
+
+    def needs_pruning(self, keep_last: Optional[int], max_age: Optional[float]) -> bool:
+        """Cheaply check (from manifest names) whether prune() would delete anything."""
+        try:
+            names = sorted(entry.name for entry in os.scandir(self.manifests_dir)
+                           if entry.name.endswith(".json"))
+        except FileNotFoundError:
+            return False
+        if keep_last is not None and len(names) > max(keep_last, 1):
+            return True
+        if max_age is not None and len(names) > 1:
+            try:
+                oldest = (datetime.strptime(names[0].split("-", 1)[0], "%Y%m%dT%H%M%S%f")
+                          .replace(tzinfo=timezone.utc).timestamp())
+            except ValueError:
+                return True
+            return oldest < time.time() - max_age
+        return False
@@ -0,0 +1,285 @@
+"""
+Template Catalog Module
+
+MCP templates loaded from JSON files on top of the built-in MCP_TEMPLATES.
+Sources are JSON files or directories of JSON files (every '*.json' directly
+inside, in name order), by default taken from the MCP_TEMPLATES_PATH
+environment variable (separated by os.pathsep). A file may hold:
+
+    {"name": "x", "command": "npx", "args": [...], "description": "..."}   # one template
+    [{...}, {...}]                                                          # a list
+    {"templates": [{...}, ...]}                                             # a wrapped list
+    {"x": {"command": ...}, "y": {...}}                                     # name -> template
+
+Nothing is read until a template is looked up. Parsed files are cached on
+(mtime, size) and directory listings on the directory stat; the sources are
+re-checked (one stat per file and directory) at most every recheck_interval
+seconds, and only changed files are parsed again. The name/command/description
+index used by search() is built once per catalog version for file templates
+and once per template object for built-in ones.
+
+File templates take precedence over built-in ones with the same name. The
+built-in dictionary is consulted live, so changes made to it at runtime are
+visible immediately.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+TEMPLATES_PATH_ENV_VAR = "MCP_TEMPLATES_PATH"
+
+_logger = logging.getLogger(__name__)
+
+
+def _stat_key(path: Path) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _search_text(name: str, template: Mapping[str, Any]) -> str:
+    """Lower-cased text search() matches against: name, command and description."""
+    return " ".join((name, template.get("command", ""), template.get("description", ""))).lower()
+
+
+def _normalize_template(name: Any, raw: Any, source: Path) -> Optional[Dict[str, Any]]:
+    """Validate one template, returning it in the MCP_TEMPLATES shape or None."""
+    if not isinstance(raw, dict):
+        _logger.warning(f"Ignoring template entry that is not an object in {source}")
+        return None
+    name = raw.get("name", name)
+    command = raw.get("command")
+    args = raw.get("args", [])
+    description = raw.get("description", "")
+    if not isinstance(name, str) or not name.strip():
+        _logger.warning(f"Ignoring template without a name in {source}")
+        return None
+    if not isinstance(command, str) or not command.strip():
+        _logger.warning(f"Ignoring template '{name}' without a command in {source}")
+        return None
+    if not isinstance(args, list) or any(not isinstance(arg, str) for arg in args):
+        _logger.warning(f"Ignoring template '{name}' with invalid args in {source}")
+        return None
+    if not isinstance(description, str):
+        description = str(description)
+    template = {"name": name, "command": command, "args": list(args), "description": description}
+    # Keep extra keys (e.g. 'env') so later features can use them
+    for key, value in raw.items():
+        template.setdefault(key, value)
+    return template
+
+
+def parse_templates(data: Any, source: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Extract templates from the parsed content of a catalog file.
+
+    Returns:
+        {template name: template}; invalid entries are skipped with a warning
+    """
+    if isinstance(data, dict) and "templates" in data:
+        data = data["templates"]
+
+    entries: Iterable[Tuple[Any, Any]]
+    if isinstance(data, list):
+        entries = ((None, item) for item in data)
+    elif isinstance(data, dict) and isinstance(data.get("command"), str):
+        entries = [(None, data)]
+    elif isinstance(data, dict):
+        entries = data.items()
+    else:
+        _logger.warning(f"Ignoring template file with unexpected content: {source}")
+        return {}
+
+    templates = {}
+    for name, raw in entries:
+        template = _normalize_template(name, raw, source)
+        if template is not None:
+            templates[template["name"]] = template
+    return templates
+
+
+class TemplateCatalog:
+    """
+    Built-in templates plus the templates found in JSON sources.
+
+    Example:
+        catalog = TemplateCatalog(["/etc/mcp-templates"], builtin=MCP_TEMPLATES)
+        catalog.get("context7")
+        catalog.search("excel")
+    """
+
+    def __init__(self, sources: Optional[List[str]] = None,
+                 builtin: Optional[Mapping[str, Dict[str, Any]]] = None,
+                 recheck_interval: float = 2.0):
+        """
+        Initialize the catalog (nothing is read yet).
+
+        Args:
+            sources: JSON files or directories; defaults to MCP_TEMPLATES_PATH
+            builtin: Templates available without any file (consulted live)
+            recheck_interval: Seconds during which lookups trust the loaded
+                              catalog without re-checking the sources
+        """
+        if sources is None:
+            env_value = os.environ.get(TEMPLATES_PATH_ENV_VAR, "")
+            sources = [part for part in env_value.split(os.pathsep) if part.strip()]
+        self.sources = [Path(source).expanduser() for source in sources]
+        self.builtin = builtin if builtin is not None else {}
+        self.recheck_interval = recheck_interval
+        self._lock = threading.Lock()
+        # file -> (stat key, templates parsed from it)
+        self._files: Dict[Path, Tuple[tuple, Dict[str, Dict[str, Any]]]] = {}
+        # directory -> (stat key, JSON files inside)
+        self._directories: Dict[Path, Tuple[tuple, List[Path]]] = {}
+        self._templates: Dict[str, Dict[str, Any]] = {}
+        self._sources_key: Optional[tuple] = None
+        self._checked_at = float("-inf")
+        self._index: Optional[List[Tuple[str, str]]] = None
+        # built-in name -> (template it was built from, search text)
+        self._builtin_index: Dict[str, Tuple[Mapping[str, Any], str]] = {}
+        self.version = 0
+
+    def __repr__(self) -> str:
+        return f"TemplateCatalog(sources={len(self.sources)}, templates={len(self._templates)})"
+
+    def _list_directory(self, directory: Path, key: tuple) -> List[Path]:
+        cached = self._directories.get(directory)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            files = sorted(Path(entry.path) for entry in os.scandir(directory)
+                           if entry.name.lower().endswith(".json") and entry.is_file())
+        except OSError as e:
+            _logger.warning(f"Could not list template directory {directory}: {e}")
+            files = []
+        self._directories[directory] = (key, files)
+        return files
+
+    def _source_files(self) -> List[Path]:
+        """Expand the sources into JSON files, in precedence order (last wins)."""
+        files = []
+        for source in self.sources:
+            key = _stat_key(source)
+            if key is None:
+                continue
+            if source.is_dir():
+                files.extend(self._list_directory(source, key))
+            else:
+                files.append(source)
+        return files
+
+    def _load_file(self, path: Path) -> Tuple[Optional[tuple], Dict[str, Dict[str, Any]]]:
+        key = _stat_key(path)
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == key:
+            return key, cached[1]
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                templates = parse_templates(json.load(f), path)
+        except (OSError, ValueError) as e:
+            _logger.warning(f"Could not load templates from {path}: {e}")
+            templates = {}
+        self._files[path] = (key, templates)
+        return key, templates
+
+    def _ensure_loaded(self) -> None:
+        """Reload changed sources if the re-check interval elapsed. Caller holds the lock."""
+        now = time.monotonic()
+        if self._sources_key is not None and now - self._checked_at < self.recheck_interval:
+            return
+        self._checked_at = now
+
+        files = self._source_files()
+        loaded = [(path,) + self._load_file(path) for path in files]
+        sources_key = tuple((path, key) for path, key, _ in loaded)
+        if sources_key == self._sources_key:
+            return
+
+        templates = {}
+        for _, _, file_templates in loaded:
+            templates.update(file_templates)
+        # Forget files that are no longer part of the catalog
+        for path in set(self._files) - set(files):
+            del self._files[path]
+
+        self._templates = templates
+        self._sources_key = sources_key
+        self._index = None
+        self.version += 1
+        if files:
+            _logger.debug(f"Loaded {len(templates)} templates from {len(files)} files")
+
+    def reload(self) -> None:
+        """Re-check every source on the next lookup."""
+        with self._lock:
+            self._checked_at = float("-inf")
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the template called name, or None.
+
+        The returned dictionary is shared; copy it before modifying.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            template = self._templates.get(name)
+        if template is None:
+            template = self.builtin.get(name)
+        return template
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return every template: built-in ones first, then file templates.
+
+        The returned dictionary is new but its values are shared.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            templates = dict(self.builtin)
+            templates.update(self._templates)
+        return templates
+
+    def names(self) -> List[str]:
+        """Return every template name."""
+        return list(self.all())
+
+    def search(self, text: str) -> List[str]:
+        """
+        Return the names of the templates whose name, command or description contains text.
+
+        The match is case-insensitive; an empty text matches every template.
+        """
+        needle = text.strip().lower()
+        with self._lock:
+            self._ensure_loaded()
+            if self._index is None:
+                self._index = [(name, _search_text(name, template))
+                               for name, template in self._templates.items()]
+            file_index = self._index
+            file_templates = self._templates
+
+            # The built-in dictionary is live: reuse the text of every template
+            # object seen before and build it only for added or replaced ones
+            previous = self._builtin_index
+            builtin_index = {}
+            for name, template in self.builtin.items():
+                cached = previous.get(name)
+                if cached is None or cached[0] is not template:
+                    cached = (template, _search_text(name, template))
+                builtin_index[name] = cached
+            self._builtin_index = builtin_index
+
+        matches = [name for name, (_, haystack) in builtin_index.items()
+                   if name not in file_templates and needle in haystack]
+        matches.extend(name for name, haystack in file_index if needle in haystack)
+        return matches
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o índice de conjunto ordenado sobre mcp.allowed.
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+import sys
+from pathlib import Path
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.mcp_manager import MCPManager
+
+
+class TestAllowedIndex(unittest.TestCase):
+    """Testes para habilitar/desabilitar MCPs via índice de allowed."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.gemini_dir = Path(self.temp_dir) / ".gemini"
+        self.gemini_dir.mkdir()
+        self.settings_file = self.gemini_dir / "settings.json"
+
+        servers = {f"s{i}": {"command": "python", "args": []} for i in range(6)}
+        initial_settings = {
+            "mcp": {"allowed": ["s3", "s1", "s3", "s0", "s1"]},
+            "mcpServers": servers,
+        }
+        with open(self.settings_file, 'w', encoding='utf-8') as f:
+            json.dump(initial_settings, f, indent=2)
+
+        self.manager = MCPManager(str(self.settings_file))
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def _allowed_on_disk(self):
+        with open(self.settings_file, 'r', encoding='utf-8') as f:
+            return json.load(f)["mcp"]["allowed"]
+
+    def test_duplicates_removed_on_load(self):
+        """Nomes repetidos devem ser removidos mantendo a primeira ocorrência."""
+        self.assertEqual(self.manager.load_settings()["mcp"]["allowed"], ["s3", "s1", "s0"])
+
+    def test_bulk_update_preserves_order(self):
+        """Operações em lote devem preservar a ordem existente e anexar novos nomes."""
+        self.manager.set_allowed_many(["s5", "s2", "s3"], ["s1", "s4"])
+        self.assertEqual(self._allowed_on_disk(), ["s3", "s0", "s5", "s2"])
+
+        mcps = self.manager.get_mcps()
+        self.assertEqual(
+            sorted(name for name, info in mcps.items() if info["enabled"]),
+            ["s0", "s2", "s3", "s5"],
+        )
+
+    def test_toggle_within_transaction(self):
+        """Toggles repetidos numa transação devem resultar em uma lista consistente."""
+        with self.manager.transaction():
+            self.manager.toggle_allowed("s3", False)
+            self.manager.toggle_allowed("s3", True)
+            self.manager.toggle_allowed("s0")
+            self.assertEqual(self.manager.load_settings()["mcp"]["allowed"], ["s1", "s3"])
+            self.manager.remove_mcp("s1")
+
+        self.assertEqual(self._allowed_on_disk(), ["s3"])
+        self.assertFalse(self.manager.get_mcp_details("s0")["enabled"])
+        self.assertTrue(self.manager.get_mcp_details("s3")["enabled"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o lock de arquivo e a concorrência otimista do settings.json.
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.file_lock import FileLock, FileLockError, fcntl
+from src.core.mcp_manager import MCPManager, ConcurrentModificationError
+
+
+class TestFileLock(unittest.TestCase):
+    """Testes para o FileLock."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.lock_path = Path(self.temp_dir) / "settings.json.lock"
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def _assert_exclusive(self, use_fcntl):
+        first = FileLock(self.lock_path, timeout=0.1, use_fcntl=use_fcntl)
+        second = FileLock(self.lock_path, timeout=0.1, poll_interval=0.01, use_fcntl=use_fcntl)
+        with first:
+            with self.assertRaises(FileLockError):
+                second.acquire()
+        second.acquire()
+        self.assertTrue(second.is_locked)
+        second.release()
+
+    @unittest.skipIf(fcntl is None, "fcntl indisponível nesta plataforma")
+    def test_fcntl_lock_is_exclusive(self):
+        """Com fcntl, um segundo lock deve esperar o primeiro ser liberado."""
+        self._assert_exclusive(True)
+
+    def test_lock_file_fallback_is_exclusive(self):
+        """O fallback com arquivo exclusivo deve se comportar igual."""
+        self._assert_exclusive(False)
+        self.assertFalse(self.lock_path.exists())
+
+    def test_stale_lock_file_is_broken(self):
+        """Um arquivo de lock abandonado deve ser removido após stale_after."""
+        self.lock_path.write_text("99999", encoding='ascii')
+        old = time.time() - 120
+        os.utime(self.lock_path, (old, old))
+
+        lock = FileLock(self.lock_path, timeout=1.0, poll_interval=0.01, stale_after=60, use_fcntl=False)
+        with lock:
+            self.assertTrue(lock.is_locked)
+        self.assertEqual(list(Path(self.temp_dir).glob("*.stale")), [])
+
+    def test_long_hold_is_not_broken_as_stale(self):
+        """O dono renova o arquivo de lock, então uma escrita longa não perde o lock."""
+        holder = FileLock(self.lock_path, stale_after=0.2, use_fcntl=False)
+        waiter = FileLock(self.lock_path, timeout=0.6, poll_interval=0.02, stale_after=0.2, use_fcntl=False)
+        with holder:
+            with self.assertRaises(FileLockError):
+                waiter.acquire()
+            self.assertTrue(self.lock_path.exists())
+        self.assertFalse(self.lock_path.exists())
+
+    def test_release_keeps_foreign_lock_file(self):
+        """Se o lock foi quebrado e recriado por outro, o release não deve apagá-lo."""
+        lock = FileLock(self.lock_path, use_fcntl=False)
+        lock.acquire()
+        os.replace(self._write_other_lock(), self.lock_path)
+        lock.release()
+        self.assertEqual(self.lock_path.read_text(encoding='ascii'), "12345")
+
+    def _write_other_lock(self):
+        other = Path(self.temp_dir) / "other"
+        other.write_text("12345", encoding='ascii')
+        return other
+
+
+class TestOptimisticConcurrency(unittest.TestCase):
+    """Testes para escritores concorrentes no mesmo settings.json."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.gemini_dir = Path(self.temp_dir) / ".gemini"
+        self.gemini_dir.mkdir()
+        self.settings_file = self.gemini_dir / "settings.json"
+
+        initial_settings = {
+            "mcp": {"allowed": []},
+            "mcpServers": {"local": {"command": "python", "args": []}},
+        }
+        with open(self.settings_file, 'w', encoding='utf-8') as f:
+            json.dump(initial_settings, f, indent=2)
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def _read(self):
+        with open(self.settings_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_stale_transaction_is_rebased(self):
+        """Uma transação desatualizada deve reaplicar suas mudanças sobre o arquivo novo."""
+        stale = MCPManager(str(self.settings_file))
+        other = MCPManager(str(self.settings_file))
+
+        with stale.transaction():
+            stale.toggle_allowed("local")
+            stale.set_temperature(0.2)
+            other.add_mcp("outro", "node", ["server.js"])
+
+        settings = self._read()
+        self.assertIn("outro", settings["mcpServers"])
+        self.assertEqual(settings["mcp"]["allowed"], ["local"])
+        self.assertEqual(settings["model"]["temperature"], 0.2)
+        self.assertEqual(stale.get_stats()["conflicts_rebased"], 1)
+        self.assertIn("outro", stale.get_mcps())
+
+    def test_conflicting_transaction_raises(self):
+        """Mudanças que não podem ser reaplicadas devem gerar ConcurrentModificationError."""
+        stale = MCPManager(str(self.settings_file))
+        other = MCPManager(str(self.settings_file))
+
+        with self.assertRaises(ConcurrentModificationError):
+            with stale.transaction():
+                stale.add_mcp("dup", "npx", ["-y", "a"])
+                other.add_mcp("dup", "uvx", ["b"])
+
+        self.assertEqual(self._read()["mcpServers"]["dup"]["command"], "uvx")
+
+    def test_save_with_stale_etag_is_refused(self):
+        """save_settings deve recusar um etag desatualizado."""
+        manager = MCPManager(str(self.settings_file))
+        etag = manager.get_etag()
+        settings = manager.load_settings()
+
+        MCPManager(str(self.settings_file)).toggle_allowed("local", True)
+
+        settings["model"] = {"temperature": 1.0}
+        with self.assertRaises(ConcurrentModificationError):
+            manager.save_settings(settings, expected_etag=etag)
+
+        self.assertTrue(manager.save_settings(manager.load_settings(), expected_etag=manager.get_etag()))
+
+    def test_parallel_writers_keep_all_updates(self):
+        """Escritores paralelos não devem perder atualizações."""
+        errors = []
+
+        def writer(index):
+            try:
+                MCPManager(str(self.settings_file)).add_mcp(f"mcp{index}", "npx", [str(index)])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        servers = self._read()["mcpServers"]
+        for i in range(8):
+            self.assertIn(f"mcp{i}", servers)
+
+    def _read_during_transaction(self, commit):
+        """Lê as MCPs em outra thread enquanto uma transação está aberta."""
+        manager = MCPManager(str(self.settings_file))
+        seen = []
+        reader = threading.Thread(target=lambda: seen.append(set(manager.get_mcps())))
+
+        try:
+            with manager.transaction():
+                manager.add_mcp("pendente", "npx", ["-y", "pendente"])
+                self.assertIn("pendente", manager.get_mcps())
+                reader.start()
+                reader.join(0.2)
+                # A leitura da outra thread espera o fim da transação
+                self.assertEqual(seen, [])
+                if not commit:
+                    raise RuntimeError("rollback")
+        except RuntimeError:
+            pass
+        reader.join(5)
+        return seen
+
+    def test_open_transaction_is_invisible_to_other_threads(self):
+        """Outra thread só vê as alterações de uma transação depois do commit."""
+        self.assertEqual(self._read_during_transaction(commit=True), [{"local", "pendente"}])
+
+    def test_rolled_back_transaction_is_never_visible(self):
+        """As alterações de uma transação desfeita nunca aparecem para outra thread."""
+        self.assertEqual(self._read_during_transaction(commit=False), [{"local"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ import os
 import json
 from pathlib import Path
 import sys
+from unittest.mock import patch
 
 # Adicionar o diretório atual ao path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -141,6 +142,126 @@ class TestConfigManager(unittest.TestCase):
             saved_data = json.load(f)
             self.assertEqual(saved_data, test_data)
 
+    def test_reads_are_served_from_cache(self):
+        """Leituras repetidas do arquivo inalterado não o analisam de novo."""
+        self.config_manager.set_cli_type("qwen")
+        other = ConfigManager(str(self.config_path))
+
+        with patch('src.core.config_manager.json_backend.loads') as mock_loads:
+            self.assertEqual(other.get_cli_type(), "qwen")
+            self.assertEqual(self.config_manager.get_cli_type(), "qwen")
+            mock_loads.assert_not_called()
+
+    def test_cache_invalidated_by_external_change(self):
+        """Uma alteração externa do arquivo é percebida na próxima leitura."""
+        self.config_manager.set_cli_type("qwen")
+        self.assertEqual(self.config_manager.get_cli_type(), "qwen")
+
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            json.dump({"cli_type": "gemini", "user_base_path": self.temp_dir}, f)
+
+        self.assertEqual(self.config_manager.get_cli_type(), "gemini")
+        self.assertEqual(self.config_manager.get_user_path(), self.temp_dir)
+
+    def test_cached_config_is_not_shared_mutably(self):
+        """Alterar o dicionário retornado não afeta o cache."""
+        self.config_manager.set_cli_type("qwen")
+        config = self.config_manager._load_config()
+        config["cli_type"] = "gemini"
+
+        self.assertEqual(self.config_manager.get_cli_type(), "qwen")
+
+    def test_shared_instance_per_path(self):
+        """shared() retorna a mesma instância para o mesmo caminho."""
+        first = ConfigManager.shared(str(self.config_path))
+        self.assertIs(first, ConfigManager.shared(str(self.config_path)))
+        self.assertIsNot(first, ConfigManager.shared(str(Path(self.temp_dir) / "other.json")))
+
+
+    def test_aggressive_probe_is_memoized(self):
+        """A escrita de teste do modo agressivo é feita uma vez por diretório dentro do TTL."""
+        directory = Path(self.temp_dir)
+        before = ConfigManager.get_permission_stats()
+
+        with patch('src.core.config_manager.os.access', return_value=False):
+            self.assertTrue(self.config_manager._check_write_permission(directory, aggressive_check=True))
+            self.assertTrue(self.config_manager._check_write_permission(directory, aggressive_check=True))
+
+        after = ConfigManager.get_permission_stats()
+        self.assertEqual(after["probe_writes"] - before["probe_writes"], 1)
+        self.assertEqual(after["probe_writes_avoided"] - before["probe_writes_avoided"], 1)
+
+    def test_failed_write_invalidates_permission_cache(self):
+        """Uma falha de escrita real descarta o resultado memorizado."""
+        directory = self.config_path.parent
+        self.assertTrue(self.config_manager._check_write_permission(directory))
+
+        with patch('pathlib.Path.replace', side_effect=PermissionError("negado")):
+            with self.assertRaises(ConfigManagerError):
+                self.config_manager.set_cli_type("qwen")
+
+        key = (str(directory.absolute()), False)
+        self.assertNotIn(key, ConfigManager._permission_cache)
+
+    def test_permission_cache_expires(self):
+        """Resultados expirados são verificados novamente."""
+        directory = Path(self.temp_dir)
+        with patch.object(ConfigManager, 'permission_cache_ttl', 0.0):
+            with patch.object(self.config_manager, '_probe_write_permission', return_value=True) as probe:
+                self.config_manager._check_write_permission(directory)
+                self.config_manager._check_write_permission(directory)
+        self.assertEqual(probe.call_count, 2)
+
+
+    def test_update_writes_once(self):
+        """update() grava vários campos com uma única escrita."""
+        with patch.object(self.config_manager, '_save_config', wraps=self.config_manager._save_config) as save:
+            changed = self.config_manager.update(user_base_path=self.temp_dir, cli_type="qwen")
+
+        self.assertTrue(changed)
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(self.config_manager.get_cli_type(), "qwen")
+        self.assertEqual(self.config_manager.get_user_path(), Path(self.temp_dir).as_posix())
+
+    def test_setters_report_unchanged_values(self):
+        """Os setters retornam False e não gravam quando o valor não muda."""
+        self.assertTrue(self.config_manager.set_cli_type("qwen"))
+
+        with patch.object(self.config_manager, '_save_config') as save:
+            self.assertFalse(self.config_manager.set_cli_type("qwen"))
+            save.assert_not_called()
+
+    def test_update_validates_before_writing(self):
+        """Um campo inválido impede a gravação de todos os outros."""
+        with self.assertRaises(ConfigManagerError):
+            self.config_manager.update(user_base_path=self.temp_dir, cli_type="invalido")
+        with self.assertRaises(ConfigManagerError):
+            self.config_manager.update(campo_desconhecido="x")
+
+        self.assertFalse(self.config_path.exists())
+
+    def test_batch_writes_once_at_exit(self):
+        """batch() acumula os setters e grava uma vez ao final."""
+        with patch.object(self.config_manager, '_save_config', wraps=self.config_manager._save_config) as save:
+            with self.config_manager.batch():
+                self.assertTrue(self.config_manager.set_user_path(self.temp_dir))
+                self.assertTrue(self.config_manager.set_cli_type("qwen"))
+                self.assertFalse(self.config_manager.set_cli_type("qwen"))
+                save.assert_not_called()
+
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(self.config_manager.get_cli_type(), "qwen")
+
+    def test_batch_discarded_on_error(self):
+        """Se o bloco levantar exceção, nada é gravado."""
+        with self.assertRaises(RuntimeError):
+            with self.config_manager.batch():
+                self.config_manager.set_cli_type("qwen")
+                raise RuntimeError("falha")
+
+        self.assertFalse(self.config_path.exists())
+        self.assertEqual(self.config_manager.get_cli_type(), "gemini")
+
 
 if __name__ == "__main__":
     # Executar os testes
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do índice de executáveis do PATH.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.executable_index import ExecutableIndex
+from src.core.mcp_manager import MCPManager
+
+
+def _make_executable(directory: Path, name: str) -> Path:
+    """Cria um executável vazio em directory."""
+    if os.name == 'nt':
+        name += ".bat"
+    path = directory / name
+    path.write_text("@echo off\n" if os.name == 'nt' else "#!/bin/sh\n", encoding='utf-8')
+    path.chmod(0o755)
+    return path
+
+
+class TestExecutableIndex(unittest.TestCase):
+    """Testes da classe ExecutableIndex."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.bin_a = Path(self.temp_dir) / "a"
+        self.bin_b = Path(self.temp_dir) / "b"
+        self.bin_a.mkdir()
+        self.bin_b.mkdir()
+        self.index = ExecutableIndex(recheck_interval=0.0)
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_shutil_which(self):
+        """O índice resolve os comandos como shutil.which."""
+        for command in ("python", "sh", "nonexistent_command_12345", "echo"):
+            self.assertEqual(self.index.resolve(command), shutil.which(command), command)
+
+    def test_path_order_and_resolve_many(self):
+        """O primeiro diretório do PATH tem prioridade e vários comandos são resolvidos de uma vez."""
+        first = _make_executable(self.bin_a, "tool")
+        _make_executable(self.bin_b, "tool")
+        _make_executable(self.bin_b, "other")
+        path = os.pathsep.join([str(self.bin_a), str(self.bin_b)])
+
+        with patch.dict(os.environ, {"PATH": path}):
+            result = self.index.resolve_many(["tool", "other", "missing", "tool"])
+
+        self.assertEqual(list(result), ["tool", "other", "missing"])
+        self.assertEqual(Path(result["tool"]).resolve(), first.resolve())
+        self.assertIsNotNone(result["other"])
+        self.assertIsNone(result["missing"])
+
+    def test_new_executable_is_found_after_directory_change(self):
+        """Um executável criado depois da indexação é encontrado (mtime do diretório mudou)."""
+        with patch.dict(os.environ, {"PATH": str(self.bin_a)}):
+            self.assertIsNone(self.index.resolve("late"))
+            _make_executable(self.bin_a, "late")
+            # Garante mtime diferente mesmo em sistemas de arquivos com baixa resolução
+            os.utime(self.bin_a, ns=(0, os.stat(self.bin_a).st_mtime_ns + 10**9))
+            self.assertIsNotNone(self.index.resolve("late"))
+
+    def test_unchanged_path_is_not_rebuilt(self):
+        """Sem mudanças em PATH ou nos diretórios o índice não é reconstruído."""
+        _make_executable(self.bin_a, "tool")
+        with patch.dict(os.environ, {"PATH": str(self.bin_a)}):
+            self.index.resolve("tool")
+            builds = self.index.builds
+            with patch('src.core.executable_index.os.scandir') as scandir:
+                self.index.resolve("tool")
+                self.index.resolve_many(["tool", "missing"])
+                scandir.assert_not_called()
+        self.assertEqual(self.index.builds, builds)
+
+    def test_path_change_is_seen_immediately(self):
+        """Uma alteração de PATH é percebida mesmo dentro do intervalo de revalidação."""
+        index = ExecutableIndex(recheck_interval=3600.0)
+        _make_executable(self.bin_b, "tool")
+
+        with patch.dict(os.environ, {"PATH": str(self.bin_a)}):
+            self.assertIsNone(index.resolve("tool"))
+        with patch.dict(os.environ, {"PATH": str(self.bin_b)}):
+            self.assertIsNotNone(index.resolve("tool"))
+
+    def test_manager_bulk_check(self):
+        """MCPManager.check_commands_availability verifica vários comandos de uma vez."""
+        manager = MCPManager(str(Path(self.temp_dir) / "settings.json"))
+        result = manager.check_commands_availability(["python", "nonexistent_command_12345"])
+
+        self.assertEqual(result["python"], shutil.which("python") is not None)
+        self.assertFalse(result["nonexistent_command_12345"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o FleetManager (operações em paralelo sobre vários settings.json).
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+import sys
+from pathlib import Path
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.fleet_manager import FleetManager
+from src.core.mcp_manager import MCPManagerError
+
+
+class TestFleetManager(unittest.TestCase):
+    """Testes para o gerenciamento de múltiplos usuários."""
+
+    def setUp(self):
+        """Configura ambiente de teste com várias pastas de usuário."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.homes = []
+        for i in range(4):
+            home = Path(self.temp_dir) / f"user{i}"
+            home.mkdir()
+            self.homes.append(str(home))
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def _read(self, home, cli="gemini"):
+        with open(Path(home) / f".{cli}" / "settings.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_targets_from_user_base_paths(self):
+        """Cada caminho base deve gerar um alvo por tipo de CLI, sem duplicatas."""
+        fleet = FleetManager(user_base_paths=self.homes + [self.homes[0]], cli_types=["gemini", "qwen"])
+        self.assertEqual(len(fleet.targets), 8)
+        self.assertEqual(fleet.targets[1], Path(self.homes[0]) / ".qwen" / "settings.json")
+
+    def test_install_template_on_all_targets(self):
+        """A instalação de template deve ser aplicada a todos os alvos."""
+        fleet = FleetManager(user_base_paths=self.homes, cli_types=["gemini", "qwen"], max_workers=3)
+        results = fleet.install_template("context7", skip_dependency_check=True)
+
+        self.assertTrue(all(result.ok and result.result for result in results))
+        self.assertTrue(all(result.duration >= 0 for result in results))
+        for home in self.homes:
+            for cli in ("gemini", "qwen"):
+                settings = self._read(home, cli)
+                self.assertIn("context7", settings["mcpServers"])
+                self.assertIn("context7", settings["mcp"]["allowed"])
+
+        # Segunda execução: já instalado, nada a fazer
+        again = fleet.install_template("context7", skip_dependency_check=True)
+        self.assertTrue(all(result.ok and result.result is False for result in again))
+
+    def test_errors_are_isolated_per_target(self):
+        """Falha em um alvo não deve impedir os demais."""
+        # Arquivo no lugar do diretório .gemini impede a escrita neste alvo
+        (Path(self.homes[1]) / ".gemini").write_text("not a directory", encoding='utf-8')
+
+        fleet = FleetManager(user_base_paths=self.homes, cli_types=["gemini"])
+        results = fleet.set_temperature(0.5)
+
+        failed = [result for result in results if not result.ok]
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(failed[0].target, Path(self.homes[1]) / ".gemini" / "settings.json")
+        self.assertIsNotNone(failed[0].error)
+        for i in (0, 2, 3):
+            self.assertEqual(self._read(self.homes[i])["model"]["temperature"], 0.5)
+
+    def test_unknown_template_raises(self):
+        """Template inexistente deve falhar antes de tocar nos alvos."""
+        fleet = FleetManager(user_base_paths=self.homes, cli_types=["gemini"])
+        with self.assertRaises(MCPManagerError):
+            fleet.install_template("nao-existe")
+        self.assertFalse((Path(self.homes[0]) / ".gemini").exists())
+
+    def test_requires_targets(self):
+        """Uma frota vazia deve ser rejeitada."""
+        with self.assertRaises(MCPManagerError):
+            FleetManager(settings_paths=[])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da camada de serviço da GUI (execução fora da thread do Tk).
+
+Não criam janelas: um objeto com after() coleta os callbacks que seriam
+agendados na thread do Tk.
+"""
+
+import queue
+import threading
+import unittest
+from unittest import mock
+
+try:
+    import mcp_gui
+    HAS_TK = True
+except ImportError:
+    HAS_TK = False
+
+
+class _FakeRoot:
+    """Substitui a janela: after() enfileira os callbacks."""
+
+    def __init__(self):
+        self.callbacks = queue.Queue()
+
+    def after(self, ms, callback):
+        self.callbacks.put(callback)
+
+    def run_pending(self, count):
+        for _ in range(count):
+            self.callbacks.get(timeout=5)()
+
+
+@unittest.skipUnless(HAS_TK, "tkinter não disponível")
+class TestGUIService(unittest.TestCase):
+    """Testes da classe GUIService."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.root = _FakeRoot()
+        self.busy_events = []
+        self.service = mcp_gui.GUIService(
+            self.root, on_busy_change=lambda busy, text: self.busy_events.append(busy)
+        )
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        self.service.shutdown()
+
+    def test_task_runs_off_caller_thread(self):
+        """A tarefa executa em outra thread e o resultado chega pelo root.after."""
+        caller = threading.get_ident()
+        results = []
+
+        self.service.submit(threading.get_ident, results.append)
+        self.assertTrue(self.service.busy)
+        self.root.run_pending(1)
+
+        self.assertNotEqual(results[0], caller)
+        self.assertFalse(self.service.busy)
+        self.assertEqual(self.busy_events, [True, False])
+
+    def test_failure_rolls_back_before_error_callback(self):
+        """Em caso de erro o rollback é chamado antes do callback de erro."""
+        calls = []
+
+        def fail():
+            raise ValueError("falha")
+
+        self.service.submit(fail, on_success=lambda r: calls.append("ok"),
+                            on_error=lambda e: calls.append(str(e)),
+                            rollback=lambda: calls.append("rollback"))
+        self.root.run_pending(1)
+
+        self.assertEqual(calls, ["rollback", "falha"])
+
+    def test_tasks_run_in_order(self):
+        """As tarefas são executadas uma de cada vez, na ordem de envio."""
+        results = []
+        for value in range(5):
+            self.service.submit(lambda v=value: v, results.append)
+        self.root.run_pending(5)
+
+        self.assertEqual(results, list(range(5)))
+
+    def test_shutdown_waits_and_drops_callbacks(self):
+        """shutdown() aguarda as tarefas enviadas sem executar seus callbacks."""
+        done = threading.Event()
+        self.service.submit(done.set, on_success=lambda r: self.fail("callback após shutdown"))
+
+        self.service.shutdown(wait=True)
+
+        self.assertTrue(done.is_set())
+        # Um callback agendado antes do shutdown é descartado ao executar
+        while not self.root.callbacks.empty():
+            self.root.callbacks.get_nowait()()
+
+
+    def test_worker_thread_is_reused(self):
+        """A mesma thread de trabalho atende todas as tarefas de uma fila."""
+        threads = []
+        for _ in range(3):
+            self.service.submit(threading.get_ident, threads.append)
+        self.root.run_pending(3)
+
+        self.assertEqual(len(set(threads)), 1)
+
+    def test_slot_supersedes_pending_task(self):
+        """Uma segunda tarefa no mesmo slot substitui a pendente, que não executa."""
+        gate = threading.Event()
+        executed, results, cancelled = [], [], []
+        self.service.submit(gate.wait, lambda r: None)
+        first = self.service.submit(lambda: executed.append(1), results.append,
+                                    slot="refresh", on_cancel=lambda: cancelled.append(1))
+        self.service.submit(lambda: executed.append(2) or "novo", results.append, slot="refresh")
+        gate.set()
+        self.root.run_pending(3)
+
+        self.assertEqual(executed, [2])
+        self.assertEqual(results, ["novo"])
+        self.assertEqual(cancelled, [1])
+        self.assertEqual(first.state, "cancelled")
+        self.assertFalse(self.service.busy)
+
+    def test_cooperative_cancellation_and_progress(self):
+        """Uma tarefa em execução reporta progresso e para no próximo check_cancelled()."""
+        started, gate = threading.Event(), threading.Event()
+        progress, outcome = [], []
+
+        def task(handle):
+            handle.report("passo 1")
+            started.set()
+            gate.wait()
+            handle.check_cancelled()
+            outcome.append("não deveria continuar")
+
+        handle = self.service.submit(task, on_success=lambda r: outcome.append("ok"),
+                                     on_progress=progress.append,
+                                     on_cancel=lambda: outcome.append("cancelada"),
+                                     with_handle=True)
+        started.wait(5)
+        self.assertEqual(handle.state, "running")
+        self.assertEqual(self.service.cancel(), 1)
+        gate.set()
+        self.root.run_pending(2)
+
+        self.assertEqual(progress, ["passo 1"])
+        self.assertEqual(outcome, ["cancelada"])
+        self.assertEqual(handle.state, "cancelled")
+
+    def test_priority_runs_first(self):
+        """Tarefas pendentes de maior prioridade executam antes."""
+        gate = threading.Event()
+        order = []
+        self.service.submit(gate.wait)
+        self.service.submit(lambda: "baixa", order.append)
+        self.service.submit(lambda: "alta", order.append, priority=10)
+        gate.set()
+        self.root.run_pending(3)
+
+        self.assertEqual(order, ["alta", "baixa"])
+
+    def test_shutdown_cancels_cancel_on_close_tasks(self):
+        """shutdown() cancela as tarefas marcadas com cancel_on_close e executa as demais."""
+        gate = threading.Event()
+        executed = []
+        self.service.submit(gate.wait)
+        self.service.submit(lambda: executed.append("leitura"), cancel_on_close=True)
+        self.service.submit(lambda: executed.append("gravação"))
+        # Libera a primeira tarefa só depois de shutdown() ter cancelado a leitura
+        threading.Timer(0.05, gate.set).start()
+
+        self.service.shutdown(wait=True)
+
+        self.assertEqual(executed, ["gravação"])
+        self.assertEqual(self.service.submit(lambda: None).state, "cancelled")
+
+
+    def test_shutdown_reports_whether_workers_stopped(self):
+        """shutdown() retorna False se uma tarefa ainda executa após o prazo."""
+        gate = threading.Event()
+        self.service.submit(gate.wait)
+
+        self.assertFalse(self.service.shutdown(wait=True, timeout=0.05))
+        gate.set()
+        self.assertTrue(self.service.shutdown(wait=True))
+
+    def test_failure_after_shutdown_is_logged(self):
+        """Uma falha de tarefa concluída depois de shutdown() é registrada no log."""
+        gate = threading.Event()
+
+        def failing_save():
+            gate.wait()
+            raise RuntimeError("disco cheio")
+
+        handle = self.service.submit(failing_save, on_error=lambda e: self.fail("callback após shutdown"),
+                                     description="Salvando alterações...")
+        threading.Timer(0.05, gate.set).start()
+
+        with self.assertLogs(mcp_gui.logger, level="ERROR") as logs:
+            self.service.shutdown(wait=True)
+
+        self.assertEqual(handle.state, "failed")
+        self.assertIsInstance(handle.error, RuntimeError)
+        self.assertIn("disco cheio", logs.output[0])
+
+
+@unittest.skipUnless(HAS_TK, "tkinter não disponível")
+class TestMCPListRefresh(unittest.TestCase):
+    """Testes da atualização da lista de MCPs sem janela (Treeview simulado)."""
+
+    def setUp(self):
+        """Cria a GUI sem executar __init__ (nenhuma janela é aberta)."""
+        self.gui = mcp_gui.MCPGUI.__new__(mcp_gui.MCPGUI)
+        self.gui.mcp_tree = mock.MagicMock()
+        self.gui.mcp_empty_label = mock.MagicMock()
+        self.gui._mcp_rows = {}
+        self.gui._pending_toggles = {}
+        self.mcps = {
+            "a": {"enabled": False, "command": "npx"},
+            "b": {"enabled": True, "command": "uvx"},
+        }
+
+    def test_refresh_keeps_pending_toggles(self):
+        """Uma atualização em segundo plano não desfaz alternâncias ainda não salvas."""
+        self.gui._render_mcp_list(self.mcps)
+        self.gui._pending_toggles["a"] = True
+
+        self.gui._render_mcp_list(self.mcps)
+
+        self.assertEqual(self.gui.mcp_states, {"a": True, "b": True})
+        self.assertEqual(self.gui._mcp_rows["a"][0], mcp_gui.MCPGUI._check_mark(True))
+
+
+if __name__ == '__main__':
+    unittest.main()
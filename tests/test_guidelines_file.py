@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para a manutenção do arquivo de diretrizes (Gemini.md/Qwen.md).
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+from pathlib import Path
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.mcp_manager import MCPManager, GUIDELINES_CONTENT
+
+
+class TestGuidelinesFile(unittest.TestCase):
+    """Testes para _ensure_guidelines_file."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.gemini_dir = Path(self.temp_dir) / ".gemini"
+        self.gemini_dir.mkdir()
+        self.settings_file = self.gemini_dir / "settings.json"
+        self.guidelines_file = self.gemini_dir / "Gemini.md"
+        self.manager = MCPManager(str(self.settings_file))
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_canonical_file_is_not_rewritten(self):
+        """Saves seguidos não devem reescrever um arquivo já canônico."""
+        self.manager.add_mcp("a", "npx", [])
+        self.assertEqual(self.guidelines_file.read_text(encoding="utf-8"), GUIDELINES_CONTENT)
+        inode = os.stat(self.guidelines_file).st_ino
+
+        self.manager.toggle_allowed("a", True)
+        self.manager.toggle_allowed("a", False)
+
+        stats = self.manager.get_stats()
+        self.assertEqual(stats["guidelines_writes"], 1)
+        self.assertEqual(stats["guidelines_writes_avoided"], 2)
+        self.assertEqual(os.stat(self.guidelines_file).st_ino, inode)
+
+    def test_existing_canonical_file_is_only_read(self):
+        """Um arquivo canônico criado por outro processo não deve ser reescrito."""
+        content = "# Notas\nTexto do usuário\n\n" + GUIDELINES_CONTENT
+        self.guidelines_file.write_text(content, encoding="utf-8")
+
+        self.manager.add_mcp("a", "npx", [])
+
+        stats = self.manager.get_stats()
+        self.assertEqual(stats["guidelines_writes"], 0)
+        self.assertEqual(stats["guidelines_writes_avoided"], 1)
+        self.assertEqual(self.guidelines_file.read_text(encoding="utf-8"), content)
+
+    def test_modified_section_is_restored(self):
+        """Alterações externas na seção canônica devem ser corrigidas, preservando o restante."""
+        self.manager.add_mcp("a", "npx", [])
+        self.guidelines_file.write_text(
+            "# Diretrizes para o Projeto\nconteúdo alterado\n# Outra Seção\nmantida\n",
+            encoding="utf-8"
+        )
+
+        self.manager.toggle_allowed("a", True)
+
+        content = self.guidelines_file.read_text(encoding="utf-8")
+        self.assertTrue(content.startswith(GUIDELINES_CONTENT))
+        self.assertIn("# Outra Seção\nmantida\n", content)
+        self.assertNotIn("conteúdo alterado", content)
+        self.assertEqual(self.manager.get_stats()["guidelines_writes"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para a validação incremental (entradas alteradas) do MCPManager.
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.mcp_manager import MCPManager, MCPManagerError
+
+
+class TestIncrementalValidation(unittest.TestCase):
+    """Testes para _validate_settings com entradas alteradas."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.gemini_dir = Path(self.temp_dir) / ".gemini"
+        self.gemini_dir.mkdir()
+        self.settings_file = self.gemini_dir / "settings.json"
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, settings):
+        with open(self.settings_file, 'w', encoding='utf-8') as f:
+            json.dump(settings, f, indent=2)
+
+    def test_loaded_file_gets_full_validation(self):
+        """O primeiro save após carregar do disco deve validar todas as entradas."""
+        self._write({
+            "mcp": {"allowed": []},
+            "mcpServers": {
+                "ok": {"command": "npx", "args": []},
+                "sem-args": {"command": "npx"},
+            },
+        })
+        manager = MCPManager(str(self.settings_file))
+
+        with self.assertRaises(MCPManagerError):
+            manager.toggle_allowed("ok", True)
+
+    def test_only_touched_entries_are_revalidated(self):
+        """Depois de um estado validado, apenas as entradas alteradas são validadas."""
+        self._write({
+            "mcp": {"allowed": []},
+            "mcpServers": {f"s{i}": {"command": "npx", "args": []} for i in range(5)},
+        })
+        manager = MCPManager(str(self.settings_file))
+
+        with patch.object(manager, '_validate_settings', wraps=manager._validate_settings) as validate:
+            manager.toggle_allowed("s0", True)
+            manager.toggle_allowed("s1", True)
+            manager.add_mcp("novo", "uvx", ["pkg"])
+            with manager.transaction():
+                manager.update_mcp("s2", args=["-y"])
+                manager.remove_mcp("s3")
+
+        touched = [call.args[1] for call in validate.call_args_list]
+        self.assertEqual(touched, [None, set(), {"novo"}, {"s2"}])
+
+    def test_save_settings_always_validates_everything(self):
+        """save_settings chamado externamente deve usar a validação completa."""
+        manager = MCPManager(str(self.settings_file))
+        settings = manager.load_settings()
+        settings["mcpServers"]["ruim"] = {"command": "", "args": []}
+
+        with self.assertRaises(MCPManagerError):
+            manager.save_settings(settings)
+
+    def test_caller_args_are_not_adopted(self):
+        """Alterar a lista de args do chamador depois de add/update não deve chegar ao disco."""
+        manager = MCPManager(str(self.settings_file))
+        args = ["-y", "pkg"]
+        manager.add_mcp("x", "npx", args)
+        args.append("--evil")
+        new_args = ["-y", "outro"]
+        manager.add_mcp("y", "npx", ["a"])
+        manager.update_mcp("y", args=new_args)
+        new_args.append("--evil")
+        manager.set_temperature(1.0)
+
+        with open(self.settings_file, 'r', encoding='utf-8') as f:
+            servers = json.load(f)["mcpServers"]
+        self.assertEqual(servers["x"]["args"], ["-y", "pkg"])
+        self.assertEqual(servers["y"]["args"], ["-y", "outro"])
+        self.assertEqual(manager.get_mcp_details("x")["args"], ["-y", "pkg"])
+
+
+if __name__ == "__main__":
+    unittest.main()
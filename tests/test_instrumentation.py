@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para a instrumentação de tempos do MCPManager.
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core import instrumentation
+from src.core.instrumentation import TimingRegistry
+from src.core.mcp_manager import MCPManager
+
+
+class TestTimingRegistry(unittest.TestCase):
+    """Testes para o TimingRegistry."""
+
+    def test_disabled_registry_records_nothing(self):
+        """Com a instrumentação desligada nada deve ser registrado."""
+        registry = TimingRegistry()
+        with registry.timer("phase.parse", 10):
+            pass
+        self.assertEqual(registry.to_dict(), {})
+
+    def test_aggregates_durations_and_bytes(self):
+        """Medições repetidas devem ser agregadas por nome."""
+        registry = TimingRegistry(enabled=True)
+        for size in (10, 20):
+            with registry.timer("phase.serialize") as span:
+                span.nbytes = size
+        registry.record("phase.replace", 0.5)
+
+        stats = registry.to_dict()
+        self.assertEqual(stats["phase.serialize"]["count"], 2)
+        self.assertEqual(stats["phase.serialize"]["bytes"], 30)
+        self.assertEqual(stats["phase.replace"]["max_ms"], 500.0)
+        self.assertEqual(json.loads(registry.dump_json()), stats)
+
+
+class TestManagerInstrumentation(unittest.TestCase):
+    """Testes para as fases instrumentadas do MCPManager."""
+
+    def setUp(self):
+        """Configura ambiente de teste e liga a instrumentação."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.gemini_dir = Path(self.temp_dir) / ".gemini"
+        self.gemini_dir.mkdir()
+        self.settings_file = self.gemini_dir / "settings.json"
+        with open(self.settings_file, 'w', encoding='utf-8') as f:
+            json.dump({"mcp": {"allowed": []}, "mcpServers": {"a": {"command": "npx", "args": []}}}, f)
+
+        self.registry = instrumentation.get_registry()
+        self.was_enabled = self.registry.enabled
+        self.registry.reset()
+        instrumentation.enable()
+
+    def tearDown(self):
+        """Restaura o estado da instrumentação e limpa o ambiente."""
+        self.registry.enabled = self.was_enabled
+        self.registry.reset()
+        shutil.rmtree(self.temp_dir)
+
+    def test_phases_and_public_methods_are_recorded(self):
+        """Uma leitura e uma escrita devem registrar todas as fases."""
+        manager = MCPManager(str(self.settings_file))
+        manager.load_settings()
+        manager.toggle_allowed("a", True)
+
+        stats = self.registry.to_dict()
+        for name in ("phase.read", "phase.parse", "phase.normalize", "phase.deepcopy", "phase.validate",
+                     "phase.serialize", "phase.temp_write", "phase.replace", "phase.guidelines_write",
+                     "MCPManager.load_settings", "MCPManager.toggle_allowed"):
+            self.assertIn(name, stats)
+        self.assertEqual(stats["phase.serialize"]["bytes"], stats["phase.temp_write"]["bytes"])
+        self.assertEqual(stats["phase.serialize"]["bytes"], self.settings_file.stat().st_size)
+
+    def test_report_writes_json_file(self):
+        """report() deve gravar o JSON no caminho de MCP_INSTRUMENTATION_OUTPUT."""
+        MCPManager(str(self.settings_file)).get_mcps()
+        output = os.path.join(self.temp_dir, "tempos.json")
+        with patch.dict(os.environ, {instrumentation.INSTRUMENTATION_OUTPUT_ENV_VAR: output}):
+            self.assertEqual(instrumentation.report(), output)
+
+        with open(output, 'r', encoding='utf-8') as f:
+            self.assertIn("MCPManager.get_mcps", json.load(f))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o backend JSON plugável (orjson/stdlib).
+"""
+
+import unittest
+import json
+import os
+import sys
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core import json_backend
+
+
+SAMPLES = [
+    {},
+    [],
+    {"a": {}, "b": [], "c": [[]]},
+    {"mcp": {"allowed": ["a", "b"]}, "mcpServers": {"a": {"command": "npx", "args": ["-y", "pkg"]}}},
+    {"texto": "acentuação é ç 😀   \x00\x1f\x7f \"aspas\" \\ / \b\f\n\r\t"},
+    {"floats": [0.0, -0.0, 0.7, 1.0, 2.5, 123456789.123, 1e15, 1e16, 1e-4, 1e-5, 1e300, -1e-320]},
+    {"especiais": [float("nan"), float("inf"), float("-inf")]},
+    {"inteiros": [0, -1, 2 ** 63, 2 ** 64, -(2 ** 80), True, False, None]},
+    {"tupla": (1, "x")},
+    {1: "chave inteira"},
+    {"surrogate": "\ud800"},
+]
+
+
+class TestJsonBackend(unittest.TestCase):
+    """Testes de compatibilidade byte a byte entre os backends."""
+
+    def setUp(self):
+        """Guarda o backend atual."""
+        self.original = json_backend.get_backend()
+
+    def tearDown(self):
+        """Restaura o backend original."""
+        json_backend.set_backend(self.original)
+
+    def _assert_identical_output(self):
+        for sample in SAMPLES:
+            with self.subTest(sample=repr(sample)[:60]):
+                expected = json.dumps(sample, indent=2, ensure_ascii=False)
+                self.assertEqual(json_backend.dumps(sample), expected)
+
+    def test_stdlib_output_matches_json_dumps(self):
+        """O backend stdlib deve reproduzir json.dumps(indent=2, ensure_ascii=False)."""
+        self.assertEqual(json_backend.set_backend("stdlib"), "stdlib")
+        self._assert_identical_output()
+
+    @unittest.skipIf(json_backend.orjson is None, "orjson não instalado")
+    def test_orjson_output_matches_json_dumps(self):
+        """O backend orjson deve produzir saída idêntica, inclusive nos casos de fallback."""
+        self.assertEqual(json_backend.set_backend("orjson"), "orjson")
+        self._assert_identical_output()
+
+    @unittest.skipIf(json_backend.orjson is None, "orjson não instalado")
+    def test_loads_keeps_stdlib_semantics(self):
+        """A leitura deve preservar inteiros grandes e aceitar NaN como a stdlib."""
+        json_backend.set_backend("orjson")
+        self.assertEqual(json_backend.loads('{"n": 123456789012345678901234567890}'),
+                         {"n": 123456789012345678901234567890})
+        value = json_backend.loads('[NaN]')[0]
+        self.assertNotEqual(value, value)
+        self.assertEqual(json_backend.loads('[-9223372036854775809, 1e30, -0.0]'),
+                         [-9223372036854775809, 1e30, -0.0])
+        with self.assertRaises(json.JSONDecodeError):
+            json_backend.loads('{"a": ')
+
+    @unittest.skipIf(json_backend.orjson is None, "orjson não instalado")
+    def test_orjson_loads_matches_json_loads(self):
+        """O backend orjson deve ler os mesmos valores que json.loads."""
+        json_backend.set_backend("orjson")
+        for sample in SAMPLES:
+            with self.subTest(sample=sample):
+                text = json.dumps(sample, indent=2, ensure_ascii=False)
+                # Compara via repr dos valores: NaN nunca é igual a si mesmo
+                self.assertEqual(repr(json_backend.loads(text)), repr(json.loads(text)))
+
+    def test_unknown_backend_uses_auto(self):
+        """Um nome de backend inválido deve cair no modo automático."""
+        expected = "stdlib" if json_backend.orjson is None else "orjson"
+        self.assertEqual(json_backend.set_backend("rapido"), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
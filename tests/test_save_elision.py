@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para a eliminação de saves sem alterações no MCPManager.
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+import sys
+from pathlib import Path
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.mcp_manager import MCPManager
+
+
+class TestSaveElision(unittest.TestCase):
+    """Testes para o digest canônico em save_settings."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.gemini_dir = Path(self.temp_dir) / ".gemini"
+        self.gemini_dir.mkdir()
+        self.settings_file = self.gemini_dir / "settings.json"
+        self.manager = MCPManager(str(self.settings_file))
+        self.manager.add_mcp("a", "npx", ["-y", "a"])
+        self.manager.set_temperature(0.5)
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_real_change_is_written(self):
+        """Uma alteração real deve ser escrita e reportada."""
+        self.manager.toggle_allowed("a", True)
+
+        result = self.manager.last_save_result
+        self.assertTrue(result.saved)
+        self.assertEqual(result.bytes_written, self.settings_file.stat().st_size)
+
+    def test_same_temperature_is_not_written(self):
+        """Definir a temperatura atual não deve reescrever o arquivo."""
+        stat_before = os.stat(self.settings_file)
+        writes_before = self.manager.get_stats()["settings_writes"]
+
+        self.manager.set_temperature(0.5)
+
+        self.assertFalse(self.manager.last_save_result.saved)
+        self.assertEqual(self.manager.last_save_result.bytes_written, 0)
+        self.assertEqual(self.manager.get_stats()["settings_writes"], writes_before)
+        self.assertEqual(self.manager.get_stats()["settings_writes_avoided"], 1)
+        self.assertEqual(os.stat(self.settings_file).st_ino, stat_before.st_ino)
+
+    def test_empty_batch_is_not_written(self):
+        """set_allowed_many sem alterações efetivas não deve escrever."""
+        self.manager.set_allowed_many([], ["a"])
+        self.assertFalse(self.manager.last_save_result.saved)
+
+    def test_fresh_manager_detects_identical_content(self):
+        """Um novo manager deve reconhecer o arquivo já canônico."""
+        manager = MCPManager(str(self.settings_file))
+        manager.set_temperature(0.5)
+        self.assertFalse(manager.last_save_result.saved)
+
+    def test_external_change_forces_write(self):
+        """Se outro processo alterar o arquivo, o save deve escrever novamente."""
+        settings = self.manager.load_settings()
+
+        with open(self.settings_file, 'w', encoding='utf-8') as f:
+            json.dump({"mcp": {"allowed": []}, "mcpServers": {}}, f)
+
+        self.manager.save_settings(settings)
+        self.assertTrue(self.manager.last_save_result.saved)
+        with open(self.settings_file, 'r', encoding='utf-8') as f:
+            self.assertIn("a", json.load(f)["mcpServers"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o cache de settings validado por stat no MCPManager.
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+import sys
+from pathlib import Path
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.mcp_manager import MCPManager
+
+
+class TestSettingsCache(unittest.TestCase):
+    """Testes para o cache de settings.json."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.gemini_dir = Path(self.temp_dir) / ".gemini"
+        self.gemini_dir.mkdir()
+        self.settings_file = self.gemini_dir / "settings.json"
+
+        initial_settings = {
+            "mcp": {"allowed": []},
+            "mcpServers": {"local": {"command": "python", "args": ["-m", "server"]}},
+        }
+        with open(self.settings_file, 'w', encoding='utf-8') as f:
+            json.dump(initial_settings, f, indent=2)
+
+        self.manager = MCPManager(str(self.settings_file))
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_repeated_reads_hit_cache(self):
+        """Leituras repetidas com o arquivo inalterado não devem reprocessar o JSON."""
+        for _ in range(5):
+            self.manager.get_mcps()
+
+        stats = self.manager.get_stats()
+        self.assertEqual(stats["cache_misses"], 1)
+        self.assertEqual(stats["cache_hits"], 4)
+
+    def test_external_write_is_parsed_once(self):
+        """Uma escrita externa deve ser lida exatamente uma vez."""
+        self.assertNotIn("external", self.manager.get_mcps())
+
+        # Simula outro processo reescrevendo o arquivo
+        external = {
+            "mcp": {"allowed": ["external"]},
+            "mcpServers": {"external": {"command": "node", "args": ["server.js"]}},
+        }
+        temp_path = self.gemini_dir / "settings.json.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(external, f, indent=2)
+        temp_path.replace(self.settings_file)
+
+        mcps = self.manager.get_mcps()
+        self.assertIn("external", mcps)
+        self.assertTrue(mcps["external"]["enabled"])
+        self.manager.get_mcps()
+
+        stats = self.manager.get_stats()
+        self.assertEqual(stats["cache_misses"], 2)
+        self.assertEqual(stats["cache_hits"], 1)
+
+    def test_own_save_keeps_cache_valid(self):
+        """Após salvar, a próxima leitura deve ser servida pelo cache."""
+        self.manager.toggle_allowed("local", True)
+        misses_after_save = self.manager.get_stats()["cache_misses"]
+
+        self.assertTrue(self.manager.get_mcps()["local"]["enabled"])
+        self.assertEqual(self.manager.get_stats()["cache_misses"], misses_after_save)
+
+    def test_deleted_file_falls_back_to_defaults(self):
+        """Se o arquivo for removido externamente, a estrutura padrão deve ser usada."""
+        self.assertIn("local", self.manager.get_mcps())
+        self.settings_file.unlink()
+
+        self.assertEqual(self.manager.get_mcps(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
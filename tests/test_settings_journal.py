@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o modo journal do MCPManager (log de alterações com compactação).
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+import sys
+from pathlib import Path
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.mcp_manager import MCPManager
+
+
+class TestSettingsJournal(unittest.TestCase):
+    """Testes para o journal de alterações do settings.json."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.gemini_dir = Path(self.temp_dir) / ".gemini"
+        self.gemini_dir.mkdir()
+        self.settings_file = self.gemini_dir / "settings.json"
+        self.journal_file = self.gemini_dir / "settings.json.journal"
+
+        servers = {f"s{i}": {"command": "python", "args": []} for i in range(5)}
+        initial_settings = {"mcp": {"allowed": ["s0"]}, "mcpServers": servers}
+        with open(self.settings_file, 'w', encoding='utf-8') as f:
+            json.dump(initial_settings, f, indent=2)
+        self.original_bytes = self.settings_file.read_bytes()
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def _apply_changes(self, manager):
+        manager.toggle_allowed("s1", True)
+        manager.toggle_allowed("s0", False)
+        manager.add_mcp("novo", "node", ["server.js"])
+        manager.update_mcp("s2", args=["--debug"])
+        manager.remove_mcp("s3")
+        manager.set_allowed_many(["s4", "novo", "s0"], ["s1"])
+        manager.set_temperature(0.3)
+
+    def test_changes_are_appended_not_rewritten(self):
+        """Em modo journal o settings.json não deve ser reescrito a cada alteração."""
+        manager = MCPManager(str(self.settings_file), journal=True)
+        self._apply_changes(manager)
+
+        self.assertEqual(self.settings_file.read_bytes(), self.original_bytes)
+        self.assertTrue(self.journal_file.exists())
+        self.assertEqual(manager.get_stats()["journal_appends"], 7)
+        self.assertEqual(manager.get_stats()["settings_writes"], 0)
+
+    def test_replay_and_flush_match_direct_writes(self):
+        """Replay e compactação devem produzir o mesmo resultado que escritas diretas."""
+        manager = MCPManager(str(self.settings_file), journal=True)
+        self._apply_changes(manager)
+
+        # Outro processo (sem journal) enxerga as alterações pendentes
+        reader = MCPManager(str(self.settings_file))
+        self.assertEqual(reader.load_settings(), manager.load_settings())
+
+        self.assertTrue(manager.flush())
+        self.assertFalse(self.journal_file.exists())
+        self.assertFalse(manager.flush())
+        journaled = self.settings_file.read_text(encoding='utf-8')
+
+        # Mesmas alterações aplicadas sem journal em uma cópia do arquivo original
+        self.settings_file.write_bytes(self.original_bytes)
+        self._apply_changes(MCPManager(str(self.settings_file)))
+        self.assertEqual(journaled, self.settings_file.read_text(encoding='utf-8'))
+
+    def test_size_threshold_triggers_compaction(self):
+        """Ao atingir o tamanho máximo, o journal deve ser compactado no settings.json."""
+        manager = MCPManager(str(self.settings_file), journal=True)
+        manager.journal_max_bytes = 1
+        manager.toggle_allowed("s1", True)
+        manager.toggle_allowed("s2", True)
+
+        # O segundo commit encontra o journal cheio e reescreve o settings.json
+        self.assertEqual(manager.get_stats()["journal_compactions"], 1)
+        self.assertFalse(self.journal_file.exists())
+        with open(self.settings_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["mcp"]["allowed"], ["s0", "s1", "s2"])
+
+        # E o próximo volta a usar um journal novo
+        manager.toggle_allowed("s3", True)
+        self.assertTrue(self.journal_file.exists())
+        self.assertIn("s3", MCPManager(str(self.settings_file)).load_settings()["mcp"]["allowed"])
+
+    def test_unchanged_commit_is_not_appended(self):
+        """Uma transação que não altera nada não deve crescer o journal."""
+        manager = MCPManager(str(self.settings_file), journal=True)
+        manager.toggle_allowed("s1", True)
+        size = self.journal_file.stat().st_size
+
+        manager.toggle_allowed("s1", True)
+        with manager.transaction():
+            manager.toggle_allowed("s2", True)
+            manager.toggle_allowed("s2", False)
+
+        self.assertEqual(self.journal_file.stat().st_size, size)
+        self.assertEqual(manager.get_stats()["journal_appends"], 1)
+
+    def test_old_journal_is_compacted_on_load(self):
+        """Um journal mais velho que journal_max_age é compactado na leitura, sem novo commit."""
+        MCPManager(str(self.settings_file), journal=True).toggle_allowed("s1", True)
+
+        manager = MCPManager(str(self.settings_file), journal=True)
+        manager.journal_max_age = 0.0
+        self.assertIn("s1", manager.get_mcps())
+
+        self.assertFalse(self.journal_file.exists())
+        with open(self.settings_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["mcp"]["allowed"], ["s0", "s1"])
+
+    def test_torn_record_is_ignored(self):
+        """Um registro incompleto (falha durante o append) não deve invalidar o journal."""
+        manager = MCPManager(str(self.settings_file), journal=True)
+        manager.toggle_allowed("s1", True)
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write('[["allow","s2",tr')
+        manager.toggle_allowed("s3", True)
+
+        allowed = MCPManager(str(self.settings_file)).load_settings()["mcp"]["allowed"]
+        self.assertEqual(allowed, ["s0", "s1", "s3"])
+
+    def test_journal_for_other_base_is_ignored(self):
+        """Um journal criado sobre outra versão do settings.json deve ser ignorado."""
+        manager = MCPManager(str(self.settings_file), journal=True)
+        manager.toggle_allowed("s1", True)
+
+        # Outro processo reescreve o settings.json sem conhecer o journal
+        data = json.loads(self.original_bytes)
+        data["mcpServers"]["externo"] = {"command": "uvx", "args": []}
+        self.settings_file.write_text(json.dumps(data, indent=2), encoding='utf-8')
+
+        settings = MCPManager(str(self.settings_file)).load_settings()
+        self.assertIn("externo", settings["mcpServers"])
+        self.assertEqual(settings["mcp"]["allowed"], ["s0"])
+
+    def test_concurrent_journal_writers(self):
+        """Dois gerenciadores em modo journal devem preservar as alterações um do outro."""
+        first = MCPManager(str(self.settings_file), journal=True)
+        second = MCPManager(str(self.settings_file), journal=True)
+
+        with first.transaction():
+            first.toggle_allowed("s1", True)
+            second.toggle_allowed("s2", True)
+
+        allowed = MCPManager(str(self.settings_file)).load_settings()["mcp"]["allowed"]
+        self.assertEqual(allowed, ["s0", "s2", "s1"])
+        self.assertEqual(first.get_stats()["conflicts_rebased"], 1)
+
+    def test_context_manager_exit_flushes(self):
+        """Sair do contexto deve materializar o journal."""
+        with MCPManager(str(self.settings_file), journal=True) as manager:
+            manager.toggle_allowed("s1", True)
+        self.assertFalse(self.journal_file.exists())
+        with open(self.settings_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["mcp"]["allowed"], ["s0", "s1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
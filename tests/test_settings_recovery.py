@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da recuperação parcial de settings.json corrompidos.
+"""
+
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.core.mcp_manager import MCPManager
+from src.core.settings_recovery import salvage_settings
+
+
+def _settings_text(num_servers: int = 3) -> str:
+    """Gera um settings.json válido com servidores server-0..server-N."""
+    settings = {
+        "ide": {"hasSeenNudge": True, "enabled": False},
+        "mcp": {"allowed": [f"server-{i}" for i in range(num_servers)]},
+        "mcpServers": {
+            f"server-{i}": {"command": "npx", "args": ["-y", f"pkg-{i}"]} for i in range(num_servers)
+        },
+        "model": {"temperature": 0.3},
+        "ui": {"theme": "Dark"},
+    }
+    return json.dumps(settings, indent=2)
+
+
+class TestSalvageSettings(unittest.TestCase):
+    """Testes do parser tolerante."""
+
+    def test_truncated_inside_server_keeps_complete_entries(self):
+        """Arquivo truncado no meio de um servidor mantém as entradas completas anteriores."""
+        text = _settings_text()
+        truncated = text[:text.index('"server-2": {') + 20]
+
+        settings, report = salvage_settings(truncated, "Expecting value")
+
+        self.assertEqual(list(settings["mcpServers"]), ["server-0", "server-1"])
+        self.assertEqual(report.recovered_servers, ["server-0", "server-1"])
+        self.assertEqual(report.recovered_allowed, ["server-0", "server-1", "server-2"])
+        self.assertEqual(report.recovered_sections, ["ide"])
+        self.assertEqual(report.lost_server, "server-2")
+        self.assertIsNotNone(report.broken_at)
+        self.assertIn("server-2", report.summary())
+
+    def test_break_before_mcp_servers_is_skipped(self):
+        """Uma seção quebrada antes de mcpServers não impede a recuperação dos servidores."""
+        text = _settings_text().replace('"enabled": false', '"enabled": fals')
+
+        settings, report = salvage_settings(text)
+
+        self.assertEqual(report.broken_at[0], 2)
+        self.assertNotIn("ide", settings)
+        self.assertEqual(report.recovered_servers, ["server-0", "server-1", "server-2"])
+        self.assertEqual(report.recovered_allowed, ["server-0", "server-1", "server-2"])
+
+    def test_section_name_inside_string_is_not_salvaged(self):
+        """Depois da quebra, '"mcpServers": {' dentro de um valor string não é tratado como seção."""
+        damaged_note = '"say "hi" then "mcpServers": {"fake": {"command": "x", "args": []}} ok"'
+        text = _settings_text().replace('"enabled": false', f'"enabled": fals,\n    "note": {damaged_note}')
+
+        settings, report = salvage_settings(text)
+
+        self.assertEqual(report.recovered_servers, ["server-0", "server-1", "server-2"])
+        self.assertNotIn("fake", settings["mcpServers"])
+
+    def test_unparseable_text_recovers_nothing(self):
+        """Texto sem estrutura reconhecível não recupera nada."""
+        settings, report = salvage_settings("{ invalid json content")
+
+        self.assertEqual(settings, {})
+        self.assertFalse(report.recovered_anything)
+
+    def test_large_file_is_recovered_quickly(self):
+        """Arquivos de vários MB são recuperados rapidamente."""
+        text = _settings_text(50000)
+        self.assertGreater(len(text), 4 * 1024 * 1024)
+        truncated = text[:len(text) - len(text) // 4]
+
+        start = time.perf_counter()
+        settings, report = salvage_settings(truncated)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(report.recovered_allowed), 50000)
+        self.assertGreater(len(settings["mcpServers"]), 30000)
+        self.assertLess(elapsed, 5.0)
+
+
+class TestCorruptSettingsRecovery(unittest.TestCase):
+    """Testes da integração com o MCPManager."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.settings_file = Path(self.temp_dir) / "settings.json"
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_load_merges_salvaged_content_with_defaults(self):
+        """O carregamento combina o conteúdo recuperado com a estrutura padrão."""
+        text = _settings_text()
+        self.settings_file.write_text(text[:text.index('"server-2": {') + 20], encoding='utf-8')
+
+        manager = MCPManager(str(self.settings_file))
+        settings = manager.load_settings()
+
+        self.assertEqual(set(settings["mcpServers"]), {"server-0", "server-1"})
+        self.assertEqual(settings["ide"]["enabled"], False)
+        self.assertEqual(settings["security"]["auth"]["selectedType"], "oauth-personal")
+        self.assertEqual(settings["model"]["temperature"], 0.7)
+
+        report = manager.last_recovery_report
+        self.assertIsNotNone(report)
+        self.assertTrue(Path(report.corrupt_path).exists())
+        # O original não é recriado até o próximo save
+        self.assertFalse(self.settings_file.exists())
+
+    def test_recovered_settings_are_saved_on_next_change(self):
+        """A próxima alteração grava as configurações recuperadas."""
+        text = _settings_text()
+        self.settings_file.write_text(text[:text.index('"server-2": {') + 20], encoding='utf-8')
+
+        manager = MCPManager(str(self.settings_file))
+        manager.toggle_allowed("server-0", False)
+
+        with open(self.settings_file, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        self.assertEqual(set(saved["mcpServers"]), {"server-0", "server-1"})
+        self.assertEqual(saved["mcp"]["allowed"], ["server-1", "server-2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para os snapshots somente leitura de settings do MCPManager.
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+import sys
+from pathlib import Path
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.mcp_manager import MCPManager
+from src.core.frozen import FrozenDict, freeze, thaw
+
+
+class TestSettingsSnapshot(unittest.TestCase):
+    """Testes para get_settings_snapshot e leituras sem cópia."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.gemini_dir = Path(self.temp_dir) / ".gemini"
+        self.gemini_dir.mkdir()
+        self.settings_file = self.gemini_dir / "settings.json"
+
+        servers = {f"server-{i}": {"command": "npx", "args": ["-y", f"pkg-{i}"]} for i in range(50)}
+        initial_settings = {
+            "mcp": {"allowed": ["server-0"]},
+            "mcpServers": servers,
+            "model": {"temperature": 0.5, "systemInstruction": "x" * 10000},
+        }
+        with open(self.settings_file, 'w', encoding='utf-8') as f:
+            json.dump(initial_settings, f, indent=2)
+
+        self.manager = MCPManager(str(self.settings_file))
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_snapshot_is_read_only(self):
+        """O snapshot não deve permitir mutações."""
+        snapshot = self.manager.get_settings_snapshot()
+        self.assertIsInstance(snapshot, FrozenDict)
+        with self.assertRaises(TypeError):
+            snapshot["mcpServers"]["new"] = {}
+        self.assertIsInstance(snapshot["mcp"]["allowed"], tuple)
+
+    def test_snapshot_is_shared_between_reads(self):
+        """Leituras repetidas devem retornar o mesmo objeto, sem cópias."""
+        first = self.manager.get_settings_snapshot()
+        second = self.manager.get_settings_snapshot()
+        self.assertIs(first, second)
+
+    def test_structural_sharing_after_save(self):
+        """Seções inalteradas devem ser reaproveitadas após um save."""
+        before = self.manager.get_settings_snapshot()
+        self.manager.toggle_allowed("server-1", True)
+        after = self.manager.get_settings_snapshot()
+
+        self.assertIsNot(before, after)
+        self.assertIs(before["mcpServers"], after["mcpServers"])
+        self.assertEqual(before["model"], after["model"])
+        self.assertEqual(after["mcp"]["allowed"], ("server-0", "server-1"))
+
+    def test_unchanged_entries_shared_after_update(self):
+        """Após alterar um servidor, apenas a entrada alterada é recriada."""
+        before = self.manager.get_settings_snapshot()
+        self.manager.update_mcp("server-3", args=["-y", "novo"])
+        after = self.manager.get_settings_snapshot()
+
+        self.assertIsNot(before["mcpServers"], after["mcpServers"])
+        self.assertIsNot(before["mcpServers"]["server-3"], after["mcpServers"]["server-3"])
+        self.assertEqual(after["mcpServers"]["server-3"]["args"], ("-y", "novo"))
+        for name in ("server-0", "server-4", "server-49"):
+            self.assertIs(before["mcpServers"][name], after["mcpServers"][name])
+
+    def test_get_mcps_results_are_independent(self):
+        """Mutar o resultado de get_mcps não deve afetar o cache."""
+        mcps = self.manager.get_mcps()
+        mcps["server-0"]["args"].append("--extra")
+
+        self.assertEqual(self.manager.get_mcps()["server-0"]["args"], ["-y", "pkg-0"])
+        self.assertEqual(self.manager.get_temperature(), 0.5)
+
+    def test_freeze_thaw_roundtrip(self):
+        """freeze/thaw devem preservar o conteúdo."""
+        data = {"a": [1, {"b": None}], "c": -0.0}
+        frozen = freeze(data)
+        self.assertEqual(thaw(frozen), data)
+        self.assertEqual(repr(thaw(frozen)["c"]), "-0.0")
+
+    def test_frozen_dict_equals_plain_dict(self):
+        """Um FrozenDict é igual ao dict de mesmo conteúdo, inclusive com listas."""
+        data = {"a": [1, 2], "b": {"c": [{"d": []}]}}
+        self.assertEqual(freeze(data), data)
+        self.assertEqual(data, freeze(data))
+        self.assertNotEqual(freeze(data), {"a": [1, 2, 3], "b": {"c": [{"d": []}]}})
+        self.assertNotEqual(freeze({"a": (1,)}), {"a": [1], "b": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do armazenamento de snapshots endereçado por conteúdo.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.core.mcp_manager import MCPManager, MCPManagerError
+from src.core.snapshot_store import SNAPSHOT_DIR_NAME, SnapshotError, SnapshotStore
+
+
+def _object_count(store: SnapshotStore) -> int:
+    return sum(len(files) for _, _, files in os.walk(store.objects_dir))
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Testes da classe SnapshotStore."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = SnapshotStore(Path(self.temp_dir) / SNAPSHOT_DIR_NAME)
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_identical_content_is_stored_once(self):
+        """Versões idênticas não ocupam espaço extra."""
+        first = self.store.create({"settings.json": b"{}", "Gemini.md": b"# a"}, "save")
+        self.assertIsNotNone(first)
+        self.assertIsNone(self.store.create({"settings.json": b"{}", "Gemini.md": b"# a"}, "save"))
+
+        self.store.create({"settings.json": b"{\"a\": 1}", "Gemini.md": b"# a"}, "save")
+        self.store.create({"settings.json": b"{}", "Gemini.md": b"# a"}, "save")
+
+        self.assertEqual(len(self.store.list()), 3)
+        self.assertEqual(_object_count(self.store), 3)
+
+    def test_snapshot_id_uses_utc(self):
+        """O id começa com o horário UTC de criação, independente do fuso local."""
+        snapshot = self.store.create({"settings.json": b"{}"}, "save")
+        expected = datetime.fromtimestamp(snapshot.created, timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        self.assertTrue(snapshot.id.startswith(expected + "-"))
+        # A idade lida do nome do manifesto também é calculada em UTC
+        self.store.create({"settings.json": b"[]"}, "save")
+        self.assertFalse(self.store.needs_pruning(keep_last=None, max_age=60))
+
+    def test_restore_writes_files(self):
+        """A restauração grava os arquivos do snapshot no diretório alvo."""
+        snapshot = self.store.create({"settings.json": b"{\"v\": 1}"}, "save")
+        self.store.create({"settings.json": b"{\"v\": 2}"}, "save")
+        target = Path(self.temp_dir) / "target"
+
+        self.store.restore(snapshot.id, target)
+
+        self.assertEqual((target / "settings.json").read_bytes(), b"{\"v\": 1}")
+
+    def test_damaged_object_is_not_restored(self):
+        """Objetos danificados são detectados antes de qualquer arquivo ser substituído."""
+        snapshot = self.store.create({"settings.json": b"{\"v\": 1}"}, "save")
+        digest = snapshot.files["settings.json"]
+        (self.store.objects_dir / digest[:2] / digest).write_bytes(b"garbage")
+        target = Path(self.temp_dir) / "target"
+
+        with self.assertRaises(SnapshotError):
+            self.store.restore(snapshot.id, target)
+        self.assertFalse((target / "settings.json").exists())
+
+    def test_unknown_snapshot(self):
+        """Ids inexistentes ou com separadores de caminho são rejeitados."""
+        with self.assertRaises(SnapshotError):
+            self.store.get("missing")
+        with self.assertRaises(SnapshotError):
+            self.store.get("../settings")
+
+    def test_prune_keeps_last_and_collects_garbage(self):
+        """A retenção remove os snapshots antigos e os objetos que ficaram sem referência."""
+        for version in range(5):
+            self.store.create({"settings.json": f"{{\"v\": {version}}}".encode()}, "save")
+
+        self.assertTrue(self.store.needs_pruning(keep_last=2, max_age=None))
+        self.assertEqual(self.store.prune(keep_last=2), 3)
+
+        remaining = self.store.list()
+        self.assertEqual(len(remaining), 2)
+        self.assertEqual(_object_count(self.store), 2)
+        self.assertFalse(self.store.needs_pruning(keep_last=2, max_age=None))
+
+    def test_prune_by_age_keeps_latest(self):
+        """A retenção por idade nunca remove o snapshot mais recente."""
+        self.store.create({"settings.json": b"1"}, "save")
+        self.store.create({"settings.json": b"2"}, "save")
+        time.sleep(0.01)
+
+        self.assertEqual(self.store.prune(max_age=0.001), 1)
+        self.assertEqual(len(self.store.list()), 1)
+
+
+class TestMCPManagerSnapshots(unittest.TestCase):
+    """Testes da integração dos snapshots com o MCPManager."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.gemini_dir = Path(self.temp_dir) / ".gemini"
+        self.gemini_dir.mkdir()
+        self.settings_file = self.gemini_dir / "settings.json"
+        self.manager = MCPManager(str(self.settings_file))
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_every_save_records_a_snapshot(self):
+        """Cada gravação registra um snapshot com settings.json e Gemini.md."""
+        self.manager.add_mcp("a", "npx", ["-y", "a"])
+        self.manager.add_mcp("b", "npx", ["-y", "b"])
+
+        snapshots = self.manager.list_snapshots()
+        self.assertEqual(len(snapshots), 2)
+        self.assertEqual(set(snapshots[-1].files), {"settings.json", "Gemini.md"})
+        self.assertEqual(self.manager.get_stats()["snapshots_created"], 2)
+
+    def test_restore_rolls_back_bulk_change(self):
+        """Uma alteração em lote pode ser desfeita restaurando o snapshot anterior."""
+        self.manager.add_mcp("a", "npx", ["-y", "a"])
+        before = self.manager.list_snapshots()[-1]
+        with self.manager.transaction():
+            for name in ("b", "c", "d"):
+                self.manager.add_mcp(name, "npx", ["-y", name])
+        (self.gemini_dir / "Gemini.md").write_text("editado", encoding="utf-8")
+
+        self.manager.restore_snapshot(before.id)
+
+        self.assertEqual(set(self.manager.get_mcps()), {"a"})
+        self.assertIn("# Diretrizes para o Projeto", (self.gemini_dir / "Gemini.md").read_text(encoding="utf-8"))
+        # O estado anterior à restauração também fica registrado
+        self.assertEqual(self.manager.list_snapshots()[-1].reason, "pre-restore")
+
+        with open(self.settings_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(set(json.load(f)["mcpServers"]), {"a"})
+
+    def test_restore_unknown_snapshot_raises(self):
+        """Restaurar um snapshot inexistente gera MCPManagerError."""
+        with self.assertRaises(MCPManagerError):
+            self.manager.restore_snapshot("missing")
+
+    def test_snapshots_can_be_disabled(self):
+        """Com snapshots=False nenhum snapshot é gravado."""
+        manager = MCPManager(str(self.settings_file), snapshots=False)
+        manager.add_mcp("a", "npx", ["-y", "a"])
+
+        self.assertFalse((self.gemini_dir / SNAPSHOT_DIR_NAME).exists())
+
+    def test_explicit_checkpoint_can_be_restored(self):
+        """create_snapshot() funciona mesmo com os snapshots automáticos desligados."""
+        manager = MCPManager(str(self.settings_file), snapshots=False)
+        manager.add_mcp("a", "npx", ["-y", "a"])
+        checkpoint = manager.create_snapshot()
+        self.assertEqual(checkpoint.reason, "checkpoint")
+        self.assertIsNone(manager.create_snapshot())
+
+        manager.add_mcp("b", "npx", ["-y", "b"])
+        manager.restore_snapshot(checkpoint.id)
+
+        self.assertEqual(set(manager.get_mcps()), {"a"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do catálogo de templates carregado de arquivos JSON.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.mcp_manager import MCPManager, MCPManagerError
+from src.core.template_catalog import TemplateCatalog
+
+
+class TestTemplateCatalog(unittest.TestCase):
+    """Testes da classe TemplateCatalog."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.catalog_dir = Path(self.temp_dir) / "templates"
+        self.catalog_dir.mkdir()
+        self.builtin = {
+            "builtin": {"name": "builtin", "command": "npx", "args": ["-y", "b"], "description": "Interno"}
+        }
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name: str, data) -> Path:
+        path = self.catalog_dir / name
+        path.write_text(json.dumps(data), encoding='utf-8')
+        return path
+
+    def _catalog(self) -> TemplateCatalog:
+        return TemplateCatalog([str(self.catalog_dir)], builtin=self.builtin, recheck_interval=0.0)
+
+    def test_loads_every_supported_format(self):
+        """Arquivos com um template, lista, lista embrulhada e mapa são carregados."""
+        self._write("single.json", {"name": "single", "command": "npx", "args": ["-y", "s"]})
+        self._write("list.json", [{"name": "l1", "command": "uvx"}, {"name": "l2", "command": "uvx"}])
+        self._write("wrapped.json", {"templates": [{"name": "w", "command": "npx"}]})
+        self._write("mapping.json", {"m": {"command": "node", "args": ["m.js"], "description": "Mapa"}})
+        self._write("ignored.txt", {"name": "txt", "command": "npx"})
+
+        catalog = self._catalog()
+
+        self.assertEqual(set(catalog.names()), {"builtin", "single", "l1", "l2", "w", "m"})
+        self.assertEqual(catalog.get("m"), {"name": "m", "command": "node", "args": ["m.js"], "description": "Mapa"})
+        self.assertEqual(catalog.get("l1")["args"], [])
+
+    def test_invalid_entries_are_skipped(self):
+        """Entradas inválidas e arquivos corrompidos são ignorados."""
+        self._write("mixed.json", [{"name": "ok", "command": "npx"}, {"name": "no-command"},
+                                   {"name": "bad-args", "command": "npx", "args": "x"}, "texto"])
+        (self.catalog_dir / "broken.json").write_text("{ invalid", encoding='utf-8')
+
+        with self.assertLogs("src.core.template_catalog", level="WARNING"):
+            names = self._catalog().names()
+
+        self.assertEqual(set(names), {"builtin", "ok"})
+
+    def test_file_overrides_builtin_and_builtin_is_live(self):
+        """Templates de arquivo substituem os internos; alterações nos internos são visíveis."""
+        self._write("override.json", {"name": "builtin", "command": "uvx"})
+        catalog = self._catalog()
+
+        self.assertEqual(catalog.get("builtin")["command"], "uvx")
+        self.builtin["runtime"] = {"name": "runtime", "command": "npx", "args": []}
+        self.assertIn("runtime", catalog)
+
+    def test_unchanged_files_are_not_parsed_again(self):
+        """Arquivos inalterados não são analisados de novo; alterados são recarregados."""
+        path = self._write("a.json", {"name": "a", "command": "npx"})
+        catalog = self._catalog()
+        self.assertIn("a", catalog)
+        version = catalog.version
+
+        with patch('src.core.template_catalog.json.load') as mock_load:
+            self.assertIn("a", catalog)
+            mock_load.assert_not_called()
+        self.assertEqual(catalog.version, version)
+
+        path.write_text(json.dumps({"name": "a", "command": "uvx", "args": ["novo"]}), encoding='utf-8')
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+        self.assertEqual(catalog.get("a")["command"], "uvx")
+
+    def test_new_file_in_directory_is_found(self):
+        """Um arquivo adicionado ao diretório aparece no catálogo."""
+        catalog = self._catalog()
+        self.assertNotIn("late", catalog)
+
+        self._write("late.json", {"name": "late", "command": "npx"})
+        os.utime(self.catalog_dir, ns=(0, os.stat(self.catalog_dir).st_mtime_ns + 10**9))
+
+        self.assertIn("late", catalog)
+
+    def test_search(self):
+        """A busca considera nome, comando e descrição."""
+        self._write("t.json", [{"name": "excel-tools", "command": "uvx", "description": "Planilhas"},
+                               {"name": "browser", "command": "npx", "description": "Automação do Chrome"}])
+        catalog = self._catalog()
+
+        self.assertEqual(catalog.search("EXCEL"), ["excel-tools"])
+        self.assertEqual(catalog.search("chrome"), ["browser"])
+        self.assertEqual(set(catalog.search("npx")), {"builtin", "browser"})
+
+    def test_search_sees_builtin_changes(self):
+        """Templates embutidos adicionados ou trocados em tempo de execução entram na busca."""
+        catalog = self._catalog()
+        self.assertEqual(catalog.search("planilha"), [])
+
+        self.builtin["builtin"] = {"name": "builtin", "command": "uvx", "description": "Planilhas"}
+        self.builtin["extra"] = {"name": "extra", "command": "npx", "description": ""}
+
+        self.assertEqual(catalog.search("planilha"), ["builtin"])
+        self.assertEqual(catalog.search("npx"), ["extra"])
+
+    def test_sources_from_environment(self):
+        """Sem fontes explícitas o catálogo usa MCP_TEMPLATES_PATH."""
+        self._write("env.json", {"name": "env", "command": "npx"})
+        with patch.dict(os.environ, {"MCP_TEMPLATES_PATH": str(self.catalog_dir)}):
+            catalog = TemplateCatalog(builtin={})
+        self.assertEqual(catalog.names(), ["env"])
+
+
+class TestMCPManagerTemplateCatalog(unittest.TestCase):
+    """Testes do MCPManager usando um catálogo de arquivos."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        catalog_file = Path(self.temp_dir) / "templates.json"
+        catalog_file.write_text(json.dumps([
+            {"name": "internal-tool", "command": "nonexistent_command_12345", "args": ["--stdio"],
+             "description": "Ferramenta interna"}
+        ]), encoding='utf-8')
+        catalog = TemplateCatalog([str(catalog_file)], builtin={})
+        self.manager = MCPManager(str(Path(self.temp_dir) / "settings.json"), template_catalog=catalog)
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_template_api_uses_catalog(self):
+        """get_templates, install_from_template, is_template_installed e get_missing_dependencies usam o catálogo."""
+        self.assertEqual(list(self.manager.get_templates()), ["internal-tool"])
+        self.assertEqual(self.manager.get_missing_dependencies("internal-tool"), ["nonexistent_command_12345"])
+        self.assertFalse(self.manager.is_template_installed("internal-tool"))
+
+        with self.assertRaises(MCPManagerError):
+            self.manager.install_from_template("internal-tool")
+        self.assertTrue(self.manager.install_from_template("internal-tool", skip_dependency_check=True))
+
+        self.assertTrue(self.manager.is_template_installed("internal-tool"))
+        self.assertEqual(self.manager.get_mcp_details("internal-tool")["args"], ["--stdio"])
+
+        with self.assertRaises(MCPManagerError):
+            self.manager.get_missing_dependencies("context7")
+
+    def test_templates_status_matches_single_queries(self):
+        """get_templates_status lê as configurações uma vez e coincide com as consultas individuais."""
+        self.manager.add_mcp("internal-tool", "nonexistent_command_12345", ["--stdio"])
+        self.manager.template_catalog.builtin["python-tool"] = {
+            "name": "python-tool", "command": "python", "args": [], "description": ""
+        }
+
+        with patch.object(self.manager, 'get_settings_snapshot',
+                          wraps=self.manager.get_settings_snapshot) as snapshot:
+            status = self.manager.get_templates_status()
+        self.assertEqual(snapshot.call_count, 1)
+
+        self.assertEqual(list(status), ["python-tool", "internal-tool"])
+        for name, entry in status.items():
+            self.assertEqual(entry["installed"], self.manager.is_template_installed(name))
+            self.assertEqual(entry["missing_dependencies"], self.manager.get_missing_dependencies(name))
+            self.assertEqual(entry["template"], self.manager.template_catalog.get(name))
+
+
+if __name__ == '__main__':
+    unittest.main()
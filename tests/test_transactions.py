@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para as transações (escrita única) do MCPManager.
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.mcp_manager import MCPManager, MCPManagerError
+
+
+class TestTransactions(unittest.TestCase):
+    """Testes para MCPManager.transaction()."""
+
+    def setUp(self):
+        """Configura ambiente de teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.gemini_dir = Path(self.temp_dir) / ".gemini"
+        self.gemini_dir.mkdir()
+        self.settings_file = self.gemini_dir / "settings.json"
+
+        initial_settings = {
+            "mcp": {"allowed": []},
+            "mcpServers": {"existing": {"command": "python", "args": []}},
+        }
+        with open(self.settings_file, 'w', encoding='utf-8') as f:
+            json.dump(initial_settings, f, indent=2)
+
+        self.manager = MCPManager(str(self.settings_file))
+
+    def tearDown(self):
+        """Limpa ambiente de teste."""
+        shutil.rmtree(self.temp_dir)
+
+    def _read_file(self):
+        with open(self.settings_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_transaction_writes_once(self):
+        """Várias mutações dentro da transação devem gerar um único save."""
+        with patch.object(self.manager, '_save_settings', wraps=self.manager._save_settings) as save:
+            with self.manager.transaction():
+                for i in range(10):
+                    self.manager.add_mcp(f"server-{i}", "npx", ["-y", f"pkg-{i}"])
+                    self.manager.toggle_allowed(f"server-{i}", True)
+                self.manager.update_mcp("existing", args=["-m", "srv"])
+                self.manager.set_temperature(1.0)
+                self.manager.remove_mcp("server-9")
+
+                # Leituras dentro da transação enxergam as mudanças pendentes
+                self.assertIn("server-0", self.manager.get_mcps())
+                # Nada foi escrito ainda
+                self.assertNotIn("server-0", self._read_file()["mcpServers"])
+
+            self.assertEqual(save.call_count, 1)
+
+        data = self._read_file()
+        self.assertEqual(len(data["mcpServers"]), 10)
+        self.assertEqual(data["mcp"]["allowed"], [f"server-{i}" for i in range(9)])
+        self.assertEqual(data["mcpServers"]["existing"]["args"], ["-m", "srv"])
+        self.assertEqual(data["model"]["temperature"], 1.0)
+
+    def test_transaction_rollback_on_exception(self):
+        """Uma exceção dentro da transação deve descartar todas as mudanças."""
+        with self.assertRaises(RuntimeError):
+            with self.manager.transaction():
+                self.manager.add_mcp("pending", "npx", [])
+                raise RuntimeError("falha")
+
+        self.assertNotIn("pending", self.manager.get_mcps())
+        self.assertNotIn("pending", self._read_file()["mcpServers"])
+
+    def test_rollback_leaves_cached_settings_intact(self):
+        """O rollback não deve vazar mudanças para o cache (cópia de trabalho rasa)."""
+        self.manager.toggle_allowed("existing", True)
+        with self.assertRaises(RuntimeError):
+            with self.manager.transaction():
+                self.manager.update_mcp("existing", command="node", args=["x.js"])
+                self.manager.toggle_allowed("existing", False)
+                self.manager.set_temperature(1.5)
+                raise RuntimeError("falha")
+
+        details = self.manager.get_mcp_details("existing")
+        self.assertEqual(details["command"], "python")
+        self.assertEqual(details["args"], [])
+        self.assertTrue(details["enabled"])
+        self.assertNotEqual(self.manager.get_temperature(), 1.5)
+
+    def test_failed_operation_rolls_back_whole_transaction(self):
+        """Um erro do próprio MCPManager também deve desfazer a transação."""
+        with self.assertRaises(MCPManagerError):
+            with self.manager.transaction():
+                self.manager.add_mcp("pending", "npx", [])
+                self.manager.add_mcp("existing", "npx", [])
+
+        self.assertNotIn("pending", self.manager.get_mcps())
+
+    def test_install_from_template_writes_once(self):
+        """install_from_template deve adicionar e habilitar com uma única escrita."""
+        with patch.object(self.manager, '_save_settings', wraps=self.manager._save_settings) as save:
+            self.manager.install_from_template("context7", enable=True, skip_dependency_check=True)
+            self.assertEqual(save.call_count, 1)
+
+        self.assertTrue(self.manager.get_mcps()["context7"]["enabled"])
+
+    def test_empty_transaction_does_not_write(self):
+        """Uma transação sem mutações não deve salvar."""
+        with patch.object(self.manager, '_save_settings', wraps=self.manager._save_settings) as save:
+            with self.manager.transaction():
+                self.manager.get_mcps()
+            self.assertEqual(save.call_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()